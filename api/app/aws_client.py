@@ -1,9 +1,16 @@
 from __future__ import annotations
 
 import os
+import threading
 from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
 import boto3
+from botocore.config import Config
+
+from .config import get_settings
+from .rate_limit import RateLimiter, RateLimits
 
 
 @dataclass(frozen=True)
@@ -11,11 +18,122 @@ class AwsContext:
     region: str
 
 
+class PooledSession(boto3.session.Session):
+    """
+    A boto3 session that hands out one shared client per (service, region).
+
+    botocore clients are thread-safe but expensive to build (service model loading, endpoint
+    resolution, a fresh HTTP pool), and creating them concurrently from one session is not safe.
+    Clients are therefore built once under a lock and reused across checks and requests. With a
+    `rate_limiter`, every pooled client is paced by its (service, region) token bucket.
+    """
+
+    def __init__(
+        self,
+        *,
+        region_name: str,
+        profile_name: str | None,
+        config: Config,
+        credentials: dict[str, str] | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        creds = credentials or {}
+        super().__init__(
+            profile_name=profile_name,
+            region_name=region_name,
+            aws_access_key_id=creds.get("AccessKeyId"),
+            aws_secret_access_key=creds.get("SecretAccessKey"),
+            aws_session_token=creds.get("SessionToken"),
+        )
+        self._client_config = config
+        self.rate_limiter = rate_limiter
+        self._clients: dict[tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def client(self, service_name: str, region_name: str | None = None, **kwargs: Any) -> Any:  # type: ignore[override]
+        if kwargs:
+            # Non-default options (endpoint overrides, explicit credentials) get an unpooled client.
+            with self._lock:
+                return super().client(service_name, region_name=region_name, **kwargs)
+        key = (service_name, region_name or self.region_name)
+        with self._lock:
+            c = self._clients.get(key)
+            if c is None:
+                c = super().client(service_name, region_name=key[1], config=self._client_config)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.attach(c, service_name, key[1])
+                self._clients[key] = c
+            return c
+
+
+class ClientPool:
+    """
+    Process-wide pool of sessions (and, through them, clients) keyed by region and profile.
+
+    Sessions for the same profile share one rate limiter: AWS throttles per account, so every
+    client calling a (service, region) on behalf of that account draws from the same bucket.
+    """
+
+    def __init__(self, config: Config, limits: RateLimits | None = None):
+        self.config = config
+        self.limits = limits
+        self._sessions: dict[tuple[str, str | None], PooledSession] = {}
+        self._limiters: dict[str | None, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def session(self, region: str, profile: str | None = None) -> PooledSession:
+        key = (region, profile)
+        with self._lock:
+            s = self._sessions.get(key)
+            if s is None:
+                limiter = self._limiters.setdefault(profile, RateLimiter(self.limits))
+                s = PooledSession(
+                    region_name=region, profile_name=profile, config=self.config, rate_limiter=limiter
+                )
+                self._sessions[key] = s
+            return s
+
+    def client(self, service: str, region: str, profile: str | None = None) -> Any:
+        return self.session(region, profile).client(service)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self._limiters.clear()
+
+
+_pool: ClientPool | None = None
+_pool_lock = threading.Lock()
+
+
+def client_config() -> Config:
+    settings = get_settings()
+    return Config(
+        max_pool_connections=settings.aws_max_pool_connections,
+        # Standard mode retries throttles with backoff; pacing is left to the shared RateLimiter
+        # (botocore's adaptive mode would add a second, per-client limiter on top).
+        retries={"mode": "standard", "max_attempts": settings.aws_max_attempts},
+        connect_timeout=5,
+        read_timeout=30,
+    )
+
+
+def rate_limits() -> RateLimits:
+    settings = get_settings()
+    return RateLimits.parse(settings.aws_rate_limit, settings.aws_rate_limits, settings.aws_rate_burst)
+
+
+def client_pool() -> ClientPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ClientPool(client_config(), rate_limits())
+        return _pool
+
+
 def boto_session(region: str) -> boto3.session.Session:
     profile = os.getenv("AWS_PROFILE") or None
-    if profile:
-        return boto3.Session(profile_name=profile, region_name=region)
-    return boto3.Session(region_name=region)
+    return client_pool().session(region, profile)
 
 
 def get_account_id(session: boto3.session.Session) -> str | None:
@@ -23,3 +141,92 @@ def get_account_id(session: boto3.session.Session) -> str | None:
         return session.client("sts").get_caller_identity().get("Account")
     except Exception:
         return None
+
+
+class AssumedRoleSessions:
+    """
+    STS credential cache for org scans: one pooled session per account, built from AssumeRole
+    credentials and reused until they are within `refresh_margin_s` of expiring.
+
+    AssumeRole calls go through the base session; concurrent requests for the same account wait
+    for a single call (per-account lock) rather than each assuming the role. Each account keeps
+    one rate limiter across credential refreshes.
+    """
+
+    def __init__(
+        self,
+        base: boto3.session.Session,
+        config: Config,
+        *,
+        role_name: str,
+        external_id: str | None = None,
+        session_name: str = "cloudsentinel-org-scan",
+        duration_s: int = 3600,
+        refresh_margin_s: float = 300.0,
+        limits: RateLimits | None = None,
+    ):
+        self.base = base
+        self.config = config
+        self.role_name = role_name
+        self.external_id = external_id or None
+        self.session_name = session_name
+        self.duration_s = duration_s
+        self.refresh_margin = timedelta(seconds=refresh_margin_s)
+        self.limits = limits
+        self._limiters: dict[str, RateLimiter] = {}
+        self._sessions: dict[str, tuple[PooledSession, datetime]] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self.assumed = 0
+
+    def role_arn(self, account_id: str) -> str:
+        return f"arn:aws:iam::{account_id}:role/{self.role_name}"
+
+    def session(self, account_id: str) -> PooledSession:
+        with self._guard:
+            lock = self._locks.setdefault(account_id, threading.Lock())
+        with lock:
+            cached = self._sessions.get(account_id)
+            if cached is not None and cached[1] - self.refresh_margin > datetime.now(UTC):
+                return cached[0]
+            kwargs: dict[str, Any] = {
+                "RoleArn": self.role_arn(account_id),
+                "RoleSessionName": self.session_name,
+                "DurationSeconds": self.duration_s,
+            }
+            if self.external_id:
+                kwargs["ExternalId"] = self.external_id
+            creds = self.base.client("sts").assume_role(**kwargs)["Credentials"]
+            session = PooledSession(
+                region_name=self.base.region_name or "us-east-1",
+                profile_name=None,
+                config=self.config,
+                credentials=creds,
+                rate_limiter=self._limiters.setdefault(account_id, RateLimiter(self.limits)),
+            )
+            self._sessions[account_id] = (session, creds["Expiration"])
+            with self._guard:
+                self.assumed += 1
+            return session
+
+
+_assumed: dict[tuple[str, str, str | None], AssumedRoleSessions] = {}
+
+
+def assumed_role_sessions(region: str, role_name: str, external_id: str | None = None) -> AssumedRoleSessions:
+    """Process-wide credential cache for `role_name`, so repeated org scans reuse live credentials."""
+
+    key = (region, role_name, external_id or None)
+    with _pool_lock:
+        cache = _assumed.get(key)
+    if cache is None:
+        cache = AssumedRoleSessions(
+            boto_session(region),
+            client_config(),
+            role_name=role_name,
+            external_id=external_id,
+            limits=rate_limits(),
+        )
+        with _pool_lock:
+            cache = _assumed.setdefault(key, cache)
+    return cache
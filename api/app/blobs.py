@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import struct
+import zlib
+from collections.abc import Callable
+from typing import Any, Literal
+
+from .json_codec import dumps, loads
+
+try:
+    import zstandard
+except ImportError:  # optional: zlib is always available
+    zstandard = None
+
+BlobCodec = Literal["none", "zlib", "zstd"]
+
+# Encoded blobs: magic, codec tag, dictionary id (0 = none), raw JSON length, payload.
+_MAGIC = b"CSB"
+_HEADER = struct.Struct(">3sBII")
+_CODEC_TAGS: dict[str, int] = {"zlib": 1, "zstd": 2}
+_TAG_CODECS = {v: k for k, v in _CODEC_TAGS.items()}
+
+# zlib only looks back 32 KiB, so a larger dictionary is wasted on it.
+DICT_SIZE = 32 * 1024
+HEADER_SIZE = _HEADER.size
+
+
+def codec_available(codec: BlobCodec) -> bool:
+    return codec != "zstd" or zstandard is not None
+
+
+def encode_json(
+    obj: Any, *, codec: BlobCodec = "zlib", level: int = 6, dict_id: int = 0, dictionary: bytes | None = None
+) -> str | bytes:
+    return encode_bytes(dumps(obj), codec=codec, level=level, dict_id=dict_id, dictionary=dictionary)
+
+
+def encode_bytes(
+    raw: bytes,
+    *,
+    codec: BlobCodec = "zlib",
+    level: int = 6,
+    dict_id: int = 0,
+    dictionary: bytes | None = None,
+) -> str | bytes:
+    """
+    Compress already-serialized JSON (`raw`, UTF-8).
+
+    Returns plain JSON text when `codec` is "none" or compression does not pay for its header,
+    so small blobs and legacy rows stay directly readable by SQLite's JSON functions.
+    """
+
+    if codec == "none":
+        return raw.decode("utf-8")
+    payload = _compress(raw, codec, level, dictionary if dict_id else None)
+    if len(payload) + HEADER_SIZE >= len(raw):
+        return raw.decode("utf-8")
+    return _HEADER.pack(_MAGIC, _CODEC_TAGS[codec], dict_id, len(raw)) + payload
+
+
+def decode_bytes(value: str | bytes, dictionaries: Callable[[int], bytes]) -> bytes:
+    """The stored JSON as UTF-8 bytes, decompressed but not parsed."""
+
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    if len(value) < HEADER_SIZE:
+        return bytes(value)
+    magic, tag, dict_id, raw_len = _HEADER.unpack_from(value)
+    if magic != _MAGIC or tag not in _TAG_CODECS:
+        return bytes(value)
+    dictionary = dictionaries(dict_id) if dict_id else None
+    return _decompress(value[HEADER_SIZE:], _TAG_CODECS[tag], dictionary, raw_len)
+
+
+def decode_json(value: str | bytes | None, dictionaries: Callable[[int], bytes]) -> Any:
+    if value is None:
+        return None
+    return loads(decode_bytes(value, dictionaries))
+
+
+def header_raw_size(head: bytes) -> int | None:
+    """Decoded JSON size recorded in a compressed blob's header, or None if `head` is not one."""
+
+    if len(head) < HEADER_SIZE:
+        return None
+    magic, tag, _dict_id, raw_len = _HEADER.unpack_from(head)
+    return int(raw_len) if magic == _MAGIC and tag in _TAG_CODECS else None
+
+
+def train_dictionary(samples: list[bytes], size: int = DICT_SIZE) -> bytes:
+    """
+    Build a raw-content dictionary from recent snapshots.
+
+    Snapshots repeat the same check ids, titles, recommendations and evidence keys, so the
+    newest samples are concatenated (newest last, where both codecs find matches cheapest) and
+    cut to `size`. Evidence blobs are substrings of snapshots and share the same dictionary.
+    """
+
+    out = bytearray()
+    for s in reversed(samples):
+        if len(out) >= size:
+            break
+        out[:0] = s[-(size - len(out)) :]
+    return bytes(out)
+
+
+def _compress(raw: bytes, codec: BlobCodec, level: int, dictionary: bytes | None) -> bytes:
+    if codec == "zlib":
+        c = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=dictionary) if dictionary else None
+        return c.compress(raw) + c.flush() if c else zlib.compress(raw, level)
+    if zstandard is None:
+        raise RuntimeError("zstd compression requires the zstandard package")
+    zdict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+    return zstandard.ZstdCompressor(level=level, dict_data=zdict).compress(raw)
+
+
+def _decompress(payload: bytes, codec: str, dictionary: bytes | None, raw_len: int) -> bytes:
+    if codec == "zlib":
+        if dictionary:
+            d = zlib.decompressobj(-15, zdict=dictionary)
+            return d.decompress(payload) + d.flush()
+        return zlib.decompress(payload)
+    if zstandard is None:
+        raise RuntimeError("zstd-compressed blob found but the zstandard package is not installed")
+    zdict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+    return zstandard.ZstdDecompressor(dict_data=zdict).decompress(payload, max_output_size=raw_len)
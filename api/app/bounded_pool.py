@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+# Upper bound on how long the coordinator sleeps before re-checking running calls for timeouts.
+_POLL_S = 0.25
+
+
+@dataclass(frozen=True)
+class Outcome(Generic[T]):
+    index: int
+    value: T | None = None
+    # str() of the exception the call raised.
+    error: str | None = None
+    timed_out: bool = False
+    # Time since the call started (0 if it never did).
+    seconds: float = 0.0
+
+
+def run_with_timeouts(
+    calls: Sequence[Callable[[], T]],
+    *,
+    max_workers: int,
+    timeout_s: float,
+    thread_name_prefix: str,
+    poll_s: float = _POLL_S,
+) -> Iterator[Outcome[T]]:
+    """
+    Run `calls` on a bounded thread pool and yield one `Outcome` per call as it finishes.
+
+    The timeout is measured from when a call starts, not when it was queued. A call still running
+    after `timeout_s` is yielded as `timed_out` and its worker thread abandoned rather than waited
+    for; calls that never started are cancelled if the caller stops iterating early. Outcomes are
+    yielded on the iterating thread, so the caller can touch thread-bound state (e.g. storage).
+    """
+
+    started: dict[int, float] = {}
+
+    def _call(i: int) -> T:
+        started[i] = time.monotonic()
+        return calls[i]()
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix=thread_name_prefix)
+    try:
+        futures: dict[Future[T], int] = {pool.submit(_call, i): i for i in range(len(calls))}
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            deadlines = [started[futures[f]] + timeout_s for f in pending if futures[f] in started]
+            sleep_s = min([poll_s, *(max(0.0, d - now) for d in deadlines)])
+            done, pending = wait(pending, timeout=sleep_s, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for f in done:
+                i = futures[f]
+                seconds = round(now - started.get(i, now), 3)
+                try:
+                    outcome: Outcome[T] = Outcome(index=i, value=f.result(), seconds=seconds)
+                except Exception as e:
+                    outcome = Outcome(index=i, error=str(e), seconds=seconds)
+                yield outcome
+
+            now = time.monotonic()
+            for f in list(pending):
+                i = futures[f]
+                t0 = started.get(i)
+                if t0 is not None and now - t0 >= timeout_s:
+                    pending.discard(f)
+                    yield Outcome(index=i, timed_out=True, seconds=round(now - t0, 3))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
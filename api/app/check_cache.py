@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from .checks.registry import CheckSpec
+from .config import Settings
+from .models import CheckResult
+from .storage import Storage
+
+# Only settled outcomes are reused; an error or skip is always retried on the next scan.
+_CACHEABLE = frozenset({"pass", "fail", "warn"})
+
+
+def cache_scope(settings: Settings) -> str:
+    # Regional results are merged over the configured regions, so they only apply to the same setup.
+    return f"{settings.aws_region}|{settings.scan_regions.strip()}"
+
+
+def reusable_results(
+    st: Storage, settings: Settings, account_id: str, specs: list[CheckSpec], now: datetime
+) -> dict[str, tuple[CheckResult, datetime]]:
+    """Fresh cached results for the specs that declare a TTL: check id -> (result, checked_at)."""
+
+    cached = st.cached_check_results(account_id, cache_scope(settings), now=now)
+    return {s.id: cached[s.id] for s in specs if s.ttl_s > 0 and s.id in cached}
+
+
+def remember_results(
+    st: Storage,
+    settings: Settings,
+    account_id: str,
+    specs: list[CheckSpec],
+    results: list[CheckResult],
+    checked_at: datetime,
+) -> None:
+    """Cache the executed results of checks that declare a TTL."""
+
+    ttls = {s.id: s.ttl_s for s in specs if s.ttl_s > 0}
+    entries = [
+        (r, checked_at, checked_at + timedelta(seconds=ttls[r.id]))
+        for r in results
+        if r.id in ttls and r.status in _CACHEABLE
+    ]
+    if entries:
+        st.cache_check_results(account_id, cache_scope(settings), entries)
+
+
+def cache_breakdown(
+    reused: dict[str, tuple[CheckResult, datetime]], now: datetime, executed: int
+) -> dict[str, Any]:
+    return {
+        "fast_rescan": True,
+        "executed": executed,
+        "reused": {
+            check_id: {
+                "checked_at": checked_at.isoformat(),
+                "age_s": round((now - checked_at).total_seconds(), 1),
+            }
+            for check_id, (_, checked_at) in reused.items()
+        },
+    }
@@ -2,13 +2,18 @@ from __future__ import annotations
 
 import boto3
 
+from ..inventory import ScanInventory
 from ..models import CheckResult
+from .registry import check_spec
 
 SENSITIVE_PORTS = {22, 3389, 5432, 3306, 6379, 9200, 27017}
 
 
-def check_sg_open_sensitive_ports(session: boto3.session.Session, region: str) -> CheckResult:
-    ec2 = session.client("ec2", region_name=region)
+def check_sg_open_sensitive_ports(
+    session: boto3.session.Session, region: str, inventory: ScanInventory | None = None
+) -> CheckResult:
+    inv = inventory or ScanInventory(session, region)
+    ec2 = inv.client("ec2")
     open_rules: list[dict] = []
     try:
         resp = ec2.describe_security_groups(MaxResults=200)
@@ -34,12 +39,8 @@ def check_sg_open_sensitive_ports(session: boto3.session.Session, region: str) -
                         )
 
         status = "pass" if not open_rules else "fail"
-        return CheckResult(
-            id="net.sg_open_sensitive_ports",
-            title="Security groups open to 0.0.0.0/0 on sensitive ports",
-            severity="critical",
-            status=status,
-            domain="Network Exposure",
+        return check_spec("net.sg_open_sensitive_ports").result(
+            status,
             evidence={
                 "findings": open_rules[:25],
                 "count": len(open_rules),
@@ -47,17 +48,10 @@ def check_sg_open_sensitive_ports(session: boto3.session.Session, region: str) -
             },
             recommendation="Restrict inbound rules: remove 0.0.0.0/0 access on admin/database ports; use VPN/bastion/SSM.",
             references=["https://docs.aws.amazon.com/vpc/latest/userguide/VPC_SecurityGroups.html"],
-            weight=15,
         )
     except Exception as e:
-        return CheckResult(
-            id="net.sg_open_sensitive_ports",
-            title="Security groups open to 0.0.0.0/0 on sensitive ports",
-            severity="critical",
-            status="error",
-            domain="Network Exposure",
+        return check_spec("net.sg_open_sensitive_ports").result(
+            "error",
             evidence={"error": str(e)},
             recommendation="Ensure the scanning role can call ec2:DescribeSecurityGroups.",
-            references=[],
-            weight=15,
         )
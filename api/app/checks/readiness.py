@@ -2,34 +2,28 @@ from __future__ import annotations
 
 import boto3
 
+from ..inventory import ScanInventory
 from ..models import CheckResult
+from .registry import check_spec
 
 
-def check_aws_config_recorder_present(session: boto3.session.Session, region: str) -> CheckResult:
-    cfg = session.client("config", region_name=region)
+def check_aws_config_recorder_present(
+    session: boto3.session.Session, region: str, inventory: ScanInventory | None = None
+) -> CheckResult:
+    inv = inventory or ScanInventory(session, region)
+    cfg = inv.client("config")
     try:
         recorders = cfg.describe_configuration_recorders().get("ConfigurationRecorders", [])
         status = "pass" if recorders else "warn"
-        return CheckResult(
-            id="ir.aws_config_recorder",
-            title="AWS Config presence (configuration recorder)",
-            severity="medium",
-            status=status,
-            domain="IR Readiness",
+        return check_spec("ir.aws_config_recorder").result(
+            status,
             evidence={"recorders": [{"name": r.get("name"), "roleARN": r.get("roleARN")} for r in recorders]},
             recommendation="Enable AWS Config (at least in key regions) to support forensics and drift detection.",
             references=["https://docs.aws.amazon.com/config/latest/developerguide/WhatIsConfig.html"],
-            weight=8,
         )
     except Exception as e:
-        return CheckResult(
-            id="ir.aws_config_recorder",
-            title="AWS Config presence (configuration recorder)",
-            severity="medium",
-            status="error",
-            domain="IR Readiness",
+        return check_spec("ir.aws_config_recorder").result(
+            "error",
             evidence={"error": str(e)},
             recommendation="Ensure the scanning role can call config:DescribeConfigurationRecorders.",
-            references=[],
-            weight=8,
         )
@@ -1,16 +1,75 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Awaitable, Iterable
+from dataclasses import dataclass
+from functools import cache
+from typing import Literal, Protocol
 
 import boto3
 
-from ..models import CheckResult
+from ..inventory import ScanInventory
+from ..models import CheckResult, CheckStatus, Severity
 
-CheckFn = Callable[[boto3.session.Session, str], CheckResult]
+CheckScope = Literal["global", "regional"]
 
 
-def all_checks() -> list[CheckFn]:
+class CheckFn(Protocol):
+    def __call__(
+        self, session: boto3.session.Session, region: str, inventory: ScanInventory | None = None
+    ) -> CheckResult: ...
+
+
+class AsyncCheckFn(Protocol):
+    # Async checks run directly on the event loop; sync checks are offloaded to threads.
+    def __call__(
+        self, session: boto3.session.Session, region: str, inventory: ScanInventory | None = None
+    ) -> Awaitable[CheckResult]: ...
+
+
+@dataclass(frozen=True)
+class CheckSpec:
+    # Static metadata lets the engine report on a check (e.g. a timeout) without running it; check
+    # bodies build their results from it too (see `result`), so it is the only copy.
+    id: str
+    title: str
+    severity: Severity
+    domain: str
+    weight: int
+    fn: CheckFn | AsyncCheckFn
+    # "regional" checks look at per-region resources and fan out across SCAN_REGIONS;
+    # "global" checks (IAM, the S3 bucket list) run once per scan.
+    scope: CheckScope = "global"
+    # Fast rescans reuse a result younger than this instead of calling AWS (0 = always run).
+    ttl_s: float = 0.0
+
+    def result(
+        self,
+        status: CheckStatus,
+        *,
+        evidence: dict,
+        recommendation: str,
+        references: Iterable[str] = (),
+    ) -> CheckResult:
+        return CheckResult(
+            id=self.id,
+            title=self.title,
+            severity=self.severity,
+            status=status,
+            domain=self.domain,
+            evidence=evidence,
+            recommendation=recommendation,
+            references=list(references),
+            weight=self.weight,
+        )
+
+
+_HOUR = 3600.0
+_DAY = 24 * _HOUR
+
+
+def all_check_specs() -> list[CheckSpec]:
     from .identity import (
+        ACCESS_KEY_MAX_AGE_DAYS,
         check_iam_admin_attachments,
         check_iam_old_access_keys,
         check_iam_password_policy,
@@ -30,18 +89,128 @@ def all_checks() -> list[CheckFn]:
     )
     from .readiness import check_aws_config_recorder_present
 
+    ia, lt, ne, dp, ir = (
+        "Identity & Access",
+        "Logging & Traceability",
+        "Network Exposure",
+        "Data Protection",
+        "IR Readiness",
+    )
     return [
-        check_root_mfa,
-        check_iam_password_policy,
-        check_iam_old_access_keys,
-        check_iam_admin_attachments,
-        check_cloudtrail_enabled,
-        check_cloudtrail_multiregion,
-        check_log_group_retention,
-        check_s3_public_access_block,
-        check_s3_default_encryption_sampled,
-        check_s3_access_logging_sampled,
-        check_kms_key_policy_sanity,
-        check_sg_open_sensitive_ports,
-        check_aws_config_recorder_present,
+        CheckSpec("iam.root_mfa", "Root account MFA enabled", "critical", ia, 15, check_root_mfa, ttl_s=_DAY),
+        CheckSpec(
+            "iam.password_policy",
+            "IAM account password policy strength",
+            "high",
+            ia,
+            10,
+            check_iam_password_policy,
+            ttl_s=_DAY,
+        ),
+        CheckSpec(
+            "iam.old_access_keys",
+            f"Access keys older than {ACCESS_KEY_MAX_AGE_DAYS} days",
+            "medium",
+            ia,
+            10,
+            check_iam_old_access_keys,
+        ),
+        CheckSpec(
+            "iam.admin_attachments",
+            "AdministratorAccess/PowerUserAccess attachments",
+            "high",
+            ia,
+            12,
+            check_iam_admin_attachments,
+        ),
+        CheckSpec(
+            "logging.cloudtrail_enabled",
+            "CloudTrail enabled (logging)",
+            "critical",
+            lt,
+            15,
+            check_cloudtrail_enabled,
+            "regional",
+        ),
+        CheckSpec(
+            "logging.cloudtrail_multiregion",
+            "CloudTrail multi-region trail recommended",
+            "high",
+            ir,
+            10,
+            check_cloudtrail_multiregion,
+            ttl_s=6 * _HOUR,
+        ),
+        CheckSpec(
+            "logging.log_group_retention",
+            "CloudWatch Logs retention set (avoid infinite retention)",
+            "low",
+            lt,
+            8,
+            check_log_group_retention,
+            "regional",
+        ),
+        CheckSpec(
+            "s3.public_access_block",
+            "S3 public access block enabled",
+            "high",
+            dp,
+            12,
+            check_s3_public_access_block,
+        ),
+        CheckSpec(
+            "s3.default_encryption",
+            "S3 default encryption enabled",
+            "high",
+            dp,
+            10,
+            check_s3_default_encryption_sampled,
+        ),
+        CheckSpec(
+            "s3.access_logging",
+            "S3 server access logging enabled",
+            "medium",
+            lt,
+            8,
+            check_s3_access_logging_sampled,
+        ),
+        CheckSpec(
+            "kms.key_policy_sanity",
+            "KMS key policy sanity (sampled keys)",
+            "high",
+            dp,
+            10,
+            check_kms_key_policy_sanity,
+            "regional",
+        ),
+        CheckSpec(
+            "net.sg_open_sensitive_ports",
+            "Security groups open to 0.0.0.0/0 on sensitive ports",
+            "critical",
+            ne,
+            15,
+            check_sg_open_sensitive_ports,
+            "regional",
+        ),
+        CheckSpec(
+            "ir.aws_config_recorder",
+            "AWS Config presence (configuration recorder)",
+            "medium",
+            ir,
+            8,
+            check_aws_config_recorder_present,
+            "regional",
+            ttl_s=6 * _HOUR,
+        ),
     ]
+
+
+@cache
+def check_spec(check_id: str) -> CheckSpec:
+    """The registered spec for `check_id` (checks look up their own title, severity and domain)."""
+
+    return {spec.id: spec for spec in all_check_specs()}[check_id]
+
+
+def all_checks() -> list[CheckFn | AsyncCheckFn]:
+    return [spec.fn for spec in all_check_specs()]
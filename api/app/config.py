@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,6 +7,9 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     aws_region: str = "us-east-1"
+    # Regional checks (CloudTrail, Logs, EC2, KMS, Config) fan out to these regions: a comma list,
+    # or "all" for every enabled region. Empty scans AWS_REGION only. Global checks run once.
+    scan_regions: str = ""
     env: str = "local"
 
     # $0 AWS bill by default:
@@ -12,6 +17,58 @@ class Settings(BaseSettings):
     # - all AWS calls are disabled unless explicitly enabled
     aws_scan_enabled: bool = False
 
+    # AWS checks are I/O bound; run them on a bounded pool and give up on any single slow check.
+    scan_max_workers: int = 8
+    scan_check_timeout_s: float = 60.0
+    # Fast rescans reuse cached results of checks still within their declared TTL (root MFA, password
+    # policy, Config recorder, multi-region trail); `?fast=true` on the scan endpoints asks per request.
+    scan_fast_rescan: bool = False
+    # Background scan jobs (POST /api/scan/jobs) run on their own small pool.
+    scan_job_workers: int = 2
+
+    # Shared botocore clients: keep enough pooled connections for concurrent checks.
+    aws_max_pool_connections: int = 32
+    aws_max_attempts: int = 8
+    # Client-side rate limit per (service, region) in requests/s, shared by all checks of an account;
+    # AWS_RATE_LIMITS overrides it per service ("iam=10,s3=50"). Throttles halve a bucket's rate and
+    # successful calls restore it gradually.
+    aws_rate_limit: float = 20.0
+    aws_rate_limits: str = "iam=10,s3=50"
+    aws_rate_burst: int = 10
+
+    # S3 checks sample 10 buckets by default; full coverage inspects every bucket concurrently.
+    s3_full_coverage: bool = False
+    s3_max_concurrency: int = 16
+
+    # IAM principals: "bulk" (authorization details + credential report) or per-principal "fanout".
+    iam_collection: Literal["bulk", "fanout"] = "bulk"
+    iam_max_concurrency: int = 8
+
+    # Org scans (POST /api/org/scan) assume ORG_ROLE_NAME in each account and scan them in parallel.
+    # ORG_ACCOUNTS is a comma list; empty lists the organization's active accounts.
+    org_accounts: str = ""
+    org_role_name: str = "CloudSentinelReadOnly"
+    org_external_id: str = ""
+    org_max_workers: int = 4
+    org_account_timeout_s: float = 900.0
+
+    # Stored evidence keeps at most this many items per list (full lengths go under "truncated").
+    evidence_max_items: int = 50
+    evidence_max_str_chars: int = 4096
+    # Snapshot/evidence blob codec. "zstd" needs the optional zstandard package. Blobs record their
+    # codec, so switching only affects new writes and existing ones stay readable.
+    storage_compression: Literal["zlib", "zstd", "none"] = "zlib"
+
+    # Full scans are kept this many days, then pruned (0 disables pruning); their hourly/daily/weekly
+    # rollups remain, and hourly/daily ones are dropped after scan_rollup_daily_days.
+    scan_retention_days: int = 30
+    scan_rollup_daily_days: int = 365
+    retention_interval_s: float = 3600.0
+    retention_vacuum_pages: int = 0
+
+    # Serialized scan/diff/latest-score responses kept in memory (LRU, per process).
+    response_cache_entries: int = 512
+
     cors_origins: str = "http://localhost:3000"
 
     project_tag: str = "cloudsentinel"
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+# CloudTrail event name -> ids of the checks whose outcome it can change. Covers the AWS checks
+# in the registry and the offline checks in local_checks (data.*, log.*).
+EVENT_CHECKS: dict[str, tuple[str, ...]] = {
+    # IAM
+    "EnableMFADevice": ("iam.root_mfa",),
+    "DeactivateMFADevice": ("iam.root_mfa",),
+    "CreateVirtualMFADevice": ("iam.root_mfa",),
+    "DeleteVirtualMFADevice": ("iam.root_mfa",),
+    "UpdateAccountPasswordPolicy": ("iam.password_policy",),
+    "DeleteAccountPasswordPolicy": ("iam.password_policy",),
+    "CreateAccessKey": ("iam.old_access_keys",),
+    "UpdateAccessKey": ("iam.old_access_keys",),
+    "DeleteAccessKey": ("iam.old_access_keys",),
+    "CreateUser": ("iam.old_access_keys", "iam.admin_attachments"),
+    "DeleteUser": ("iam.old_access_keys", "iam.admin_attachments"),
+    "AttachUserPolicy": ("iam.admin_attachments",),
+    "DetachUserPolicy": ("iam.admin_attachments",),
+    "AttachRolePolicy": ("iam.admin_attachments",),
+    "DetachRolePolicy": ("iam.admin_attachments",),
+    "CreateRole": ("iam.admin_attachments",),
+    "DeleteRole": ("iam.admin_attachments",),
+    # S3
+    "CreateBucket": ("s3.public_access_block", "s3.default_encryption", "s3.access_logging"),
+    "DeleteBucket": ("s3.public_access_block", "s3.default_encryption", "s3.access_logging"),
+    "PutBucketAcl": ("s3.public_access_block", "data.s3_public_access_block"),
+    "PutBucketPolicy": ("s3.public_access_block", "data.s3_public_access_block"),
+    "DeleteBucketPolicy": ("s3.public_access_block", "data.s3_public_access_block"),
+    "PutBucketPublicAccessBlock": ("s3.public_access_block", "data.s3_public_access_block"),
+    "DeleteBucketPublicAccessBlock": ("s3.public_access_block", "data.s3_public_access_block"),
+    "PutBucketEncryption": ("s3.default_encryption", "data.encryption_at_rest"),
+    "DeleteBucketEncryption": ("s3.default_encryption", "data.encryption_at_rest"),
+    "PutBucketLogging": ("s3.access_logging",),
+    # CloudTrail and CloudWatch Logs
+    "CreateTrail": ("logging.cloudtrail_enabled", "logging.cloudtrail_multiregion"),
+    "UpdateTrail": ("logging.cloudtrail_enabled", "logging.cloudtrail_multiregion"),
+    "DeleteTrail": ("logging.cloudtrail_enabled", "logging.cloudtrail_multiregion"),
+    "StartLogging": ("logging.cloudtrail_enabled",),
+    "StopLogging": ("logging.cloudtrail_enabled",),
+    "CreateLogGroup": ("logging.log_group_retention",),
+    "PutRetentionPolicy": ("logging.log_group_retention",),
+    "DeleteRetentionPolicy": ("logging.log_group_retention",),
+    # EC2, KMS, Config
+    "AuthorizeSecurityGroupIngress": ("net.sg_open_sensitive_ports",),
+    "RevokeSecurityGroupIngress": ("net.sg_open_sensitive_ports",),
+    "ModifySecurityGroupRules": ("net.sg_open_sensitive_ports",),
+    "DeleteSecurityGroup": ("net.sg_open_sensitive_ports",),
+    "CreateKey": ("kms.key_policy_sanity",),
+    "PutKeyPolicy": ("kms.key_policy_sanity",),
+    "ScheduleKeyDeletion": ("kms.key_policy_sanity",),
+    "PutConfigurationRecorder": ("ir.aws_config_recorder",),
+    "DeleteConfigurationRecorder": ("ir.aws_config_recorder",),
+    "StartConfigurationRecorder": ("ir.aws_config_recorder",),
+    "StopConfigurationRecorder": ("ir.aws_config_recorder",),
+}
+
+# Checks that summarize timeline activity as a whole, affected by any event.
+ANY_EVENT_CHECKS: tuple[str, ...] = ("log.alerting_baseline",)
+
+
+def checks_for_events(event_names: Iterable[str]) -> set[str]:
+    """Ids of the checks a batch of events can affect (empty if there were no events)."""
+
+    affected: set[str] = set()
+    for name in event_names:
+        affected.update(EVENT_CHECKS.get(name, ()))
+        affected.update(ANY_EVENT_CHECKS)
+    return affected
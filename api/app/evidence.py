@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from .models import CheckResult
+
+
+@dataclass(frozen=True)
+class EvidencePolicy:
+    # Lists longer than this keep their first `max_items` entries.
+    max_items: int = 50
+    # Strings longer than this are cut (policy documents, raw error bodies).
+    max_str_chars: int = 4096
+
+
+def cap_evidence(evidence: dict[str, Any], policy: EvidencePolicy) -> dict[str, Any]:
+    """
+    Bound an evidence dict without losing its totals.
+
+    Every list or string that exceeds the policy is cut down to a sample, and its original length
+    is recorded under `truncated` keyed by dotted path (e.g. `{"stale_keys": 120}`). Capping is
+    idempotent, so already-capped evidence passes through unchanged.
+    """
+
+    truncated: dict[str, int] = dict(evidence.get("truncated") or {})
+    capped = _cap(evidence, policy, "", truncated)
+    if truncated:
+        capped["truncated"] = truncated
+    return capped
+
+
+def cap_result(result: CheckResult, policy: EvidencePolicy) -> CheckResult:
+    capped = cap_evidence(result.evidence, policy)
+    if capped == result.evidence:
+        return result
+    return result.model_copy(update={"evidence": capped})
+
+
+def _cap(value: Any, policy: EvidencePolicy, path: str, truncated: dict[str, int]) -> Any:
+    if isinstance(value, dict):
+        return {
+            k: v
+            if not path and k == "truncated"
+            else _cap(v, policy, f"{path}.{k}" if path else k, truncated)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        if len(value) > policy.max_items:
+            truncated[path] = max(len(value), truncated.get(path, 0))
+            value = value[: policy.max_items]
+        return [_cap(v, policy, f"{path}[]", truncated) for v in value]
+    if isinstance(value, str) and len(value) > policy.max_str_chars:
+        truncated[path] = max(len(value), truncated.get(path, 0))
+        return value[: policy.max_str_chars]
+    return value
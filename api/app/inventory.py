@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import contextvars
+import copy
+import csv
+import io
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import chain, zip_longest
+from typing import Any, Literal, TypeVar
+
+import boto3
+
+T = TypeVar("T")
+
+# Buckets inspected per scan unless full coverage is enabled.
+S3_SAMPLE_SIZE = 10
+
+_S3_BUCKET_OPS: dict[str, Callable[[Any, str], Any]] = {
+    "public_access_block": lambda s3, b: s3.get_public_access_block(Bucket=b)[
+        "PublicAccessBlockConfiguration"
+    ],
+    "encryption": lambda s3, b: s3.get_bucket_encryption(Bucket=b)["ServerSideEncryptionConfiguration"],
+    "logging": lambda s3, b: s3.get_bucket_logging(Bucket=b).get("LoggingEnabled"),
+}
+
+
+@dataclass
+class BucketConfig:
+    name: str
+    region: str
+    # Keyed by _S3_BUCKET_OPS name; an op appears in exactly one of `values` / `errors`.
+    values: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class S3BucketScan:
+    buckets: list[BucketConfig]
+    total_buckets: int
+    full_coverage: bool
+
+    def evidence(self) -> dict[str, Any]:
+        return {
+            "sampled": len(self.buckets),
+            "total_buckets": self.total_buckets,
+            "coverage": "full" if self.full_coverage else "sampled",
+        }
+
+
+IamCollection = Literal["bulk", "fanout"]
+
+
+@dataclass
+class IamUser:
+    name: str
+    attached_policy_arns: list[str] = field(default_factory=list)
+    # {"access_key_id": str | None, "created": datetime, "active": bool}; the credential report
+    # identifies keys by slot rather than id, so bulk collection leaves the id empty.
+    access_keys: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class IamRole:
+    name: str
+    attached_policy_arns: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class IamPrincipals:
+    users: list[IamUser]
+    roles: list[IamRole]
+    source: IamCollection
+
+
+class ScanInventory:
+    """
+    Scan-scoped cache of AWS list/describe calls shared by all checks.
+
+    Each key is loaded at most once per scan, even when several checks ask for it concurrently:
+    the first caller runs the loader while the others wait on a per-key lock. Loader errors are
+    not cached, so every caller sees (and reports) the failure itself.
+
+    Multi-region scans use `for_region` views: they share the cache, clients and counters, and
+    region-specific keys (e.g. trails) include the view's region.
+    """
+
+    def __init__(
+        self,
+        session: boto3.session.Session,
+        region: str,
+        *,
+        s3_full_coverage: bool = False,
+        max_fanout: int = 16,
+        iam_collection: IamCollection = "bulk",
+        iam_max_fanout: int = 8,
+    ):
+        self.session = session
+        self.region = region
+        self.s3_full_coverage = s3_full_coverage
+        self.max_fanout = max(1, max_fanout)
+        self.iam_collection = iam_collection
+        self.iam_max_fanout = max(1, iam_max_fanout)
+        self._values: dict[str, Any] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._clients: dict[tuple[str, str], Any] = {}
+        self._guard = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0}
+
+    @property
+    def hits(self) -> int:
+        return self._counts["hits"]
+
+    @property
+    def misses(self) -> int:
+        return self._counts["misses"]
+
+    def for_region(self, region: str) -> ScanInventory:
+        if region == self.region:
+            return self
+        view = copy.copy(self)
+        view.region = region
+        return view
+
+    def client(self, service: str, region: str | None = None) -> Any:
+        # boto3 sessions are not safe for concurrent client creation; serialize and reuse.
+        key = (service, region or self.region)
+        with self._guard:
+            c = self._clients.get(key)
+            if c is None:
+                c = self.session.client(service, region_name=key[1])
+                self._clients[key] = c
+            return c
+
+    def get(self, key: str, loader: Callable[[], T]) -> T:
+        with self._guard:
+            if key in self._values:
+                self._counts["hits"] += 1
+                return self._values[key]
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            with self._guard:
+                if key in self._values:
+                    self._counts["hits"] += 1
+                    return self._values[key]
+                self._counts["misses"] += 1
+            value = loader()
+            with self._guard:
+                self._values[key] = value
+            return value
+
+    def stats(self) -> dict[str, int]:
+        with self._guard:
+            return {**self._counts, "keys": len(self._values)}
+
+    def list_buckets(self) -> list[dict]:
+        return self.get("s3.list_buckets", lambda: self.client("s3").list_buckets().get("Buckets", []))
+
+    def describe_trails(self) -> list[dict]:
+        # Shadow trails are multi-region trails homed elsewhere that also log this region.
+        return self.get(
+            f"cloudtrail.describe_trails:{self.region}",
+            lambda: self.client("cloudtrail").describe_trails(includeShadowTrails=True).get("trailList", []),
+        )
+
+    def list_users(self) -> list[dict]:
+        return self.get("iam.list_users", lambda: self._paginate("iam", "list_users", "Users"))
+
+    def list_roles(self) -> list[dict]:
+        return self.get("iam.list_roles", lambda: self._paginate("iam", "list_roles", "Roles"))
+
+    def _paginate(self, service: str, operation: str, key: str) -> list[dict]:
+        items: list[dict] = []
+        for page in self.client(service).get_paginator(operation).paginate():
+            items.extend(page.get(key, []))
+        return items
+
+    def s3_bucket_configs(self) -> S3BucketScan:
+        """
+        Per-bucket public access block, encryption and logging, fetched in one concurrent pass.
+
+        Buckets are grouped by region and queried through regional clients (avoiding cross-region
+        redirects). Each region's buckets are split into at most its share of `max_fanout` lanes,
+        one pool task per lane working through its buckets in turn, and lanes are submitted
+        interleaved across regions: no single regional endpoint gets the whole burst, and no
+        worker sits blocked waiting for its region's turn. The pooled clients' shared rate limiter
+        paces and backs off on any remaining throttling.
+        """
+
+        return self.get("s3.bucket_configs", self._load_s3_bucket_configs)
+
+    def _load_s3_bucket_configs(self) -> S3BucketScan:
+        listed = self.list_buckets()
+        buckets = listed if self.s3_full_coverage else listed[:S3_SAMPLE_SIZE]
+        if not buckets:
+            return S3BucketScan(buckets=[], total_buckets=len(listed), full_coverage=self.s3_full_coverage)
+
+        with ThreadPoolExecutor(max_workers=self.max_fanout, thread_name_prefix="s3-fanout") as pool:
+            regions = list(pool.map(_in_caller_context(self._bucket_region), buckets))
+            by_region: dict[str, list[BucketConfig]] = defaultdict(list)
+            for b, r in zip(buckets, regions, strict=True):
+                by_region[r].append(BucketConfig(name=b["Name"], region=r))
+
+            per_region = max(1, self.max_fanout // len(by_region))
+            lanes = [
+                [group[i::per_region] for i in range(min(per_region, len(group)))]
+                for group in by_region.values()
+            ]
+
+            def fetch(lane: list[BucketConfig]) -> None:
+                for cfg in lane:
+                    s3 = self.client("s3", cfg.region)
+                    for op, call in _S3_BUCKET_OPS.items():
+                        try:
+                            cfg.values[op] = call(s3, cfg.name)
+                        except Exception as e:
+                            cfg.errors[op] = str(e)
+
+            interleaved = [lane for lane in chain.from_iterable(zip_longest(*lanes)) if lane]
+            list(pool.map(_in_caller_context(fetch), interleaved))
+
+        configs = {c.name: c for group in by_region.values() for c in group}
+        return S3BucketScan(
+            buckets=[configs[b["Name"]] for b in buckets],
+            total_buckets=len(listed),
+            full_coverage=self.s3_full_coverage,
+        )
+
+    def _bucket_region(self, bucket: dict) -> str:
+        if bucket.get("BucketRegion"):
+            return str(bucket["BucketRegion"])
+        try:
+            loc = self.client("s3").get_bucket_location(Bucket=bucket["Name"]).get("LocationConstraint")
+        except Exception:
+            return self.region
+        # Legacy values: no constraint means us-east-1, "EU" means eu-west-1.
+        if not loc:
+            return "us-east-1"
+        return "eu-west-1" if loc == "EU" else str(loc)
+
+    def iam_principals(self) -> IamPrincipals:
+        """
+        Users (attached policies + access keys) and roles (attached policies) in one dataset.
+
+        "bulk" uses GetAccountAuthorizationDetails plus the credential report: a handful of
+        paginated calls regardless of account size. If either is denied, or with "fanout", it
+        falls back to ListUsers/ListRoles and per-principal calls on a bounded pool.
+        """
+
+        def load() -> IamPrincipals:
+            if self.iam_collection == "bulk":
+                try:
+                    return self._iam_bulk()
+                except Exception:
+                    pass
+            return self._iam_fanout()
+
+        return self.get("iam.principals", load)
+
+    def _iam_bulk(self) -> IamPrincipals:
+        iam = self.client("iam")
+        users: list[IamUser] = []
+        roles: list[IamRole] = []
+        for page in iam.get_paginator("get_account_authorization_details").paginate(Filter=["User", "Role"]):
+            for u in page.get("UserDetailList", []):
+                arns = [p["PolicyArn"] for p in u.get("AttachedManagedPolicies", [])]
+                users.append(IamUser(name=u["UserName"], attached_policy_arns=arns))
+            for r in page.get("RoleDetailList", []):
+                arns = [p["PolicyArn"] for p in r.get("AttachedManagedPolicies", [])]
+                roles.append(IamRole(name=r["RoleName"], attached_policy_arns=arns))
+
+        keys = _credential_report_keys(iam)
+        for u in users:
+            u.access_keys = keys.get(u.name, [])
+        return IamPrincipals(users=users, roles=roles, source="bulk")
+
+    def _iam_fanout(self) -> IamPrincipals:
+        iam = self.client("iam")
+        users = [IamUser(name=u["UserName"]) for u in self.list_users()]
+        roles = [IamRole(name=r["RoleName"]) for r in self.list_roles()]
+
+        def fetch_user(u: IamUser) -> None:
+            u.attached_policy_arns = [
+                p["PolicyArn"]
+                for p in iam.list_attached_user_policies(UserName=u.name).get("AttachedPolicies", [])
+            ]
+            u.access_keys = [
+                {
+                    "access_key_id": k["AccessKeyId"],
+                    "created": k["CreateDate"],
+                    "active": k.get("Status") == "Active",
+                }
+                for k in iam.list_access_keys(UserName=u.name).get("AccessKeyMetadata", [])
+            ]
+
+        def fetch_role(r: IamRole) -> None:
+            r.attached_policy_arns = [
+                p["PolicyArn"]
+                for p in iam.list_attached_role_policies(RoleName=r.name).get("AttachedPolicies", [])
+            ]
+
+        with ThreadPoolExecutor(max_workers=self.iam_max_fanout, thread_name_prefix="iam-fanout") as pool:
+            user_task, role_task = _in_caller_context(fetch_user), _in_caller_context(fetch_role)
+            futures = [pool.submit(user_task, u) for u in users] + [pool.submit(role_task, r) for r in roles]
+            for f in futures:
+                f.result()
+        return IamPrincipals(users=users, roles=roles, source="fanout")
+
+
+def _in_caller_context(fn: Callable[..., T]) -> Callable[..., T]:
+    # Fan-out threads run in a copy of the caller's context, so rate-limit waits are charged to
+    # the check that triggered the load.
+    ctx = contextvars.copy_context()
+    return lambda *args: ctx.copy().run(fn, *args)
+
+
+def _credential_report_keys(iam: Any, *, attempts: int = 10, delay_s: float = 1.0) -> dict[str, list[dict]]:
+    for _ in range(attempts):
+        if iam.generate_credential_report().get("State") == "COMPLETE":
+            break
+        time.sleep(delay_s)
+    content = iam.get_credential_report()["Content"]
+    if isinstance(content, bytes):
+        content = content.decode("utf-8")
+
+    keys: dict[str, list[dict]] = {}
+    for row in csv.DictReader(io.StringIO(content)):
+        user = row.get("user") or ""
+        if user == "<root_account>":
+            continue
+        for slot in (1, 2):
+            rotated = row.get(f"access_key_{slot}_last_rotated") or "N/A"
+            if rotated in {"N/A", "not_supported"}:
+                continue
+            keys.setdefault(user, []).append(
+                {
+                    "access_key_id": None,
+                    "key_slot": slot,
+                    "created": datetime.fromisoformat(rotated.replace("Z", "+00:00")),
+                    "active": row.get(f"access_key_{slot}_active") == "true",
+                }
+            )
+    return keys
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+
+import ulid
+
+from .config import Settings, get_settings
+from .models import OrgScanSummary, ScanJob, ScanSnapshot
+from .org_scan import run_org_scan
+from .scan_engine import run_scan
+from .storage import storage_provider
+
+# Finished jobs kept around for status polling; older ones are forgotten first.
+_MAX_FINISHED_JOBS = 200
+
+
+def scan_scope(settings: Settings) -> tuple[str, ...]:
+    """
+    Coalescing key for a scan request.
+
+    The AWS account is only known once a scan has started, so the scope is the identity that
+    will be used to resolve it (profile) plus the regions and data directory.
+    """
+
+    if settings.aws_scan_enabled:
+        return (
+            "aws",
+            os.getenv("AWS_PROFILE") or "",
+            settings.aws_region,
+            settings.scan_regions,
+            settings.data_dir,
+        )
+    return ("local", settings.data_dir, settings.aws_region)
+
+
+def org_scan_scope(settings: Settings, accounts: list[str] | None) -> tuple[str, ...]:
+    """Coalescing key for an org scan: the scan scope plus the requested accounts (empty: discover)."""
+
+    return ("org", *scan_scope(settings), ",".join(sorted(accounts or [])) or settings.org_accounts)
+
+
+class ScanJobQueue:
+    """
+    In-process scan job queue backed by a small worker pool.
+
+    Requests for a scope that already has a queued or running job return that job instead of
+    starting another full scan, so concurrent dashboard clicks cost one scan. Jobs run single
+    account scans by default; org scans pass their own `run` and `scope`.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="scan-job")
+        self._jobs: OrderedDict[str, ScanJob] = OrderedDict()
+        self._inflight: dict[tuple[str, ...], str] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        settings: Settings,
+        run: Callable[[], ScanSnapshot | OrgScanSummary] | None = None,
+        *,
+        scope: tuple[str, ...] | None = None,
+    ) -> tuple[ScanJob, bool]:
+        scope = scope or scan_scope(settings)
+        with self._lock:
+            existing = self._inflight.get(scope)
+            if existing is not None:
+                return self._jobs[existing].model_copy(), True
+            job = ScanJob(
+                job_id=str(ulid.new()),
+                status="queued",
+                region=settings.aws_region,
+                created_at=datetime.now(UTC),
+            )
+            self._jobs[job.job_id] = job
+            self._inflight[scope] = job.job_id
+            self._evict_locked()
+            snapshot = job.model_copy()
+        self._pool.submit(self._run, job.job_id, scope, run or (lambda: _run_scan(settings)))
+        return snapshot, False
+
+    def get(self, job_id: str) -> ScanJob | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job else None
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(
+        self, job_id: str, scope: tuple[str, ...], run: Callable[[], ScanSnapshot | OrgScanSummary]
+    ) -> None:
+        self._update(job_id, status="running", started_at=datetime.now(UTC))
+        try:
+            result = run()
+        except Exception as e:
+            self._finish(job_id, scope, status="failed", error=str(e))
+            return
+        if isinstance(result, OrgScanSummary):
+            self._finish(
+                job_id, scope, status="succeeded", org_scan_id=result.org_scan_id, score=result.score
+            )
+        else:
+            self._finish(job_id, scope, status="succeeded", scan_id=result.scan_id, score=result.score)
+
+    def _update(self, job_id: str, **fields: object) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._jobs[job_id] = job.model_copy(update=fields)
+
+    def _finish(self, job_id: str, scope: tuple[str, ...], **fields: object) -> None:
+        with self._lock:
+            if self._inflight.get(scope) == job_id:
+                del self._inflight[scope]
+        self._update(job_id, finished_at=datetime.now(UTC), **fields)
+
+    def _evict_locked(self) -> None:
+        inflight = set(self._inflight.values())
+        finished = [jid for jid in self._jobs if jid not in inflight]
+        for jid in finished[: max(0, len(finished) - _MAX_FINISHED_JOBS)]:
+            del self._jobs[jid]
+
+
+def _run_scan(settings: Settings) -> ScanSnapshot:
+    return run_scan(storage_provider(settings.data_dir, settings.storage_compression).get(), settings)
+
+
+def _run_org_scan(settings: Settings, accounts: list[str] | None) -> OrgScanSummary:
+    st = storage_provider(settings.data_dir, settings.storage_compression).get()
+    return run_org_scan(st, settings, accounts=accounts)
+
+
+def submit_org_scan(settings: Settings, accounts: list[str] | None = None) -> tuple[ScanJob, bool]:
+    """Queue an org scan on its own queue, so hours-long org runs never hold up account scans."""
+
+    return get_org_job_queue().submit(
+        settings, lambda: _run_org_scan(settings, accounts), scope=org_scan_scope(settings, accounts)
+    )
+
+
+_queue: ScanJobQueue | None = None
+_org_queue: ScanJobQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> ScanJobQueue:
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ScanJobQueue(max_workers=get_settings().scan_job_workers)
+        return _queue
+
+
+def get_org_job_queue() -> ScanJobQueue:
+    # One org scan at a time: each already fans out over ORG_MAX_WORKERS accounts.
+    global _org_queue
+    with _queue_lock:
+        if _org_queue is None:
+            _org_queue = ScanJobQueue(max_workers=1)
+        return _org_queue
+
+
+def shutdown_job_queue() -> None:
+    global _queue, _org_queue
+    with _queue_lock:
+        queues, _queue, _org_queue = (_queue, _org_queue), None, None
+    for queue in queues:
+        if queue is not None:
+            queue.shutdown()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder is the fallback
+    orjson = None
+
+# One shared stdlib encoder: json.dumps(..., separators=...) builds a new encoder on every call.
+_std_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON. Callers pass JSON-mode data (str keys, no datetimes or NaN)."""
+
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _std_encode(obj).encode("utf-8")
+
+
+def dumps_text(obj: Any) -> str:
+    return dumps(obj).decode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
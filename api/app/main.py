@@ -1,15 +1,33 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import get_settings
+from .jobs import shutdown_job_queue
+from .retention import start_retention_worker, stop_retention_worker
+from .routers.org import router as org_router
 from .routers.policy import router as policy_router
 from .routers.scan import router as scan_router
 from .routers.sim import router as sim_router
+from .routers.storage import router as storage_router
+from .storage import close_storage_providers
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    start_retention_worker()
+    yield
+    stop_retention_worker()
+    shutdown_job_queue()
+    close_storage_providers()
+
 
 settings = get_settings()
-app = FastAPI(title="cloudsentinel api", version="0.1.0")
+app = FastAPI(title="cloudsentinel api", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -33,3 +51,5 @@ def healthz() -> dict:
 app.include_router(scan_router)
 app.include_router(policy_router)
 app.include_router(sim_router)
+app.include_router(storage_router)
+app.include_router(org_router)
@@ -7,6 +7,8 @@ from pydantic import BaseModel, Field
 
 CheckStatus = Literal["pass", "fail", "warn", "error", "skip"]
 Severity = Literal["low", "medium", "high", "critical"]
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+OrgAccountStatus = Literal["ok", "error", "timeout"]
 
 
 class CheckResult(BaseModel):
@@ -41,6 +43,64 @@ class ScanMeta(BaseModel):
     s3_key: str | None = None
 
 
+class OrgAccountScan(BaseModel):
+    account_id: str
+    status: OrgAccountStatus
+    scan_id: str | None = None
+    score: int | None = None
+    error: str | None = None
+    seconds: float | None = None
+
+
+class OrgScanRequest(BaseModel):
+    # Overrides ORG_ACCOUNTS / organization discovery for this run.
+    accounts: list[str] | None = None
+
+
+class OrgScanSummary(BaseModel):
+    org_scan_id: str
+    created_at: datetime
+    # Mean score over the accounts that scanned; None if none did.
+    score: int | None = None
+    accounts: list[OrgAccountScan]
+    aggregate: dict[str, Any] = Field(default_factory=dict)
+
+
+class TargetedRescanRequest(BaseModel):
+    # Explicit checks and/or CloudTrail event names. `since` adds the timeline events at or after
+    # that time; with none of the three, the events stored since the latest snapshot decide.
+    check_ids: list[str] | None = None
+    event_names: list[str] | None = None
+    since: datetime | None = None
+
+
+class TargetedRescanResponse(BaseModel):
+    events: list[str]
+    checks: list[str]
+    # None when no check was affected (nothing was re-run or stored).
+    snapshot: ScanSnapshot | None = None
+
+
+class ScanJob(BaseModel):
+    job_id: str
+    status: JobStatus
+    region: str
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    scan_id: str | None = None
+    # Set instead of scan_id by org scan jobs (see GET /api/org/scans/{org_scan_id}).
+    org_scan_id: str | None = None
+    score: int | None = None
+    error: str | None = None
+
+
+class ScanJobSubmitResponse(BaseModel):
+    job: ScanJob
+    # True when the request joined a scan already queued/running for the same account scope.
+    deduplicated: bool
+
+
 class PolicyValidateRequest(BaseModel):
     policy_json: str
     policy_type: Literal["IDENTITY_POLICY", "RESOURCE_POLICY"] = "IDENTITY_POLICY"
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import partial
+from typing import Any
+
+import boto3
+import ulid
+
+from .aws_client import assumed_role_sessions, boto_session
+from .bounded_pool import run_with_timeouts
+from .config import Settings
+from .models import OrgAccountScan, OrgScanSummary, ScanSnapshot
+from .scan_diff import FINDING_STATUSES
+from .scan_engine import scan_aws_account
+from .storage import Storage
+
+# Account scans are long; the coordinator re-checks them for timeouts at most this often.
+_POLL_S = 1.0
+# Worst-scoring accounts listed in the aggregate.
+_WORST_ACCOUNTS = 10
+
+
+def resolve_accounts(session: boto3.session.Session, settings: Settings) -> list[str]:
+    """`ORG_ACCOUNTS` if set, otherwise every ACTIVE account in the organization."""
+
+    listed = [a.strip() for a in settings.org_accounts.split(",") if a.strip()]
+    if listed:
+        return list(dict.fromkeys(listed))
+    accounts: list[str] = []
+    for page in session.client("organizations").get_paginator("list_accounts").paginate():
+        accounts.extend(a["Id"] for a in page.get("Accounts", []) if a.get("Status") == "ACTIVE")
+    return accounts
+
+
+def org_aggregate(snapshots: list[ScanSnapshot]) -> dict[str, Any]:
+    """Org-level rollup of per-account snapshots: score spread, domain means and common findings."""
+
+    if not snapshots:
+        return {"accounts_scanned": 0}
+    domains: dict[str, list[int]] = defaultdict(list)
+    findings: Counter[str] = Counter()
+    for snap in snapshots:
+        for domain, score in (snap.breakdown.get("domain_scores") or {}).items():
+            domains[domain].append(int(score))
+        findings.update(r.id for r in snap.results if r.status in FINDING_STATUSES)
+    scores = [s.score for s in snapshots]
+    worst = sorted(snapshots, key=lambda s: s.score)[:_WORST_ACCOUNTS]
+    return {
+        "accounts_scanned": len(snapshots),
+        "score_min": min(scores),
+        "score_max": max(scores),
+        "domain_scores": {d: round(sum(v) / len(v)) for d, v in domains.items()},
+        # Check id -> number of accounts where it is failing or warning, most widespread first.
+        "failing_checks": dict(findings.most_common()),
+        "worst_accounts": [
+            {"account_id": s.account_id, "score": s.score, "scan_id": s.scan_id} for s in worst
+        ],
+    }
+
+
+def run_org_scan(
+    st: Storage,
+    settings: Settings,
+    *,
+    accounts: list[str] | None = None,
+    scan_account: Callable[[str], ScanSnapshot] | None = None,
+) -> OrgScanSummary:
+    """
+    Scan every account of the organization through an assumed read-only role.
+
+    Accounts run on a pool of `org_max_workers` threads; each one is a full scan (its checks on
+    their own bounded pool) whose snapshot is stored as soon as it finishes. An account that
+    fails becomes an `error` entry and one still running after `org_account_timeout_s` a
+    `timeout` entry; neither holds up the rest. Snapshots are written from the calling thread,
+    which owns `st`.
+    """
+
+    org_scan_id = str(ulid.new())
+    created_at = datetime.now(UTC)
+    if scan_account is None:
+        sessions = assumed_role_sessions(
+            settings.aws_region, settings.org_role_name, settings.org_external_id
+        )
+
+        def scan_account(account_id: str) -> ScanSnapshot:
+            return scan_aws_account(sessions.session(account_id), settings, account_id)
+
+    if accounts is None:
+        accounts = resolve_accounts(boto_session(settings.aws_region), settings)
+
+    timeout_s = settings.org_account_timeout_s
+    entries: dict[str, OrgAccountScan] = {}
+    snapshots: list[ScanSnapshot] = []
+    for o in run_with_timeouts(
+        [partial(scan_account, a) for a in accounts],
+        max_workers=settings.org_max_workers,
+        timeout_s=timeout_s,
+        thread_name_prefix="org-scan",
+        poll_s=_POLL_S,
+    ):
+        account_id = accounts[o.index]
+        if o.timed_out:
+            entries[account_id] = OrgAccountScan(
+                account_id=account_id,
+                status="timeout",
+                error=f"account scan timed out after {timeout_s:g}s",
+                seconds=o.seconds,
+            )
+            continue
+        error = o.error
+        if o.value is not None:
+            snap = o.value.model_copy(
+                update={"breakdown": {**o.value.breakdown, "org": {"org_scan_id": org_scan_id}}}
+            )
+            try:
+                st.put_scan(snap)
+            except Exception as e:
+                error = str(e)
+        if error is not None or o.value is None:
+            entries[account_id] = OrgAccountScan(
+                account_id=account_id, status="error", error=error, seconds=o.seconds
+            )
+            continue
+        snapshots.append(snap)
+        entries[account_id] = OrgAccountScan(
+            account_id=account_id, status="ok", scan_id=snap.scan_id, score=snap.score, seconds=o.seconds
+        )
+
+    scores = [s.score for s in snapshots]
+    summary = OrgScanSummary(
+        org_scan_id=org_scan_id,
+        created_at=created_at,
+        score=round(sum(scores) / len(scores)) if scores else None,
+        accounts=[entries[a] for a in accounts if a in entries],
+        aggregate=org_aggregate(snapshots),
+    )
+    st.put_org_scan(summary)
+    return summary
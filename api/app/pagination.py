@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any
+
+
+def encode_cursor(*key: Any) -> str:
+    """Opaque keyset cursor: the sort key of the last row of a page, base64url-encoded JSON."""
+
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, arity: int) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except ValueError as e:
+        raise ValueError("invalid cursor") from e
+    if not isinstance(key, list) or len(key) != arity:
+        raise ValueError("invalid cursor")
+    # Only what encode_cursor writes (text timestamps and ids); anything else would reach sqlite.
+    if not all(isinstance(k, str | int) and not isinstance(k, bool) for k in key):
+        raise ValueError("invalid cursor")
+    return key
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+# Error codes AWS uses for throttling (botocore's standard retry mode treats the same set as throttles).
+THROTTLE_CODES = frozenset(
+    {
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottledException",
+        "TooManyRequestsException",
+        "ProvisionedThroughputExceededException",
+        "TransactionInProgressException",
+        "RequestLimitExceeded",
+        "BandwidthLimitExceeded",
+        "LimitExceededException",
+        "RequestThrottled",
+        "SlowDown",
+        "PriorRequestNotComplete",
+        "EC2ThrottledException",
+    }
+)
+
+# (per-scan wait totals, check id) for the check running in this context; see `track_wait`.
+_wait_sink: ContextVar[tuple[dict[str, float], str] | None] = ContextVar("rate_limit_wait_sink", default=None)
+_sink_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    # Requests per second per (service, region) bucket, unless `per_service` overrides it.
+    default_rate: float = 20.0
+    per_service: dict[str, float] = field(default_factory=dict)
+    # Requests that may be sent back to back before the rate applies.
+    burst: int = 10
+    # Throttling never pushes a bucket below this.
+    min_rate: float = 1.0
+
+    @classmethod
+    def parse(cls, default_rate: float, overrides: str, burst: int) -> RateLimits:
+        """`overrides` is "service=rate" pairs, e.g. "iam=10,s3=50"."""
+
+        per_service: dict[str, float] = {}
+        for item in overrides.split(","):
+            name, sep, value = item.partition("=")
+            if sep and name.strip():
+                per_service[name.strip()] = float(value)
+        return cls(default_rate=default_rate, per_service=per_service, burst=burst)
+
+
+class TokenBucket:
+    """
+    Token bucket with AIMD rate control: each throttle halves the rate, each successful call adds
+    back a small step until the configured limit is reached again.
+
+    `acquire` reserves a token even when none is available (the balance goes negative) and sleeps
+    outside the lock for its turn, so waiting callers are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: float):
+        self.max_rate = max(rate, min_rate)
+        self.min_rate = min_rate
+        self.rate = self.max_rate
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.throttles = 0
+        self.waited_s = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1.0
+            wait_s = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.waited_s += wait_s
+        if wait_s:
+            time.sleep(wait_s)
+        return wait_s
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.throttles += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            # Drop the burst allowance too, so the next calls are paced at the reduced rate.
+            self.tokens = min(self.tokens, 0.0)
+
+    def on_success(self) -> None:
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": round(self.rate, 3),
+                "max_rate": self.max_rate,
+                "throttles": self.throttles,
+                "waited_s": round(self.waited_s, 3),
+            }
+
+
+class RateLimiter:
+    """
+    Client-side rate control shared by every client of a session, one bucket per (service, region).
+
+    Hooks into botocore's event system: `before-send` takes a token for every HTTP attempt
+    (retries included) and `needs-retry` feeds throttle and success responses back into the
+    bucket. Time spent waiting is charged to the check running in the caller's context.
+    """
+
+    def __init__(self, limits: RateLimits | None = None):
+        self.limits = limits or RateLimits()
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, service: str, region: str) -> TokenBucket:
+        key = (service, region)
+        with self._lock:
+            b = self._buckets.get(key)
+            if b is None:
+                rate = self.limits.per_service.get(service, self.limits.default_rate)
+                b = TokenBucket(rate, self.limits.burst, self.limits.min_rate)
+                self._buckets[key] = b
+            return b
+
+    def attach(self, client: Any, service: str, region: str) -> None:
+        bucket = self.bucket(service, region)
+
+        def before_send(**_kwargs: Any) -> None:
+            waited = bucket.acquire()
+            if waited:
+                _charge(waited)
+
+        def needs_retry(response: Any = None, **_kwargs: Any) -> None:
+            if not response:
+                return
+            http, parsed = response
+            code = (parsed or {}).get("Error", {}).get("Code")
+            if code in THROTTLE_CODES or getattr(http, "status_code", None) == 429:
+                bucket.on_throttle()
+            elif code is None:
+                bucket.on_success()
+
+        client.meta.events.register("before-send", before_send)
+        client.meta.events.register("needs-retry", needs_retry)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            buckets = list(self._buckets.items())
+        return {f"{service}/{region}": b.stats() for (service, region), b in buckets}
+
+
+def _charge(seconds: float) -> None:
+    sink = _wait_sink.get()
+    if sink is not None:
+        totals, check_id = sink
+        with _sink_lock:
+            totals[check_id] = totals.get(check_id, 0.0) + seconds
+
+
+@contextmanager
+def track_wait(totals: dict[str, float] | None, check_id: str) -> Iterator[None]:
+    """Charge rate-limit waits in this context (and threads started with a copy of it) to `check_id`."""
+
+    if totals is None:
+        yield
+        return
+    token = _wait_sink.set((totals, check_id))
+    try:
+        yield
+    finally:
+        _wait_sink.reset(token)
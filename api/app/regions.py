@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+import boto3
+
+from .checks.registry import CheckSpec
+from .config import Settings
+from .inventory import ScanInventory
+from .models import CheckResult
+from .scan_diff import FINDING_STATUSES
+
+# A check's overall status is its worst regional status; errors outrank pass so they stay visible.
+_STATUS_RANK = {"fail": 4, "warn": 3, "error": 2, "pass": 1, "skip": 0}
+
+CheckJob = tuple[CheckSpec, str, ScanInventory]
+
+
+def resolve_regions(session: boto3.session.Session, settings: Settings) -> list[str] | None:
+    """
+    Regions that regional checks fan out to, or None for the single-region scan of `AWS_REGION`.
+
+    `SCAN_REGIONS` is a comma-separated list, or "all" for every region enabled in the account
+    (falling back to `AWS_REGION` if ec2:DescribeRegions is denied).
+    """
+
+    raw = settings.scan_regions.strip()
+    if not raw:
+        return None
+    if raw.lower() == "all":
+        try:
+            resp = session.client("ec2", region_name=settings.aws_region).describe_regions(
+                Filters=[{"Name": "opt-in-status", "Values": ["opt-in-not-required", "opted-in"]}]
+            )
+            found = sorted(r["RegionName"] for r in resp.get("Regions", []))
+        except Exception:
+            found = []
+        return found or [settings.aws_region]
+    return list(dict.fromkeys(r.strip() for r in raw.split(",") if r.strip())) or None
+
+
+def merge_regional(per_region: dict[str, CheckResult]) -> CheckResult:
+    """One result for a regional check: the worst status, with each region's evidence nested."""
+
+    worst = max(per_region.values(), key=lambda r: _STATUS_RANK[r.status])
+    evidence = {
+        "regions": {region: {"status": r.status, **r.evidence} for region, r in per_region.items()},
+        "failing_regions": [region for region, r in per_region.items() if r.status in FINDING_STATUSES],
+    }
+    return worst.model_copy(update={"evidence": evidence})
+
+
+class RegionFanout:
+    """
+    Plans a multi-region scan and folds the per-region results back into one result per check.
+
+    Global checks get one job against the primary inventory; regional checks get one job per
+    region, each against a `for_region` view of the same inventory. With `regions=None` every
+    check runs once in the inventory's region and results pass through unchanged. Results can be
+    added in any order; `add` returns a check's final result once all of its jobs are in.
+    """
+
+    def __init__(self, specs: list[CheckSpec], regions: list[str] | None, inventory: ScanInventory):
+        self.specs = specs
+        self.regions = regions or []
+        self.jobs: list[CheckJob] = []
+        for spec in specs:
+            if spec.scope == "regional" and regions:
+                self.jobs.extend((spec, r, inventory.for_region(r)) for r in regions)
+            else:
+                self.jobs.append((spec, inventory.region, inventory))
+        self._partial: dict[str, dict[str, CheckResult]] = {}
+        self._done: dict[str, CheckResult] = {}
+
+    def add(self, job_index: int, result: CheckResult) -> CheckResult | None:
+        spec, region, _ = self.jobs[job_index]
+        if spec.scope != "regional" or not self.regions:
+            self._done[spec.id] = result
+            return result
+        partial = self._partial.setdefault(spec.id, {})
+        partial[region] = result
+        if len(partial) < len(self.regions):
+            return None
+        merged = merge_regional({r: partial[r] for r in self.regions})
+        self._done[spec.id] = merged
+        return merged
+
+    def results(self) -> list[CheckResult]:
+        """Final results in the order of `specs`."""
+
+        return [self._done[s.id] for s in self.specs if s.id in self._done]
+
+    def matrix(self) -> dict[str, Any] | None:
+        """Region x check status matrix for the regional checks, plus per-region status counts."""
+
+        if not self.regions:
+            return None
+        checks = {
+            check_id: {region: r.status for region, r in per_region.items()}
+            for check_id, per_region in self._partial.items()
+        }
+        return _matrix(self.regions, checks)
+
+
+def merge_matrix(base: dict[str, Any] | None, update: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Overlay a partial rescan's matrix on the base snapshot's (only when both cover the same regions)."""
+
+    if not update:
+        return base
+    if not base or base.get("scanned") != update["scanned"]:
+        return update
+    return _matrix(update["scanned"], {**base["checks"], **update["checks"]})
+
+
+def _matrix(regions: list[str], checks: dict[str, dict[str, str]]) -> dict[str, Any]:
+    summary = {
+        region: dict(Counter(statuses[region] for statuses in checks.values() if region in statuses))
+        for region in regions
+    }
+    return {"scanned": regions, "checks": checks, "summary": summary}
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from .config import get_settings
+from .json_codec import dumps
+from .storage import add_write_listener
+
+
+class ResponseCache:
+    """
+    In-process LRU of serialized JSON response bodies, keyed by `(kind, id)`.
+
+    Scan snapshots and diffs never change once written, so their bodies are serialized once and
+    then served as bytes. Writes invalidate through storage listeners: a new scan drops the
+    "latest" entries, and retention pruning drops everything.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[str, str]) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: tuple[str, str], body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def invalidate(self, kind: str | None = None) -> None:
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == kind]:
+                    del self._entries[key]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def on_write(self, event: str) -> None:
+        self.invalidate("latest" if event == "scan" else None)
+
+
+def _serialize(content: Any) -> bytes:
+    # Pre-serialized bodies (stored snapshots) pass through untouched.
+    if isinstance(content, bytes):
+        return content
+    return dumps(jsonable_encoder(content))
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # If-None-Match uses weak comparison, so W/"x" matches "x".
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def conditional_json(
+    request: Request,
+    cache: ResponseCache,
+    key: tuple[str, str],
+    etag: str,
+    build: Callable[[], Any],
+    *,
+    exists: Callable[[], bool] | None = None,
+) -> Response:
+    """
+    Serve `key` with a strong ETag: 304 when the client already holds `etag`, otherwise the cached
+    body, building and caching it on a miss. `exists` confirms the resource before a 304 when the
+    body is not cached (so a deleted scan is not revalidated forever). `build` may raise, and may
+    return ready-made JSON bytes.
+    """
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag) and (key in cache or exists is None or exists()):
+        return Response(status_code=304, headers=headers)
+    body = cache.get(key)
+    if body is None:
+        body = _serialize(build())
+        cache.put(key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+_cache: ResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def response_cache() -> ResponseCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(max_entries=get_settings().response_cache_entries)
+            add_write_listener(_cache.on_write)
+        return _cache
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from .blobs import BlobCodec
+from .config import Settings, get_settings
+from .storage import Storage, storage_provider
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    # Full snapshots are kept this long; older scans survive only in their hourly/daily/weekly rollups.
+    keep_full_days: int = 30
+    # Hourly and daily rollups are dropped after this; weekly rollups are kept indefinitely.
+    keep_daily_days: int = 365
+    # Pages freed per incremental vacuum (0 = the whole freelist).
+    vacuum_pages: int = 0
+
+
+@dataclass(frozen=True)
+class RetentionStats:
+    ran_at: datetime
+    scans_pruned: int
+    daily_rollups_expired: int
+    hourly_rollups_expired: int
+    bytes_before: int
+    bytes_after: int
+    bytes_reclaimed: int
+    seconds: float
+
+
+def apply_retention(st: Storage, policy: RetentionPolicy, *, now: datetime | None = None) -> RetentionStats:
+    """Prune scans past the full-history window, expire old hourly and daily rollups, then vacuum."""
+
+    t0 = time.perf_counter()
+    now = now or datetime.now(UTC)
+    pruned = st.prune_scans(now - timedelta(days=policy.keep_full_days))
+    expired = st.expire_rollups("day", now - timedelta(days=policy.keep_daily_days))
+    hourly = st.expire_rollups("hour", now - timedelta(days=policy.keep_daily_days))
+    if pruned or expired or hourly:
+        space = st.reclaim_space(policy.vacuum_pages)
+    else:
+        size = st.db_size()["bytes"]
+        space = {"bytes_before": size, "bytes_after": size, "bytes_reclaimed": 0}
+    return RetentionStats(
+        ran_at=now,
+        scans_pruned=pruned,
+        daily_rollups_expired=expired,
+        hourly_rollups_expired=hourly,
+        seconds=time.perf_counter() - t0,
+        **space,
+    )
+
+
+class RetentionWorker:
+    """
+    Background thread that applies the retention policy every `interval_s` seconds.
+
+    Runs on its own thread-local connection from the storage provider; a failed run is logged and
+    retried on the next tick. Totals across runs are kept for the metrics endpoint.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        policy: RetentionPolicy,
+        interval_s: float,
+        compression: BlobCodec = "zlib",
+    ):
+        self.data_dir = data_dir
+        self.compression = compression
+        self.policy = policy
+        self.interval_s = max(1.0, interval_s)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.failures = 0
+        self.last: RetentionStats | None = None
+        self.last_error: str | None = None
+        self.total_scans_pruned = 0
+        self.total_bytes_reclaimed = 0
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="retention", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout_s: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout_s)
+
+    def run_once(self) -> RetentionStats:
+        try:
+            stats = apply_retention(storage_provider(self.data_dir, self.compression).get(), self.policy)
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+                self.last_error = str(e)
+            raise
+        with self._lock:
+            self.runs += 1
+            self.last = stats
+            self.last_error = None
+            self.total_scans_pruned += stats.scans_pruned
+            self.total_bytes_reclaimed += stats.bytes_reclaimed
+        return stats
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "policy": asdict(self.policy),
+                "interval_s": self.interval_s,
+                "runs": self.runs,
+                "failures": self.failures,
+                "last_error": self.last_error,
+                "last": asdict(self.last) if self.last else None,
+                "total_scans_pruned": self.total_scans_pruned,
+                "total_bytes_reclaimed": self.total_bytes_reclaimed,
+            }
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                log.exception("scan retention run failed")
+            self._stop.wait(self.interval_s)
+
+
+def retention_policy(settings: Settings) -> RetentionPolicy:
+    return RetentionPolicy(
+        keep_full_days=settings.scan_retention_days,
+        keep_daily_days=settings.scan_rollup_daily_days,
+        vacuum_pages=settings.retention_vacuum_pages,
+    )
+
+
+_worker: RetentionWorker | None = None
+_worker_lock = threading.Lock()
+
+
+def get_retention_worker() -> RetentionWorker | None:
+    with _worker_lock:
+        return _worker
+
+
+def start_retention_worker() -> RetentionWorker | None:
+    """Start the process-wide worker unless retention is disabled (`SCAN_RETENTION_DAYS=0`)."""
+
+    global _worker
+    settings = get_settings()
+    if settings.scan_retention_days <= 0:
+        return None
+    with _worker_lock:
+        if _worker is None:
+            _worker = RetentionWorker(
+                settings.data_dir,
+                retention_policy(settings),
+                settings.retention_interval_s,
+                settings.storage_compression,
+            )
+            _worker.start()
+        return _worker
+
+
+def stop_retention_worker() -> None:
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        worker.stop()
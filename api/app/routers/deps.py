@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 from ..config import get_settings
-from ..storage import Storage, default_storage
+from ..storage import Storage, StorageProvider, storage_provider
 
 
 def storage() -> Storage:
     settings = get_settings()
-    return default_storage(settings.data_dir)
+    return storage_provider(settings.data_dir, settings.storage_compression).get()
+
+
+def provider() -> StorageProvider:
+    # For async routes: hand work to threads that each take their own connection from it.
+    settings = get_settings()
+    return storage_provider(settings.data_dir, settings.storage_compression)
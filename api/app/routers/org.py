@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Query
+
+from ..config import get_settings
+from ..jobs import get_org_job_queue, submit_org_scan
+from ..models import OrgScanRequest, OrgScanSummary, ScanJob, ScanJobSubmitResponse
+from .deps import storage
+
+router = APIRouter()
+
+
+@router.post("/api/org/scan", status_code=202)
+def org_scan(body: OrgScanRequest | None = None) -> ScanJobSubmitResponse:
+    """
+    Queue a scan of every account through the org read-only role; one snapshot per account plus
+    the aggregate. Poll `GET /api/org/scan/jobs/{job_id}` for its `org_scan_id`.
+    """
+
+    settings = get_settings()
+    if not settings.aws_scan_enabled:
+        raise HTTPException(status_code=400, detail="org scans require AWS_SCAN_ENABLED=true")
+    job, deduplicated = submit_org_scan(settings, body.accounts if body else None)
+    return ScanJobSubmitResponse(job=job, deduplicated=deduplicated)
+
+
+@router.get("/api/org/scan/jobs/{job_id}")
+def get_org_scan_job(job_id: str) -> ScanJob:
+    job = get_org_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job
+
+
+@router.get("/api/org/scans")
+def list_org_scans(limit: int = Query(default=25, ge=1, le=100)) -> list[dict]:
+    return storage().list_org_scans(limit)
+
+
+@router.get("/api/org/scans/{org_scan_id}")
+def get_org_scan(org_scan_id: str) -> OrgScanSummary:
+    try:
+        return storage().get_org_scan(org_scan_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="org scan not found") from None
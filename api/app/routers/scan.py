@@ -1,46 +1,240 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from ..config import get_settings
-from ..models import ScanMeta, ScanSnapshot
-from ..scan_engine import run_scan as run_scan_engine
-from .deps import storage
+from ..jobs import get_job_queue
+from ..json_codec import dumps_text
+from ..models import (
+    CheckStatus,
+    ScanJob,
+    ScanJobSubmitResponse,
+    ScanMeta,
+    ScanSnapshot,
+    TargetedRescanRequest,
+    TargetedRescanResponse,
+)
+from ..response_cache import conditional_json, response_cache
+from ..scan_engine import iter_scan_async, run_scan_async, run_targeted_scan
+from .deps import provider, storage
 
 router = APIRouter()
 
 
 @router.post("/api/scan")
-def run_scan() -> ScanSnapshot:
+async def run_scan(fast: bool | None = None) -> ScanSnapshot:
+    """`fast=true` reuses cached results of checks within their TTL (default: `SCAN_FAST_RESCAN`)."""
+
+    return await run_scan_async(provider(), get_settings(), fast=fast)
+
+
+@router.post("/api/scan/stream")
+async def run_scan_stream(request: Request, fast: bool | None = None) -> StreamingResponse:
+    """
+    Run a scan and stream progress: one `result` event per check as it completes, then a
+    `summary` event once the snapshot is stored. NDJSON by default; Server-Sent Events when the
+    client sends `Accept: text/event-stream`.
+    """
+
     settings = get_settings()
-    st = storage()
-    return run_scan_engine(st, settings)
+    sse = "text/event-stream" in request.headers.get("accept", "")
+
+    def frame(event: str, data: dict) -> str:
+        if sse:
+            return f"event: {event}\ndata: {dumps_text(data)}\n\n"
+        return dumps_text({"type": event, **data}) + "\n"
+
+    async def events() -> AsyncIterator[str]:
+        # Emit something immediately so clients and proxies see the stream open.
+        yield frame("start", {})
+        async for item in iter_scan_async(provider(), settings, fast=fast):
+            if isinstance(item, ScanSnapshot):
+                yield frame(
+                    "summary",
+                    {
+                        "scan_id": item.scan_id,
+                        "created_at": item.created_at.isoformat(),
+                        "score": item.score,
+                        "breakdown": item.breakdown,
+                    },
+                )
+            else:
+                yield frame("result", {"result": item.model_dump(mode="json")})
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+@router.post("/api/scan/targeted")
+def targeted_rescan(body: TargetedRescanRequest | None = None) -> TargetedRescanResponse:
+    """
+    Re-run only the checks affected by recent events and merge them into a new snapshot.
+
+    Checks come from `check_ids` plus the event-to-check map applied to `event_names`, plus the
+    timeline events at or after `since` when given. With none of them, the timeline events stored
+    after the latest snapshot of this account and region decide, whatever their `event_time`.
+    """
+
+    body = body or TargetedRescanRequest()
+    return run_targeted_scan(
+        storage(),
+        get_settings(),
+        check_ids=set(body.check_ids or []),
+        events=set(body.event_names or []),
+        since=body.since,
+    )
+
+
+@router.post("/api/scan/jobs", status_code=202)
+def submit_scan_job() -> ScanJobSubmitResponse:
+    job, deduplicated = get_job_queue().submit(get_settings())
+    return ScanJobSubmitResponse(job=job, deduplicated=deduplicated)
+
+
+@router.get("/api/scan/jobs/{job_id}")
+def get_scan_job(job_id: str) -> ScanJob:
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job
 
 
 @router.get("/api/scans")
-def list_scans(limit: int = Query(default=25, ge=1, le=100)) -> list[ScanMeta]:
-    return storage().list_scans(limit=limit)
+def list_scans(
+    response: Response,
+    limit: int = Query(default=25, ge=1, le=100),
+    cursor: str | None = None,
+    account_id: str | None = None,
+    region: str | None = None,
+) -> list[ScanMeta]:
+    """Newest first. When more scans exist, `X-Next-Cursor` holds the `cursor` for the next page."""
+
+    try:
+        items, next_cursor = storage().page_scans(limit, cursor=cursor, account_id=account_id, region=region)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from None
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+
+@router.get("/api/scans/rollups")
+def scan_rollups(
+    period: Literal["hour", "day", "week"] = "day",
+    account_id: str | None = None,
+    region: str | None = None,
+    limit: int = Query(default=90, ge=1, le=1000),
+) -> list[dict]:
+    """Hourly, daily or weekly summaries of scan history (kept after retention prunes scans), newest first."""
+
+    return storage().list_rollups(period, account_id=account_id, region=region, limit=limit)
 
 
 @router.get("/api/scans/{scan_id}")
-def get_scan(scan_id: str) -> dict:
+def get_scan(scan_id: str, request: Request) -> Response:
+    """Snapshots are immutable: served with a strong ETag (304 on match) from the response cache."""
+
     st = storage()
+
+    def build() -> bytes:
+        try:
+            return st.get_scan_json(scan_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="scan not found") from None
+
+    return conditional_json(
+        request,
+        response_cache(),
+        ("scan", scan_id),
+        f'"scan-{scan_id}"',
+        build,
+        exists=lambda: st.scan_exists(scan_id),
+    )
+
+
+@router.get("/api/scans/{scan_id}/diff")
+def get_scan_diff(scan_id: str, request: Request) -> Response:
+    """What changed since the previous scan of the same account and region (ETag-cached)."""
+
+    st = storage()
+
+    def build() -> dict:
+        try:
+            return st.get_scan_diff(scan_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="scan not found") from None
+
+    return conditional_json(
+        request,
+        response_cache(),
+        ("diff", scan_id),
+        f'"diff-{scan_id}"',
+        build,
+        exists=lambda: st.scan_exists(scan_id),
+    )
+
+
+@router.get("/api/scans/{scan_id}/checks")
+def list_scan_checks(
+    scan_id: str,
+    domain: str | None = None,
+    status: CheckStatus | None = None,
+    evidence: bool = False,
+) -> list[dict]:
     try:
-        meta, snapshot = st.get_scan(scan_id)
+        return storage().list_check_results(scan_id, domain=domain, status=status, include_evidence=evidence)
     except KeyError:
         raise HTTPException(status_code=404, detail="scan not found") from None
-    return {"meta": meta.model_dump(mode="json"), "snapshot": snapshot}
+
+
+@router.get("/api/scans/{scan_id}/checks/{check_id}")
+def get_scan_check(scan_id: str, check_id: str) -> dict:
+    try:
+        return storage().get_check_result(scan_id, check_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="check result not found") from None
 
 
 @router.get("/api/score/latest")
-def latest_score() -> dict:
-    scans = storage().list_scans(limit=10)
-    if not scans:
-        return {"score": None, "scan_id": None}
-    latest = scans[0]
-    return {
-        "score": latest.score,
-        "scan_id": latest.scan_id,
-        "created_at": latest.created_at.isoformat(),
-        "domain_scores": latest.domain_scores,
-    }
+def latest_score(request: Request) -> Response:
+    """Keyed on the newest scan id: one indexed row read, then 304 or the cached body."""
+
+    latest = storage().latest_scan()
+    marker = latest.scan_id if latest else ""
+
+    def build() -> dict:
+        if latest is None:
+            return {"score": None, "scan_id": None}
+        return {
+            "score": latest.score,
+            "scan_id": latest.scan_id,
+            "created_at": latest.created_at.isoformat(),
+            "domain_scores": latest.domain_scores,
+        }
+
+    return conditional_json(request, response_cache(), ("latest", marker), f'"latest-{marker}"', build)
+
+
+@router.get("/api/score/timeseries")
+def score_timeseries(
+    bucket: Literal["hour", "day", "week"] = "day",
+    since: datetime | None = None,
+    until: datetime | None = None,
+    account_id: str | None = None,
+    region: str | None = None,
+    max_points: int = Query(default=500, ge=1, le=5000),
+) -> list[dict]:
+    """
+    Score and per-domain scores per bucket, oldest first, from the precomputed rollups.
+    Naive timestamps are read as UTC; longer ranges are downsampled to at most `max_points`.
+    """
+
+    since, until = (t.replace(tzinfo=UTC) if t and t.tzinfo is None else t for t in (since, until))
+    return storage().score_timeseries(
+        bucket, since=since, until=until, account_id=account_id, region=region, max_points=max_points
+    )
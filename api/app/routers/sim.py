@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 
 from ..config import get_settings
 from ..local_simulator import SimConfig, simulate
@@ -46,13 +46,36 @@ def simulate_cleanup() -> dict:
     return {"ok": True, "operation_id": op}
 
 
+def _parse_time(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed
+
+
 @router.get("/api/timeline")
-def timeline(since: str | None = None) -> dict:
+def timeline(
+    since: str | None = None,
+    until: str | None = None,
+    event_name: str | None = None,
+    event_source: str | None = None,
+    username: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=200, ge=1, le=1000),
+) -> dict:
     st = storage()
-    parsed = None
-    if since:
-        parsed = datetime.fromisoformat(since.replace("Z", "+00:00"))
-        if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=UTC)
-    items = st.list_timeline(since=parsed, limit=200)
-    return {"items": items}
+    try:
+        items, next_cursor = st.page_timeline(
+            limit,
+            cursor=cursor,
+            since=_parse_time(since),
+            until=_parse_time(until),
+            event_name=event_name,
+            event_source=event_source,
+            username=username,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from None
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from ..retention import get_retention_worker
+from .deps import storage
+
+router = APIRouter()
+
+
+@router.get("/api/storage/report")
+def storage_report() -> dict:
+    """Raw vs stored bytes for snapshot and evidence blobs."""
+
+    return storage().compression_report()
+
+
+@router.get("/api/storage/retention")
+def retention_metrics() -> dict:
+    """Retention worker runs, scans pruned and space reclaimed; `enabled` is false when it is off."""
+
+    worker = get_retention_worker()
+    size = storage().db_size()
+    if worker is None:
+        return {"enabled": False, "db": size}
+    return {"enabled": True, "db": size, **worker.metrics()}
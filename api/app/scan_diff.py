@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+# Statuses that represent an open finding; moving into one is a regression, out of one a fix.
+FINDING_STATUSES = frozenset({"fail", "warn"})
+
+
+@dataclass(frozen=True)
+class CheckState:
+    status: str
+    severity: str
+    title: str
+    evidence: dict[str, Any]
+
+
+def diff_checks(previous: dict[str, CheckState], current: dict[str, CheckState]) -> dict[str, Any]:
+    """
+    Structured difference between two scans' check results, keyed by check id.
+
+    A check moving into fail/warn is `newly_failing`, out of it into pass is `newly_passing`, and
+    any other status move is `status_changed`. Checks with the same status but different evidence
+    are listed under `evidence_changed` with the top-level evidence keys that differ.
+    """
+
+    newly_failing: list[dict[str, Any]] = []
+    newly_passing: list[dict[str, Any]] = []
+    status_changed: list[dict[str, Any]] = []
+    evidence_changed: list[dict[str, Any]] = []
+
+    for check_id, cur in current.items():
+        prev = previous.get(check_id)
+        if prev is None:
+            continue
+        if prev.status != cur.status:
+            change = {
+                "id": check_id,
+                "title": cur.title,
+                "severity": cur.severity,
+                "from": prev.status,
+                "to": cur.status,
+            }
+            if cur.status in FINDING_STATUSES and prev.status not in FINDING_STATUSES:
+                newly_failing.append(change)
+            elif cur.status == "pass" and prev.status in FINDING_STATUSES:
+                newly_passing.append(change)
+            else:
+                status_changed.append(change)
+        elif prev.evidence != cur.evidence:
+            keys = sorted(
+                k
+                for k in prev.evidence.keys() | cur.evidence.keys()
+                if prev.evidence.get(k) != cur.evidence.get(k)
+            )
+            evidence_changed.append({"id": check_id, "status": cur.status, "keys": keys})
+
+    return {
+        "newly_failing": newly_failing,
+        "newly_passing": newly_passing,
+        "status_changed": status_changed,
+        "evidence_changed": evidence_changed,
+        "added": [c for c in current if c not in previous],
+        "removed": [c for c in previous if c not in current],
+    }
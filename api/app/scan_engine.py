@@ -1,37 +1,288 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
+from collections.abc import AsyncIterator, Callable
 from datetime import UTC, datetime
+from functools import partial
+from typing import Any, TypeVar
 
+import boto3
 import ulid
 
 from .aws_client import boto_session, get_account_id
-from .checks.registry import all_checks
+from .bounded_pool import run_with_timeouts
+from .check_cache import cache_breakdown, remember_results, reusable_results
+from .checks.registry import CheckSpec, all_check_specs
 from .config import Settings
+from .event_map import checks_for_events
+from .evidence import EvidencePolicy, cap_result
+from .inventory import ScanInventory
 from .local_checks import local_checks
-from .models import ScanSnapshot
+from .models import CheckResult, ScanSnapshot, TargetedRescanResponse
+from .rate_limit import track_wait
+from .regions import CheckJob, RegionFanout, merge_matrix, resolve_regions
 from .scoring import compute_score
-from .storage import Storage
+from .storage import Storage, StorageProvider
 
+T = TypeVar("T")
 
-def run_scan(st: Storage, settings: Settings) -> ScanSnapshot:
-    scan_id = str(ulid.new())
-    created_at = datetime.now(UTC)
+_NO_CREDENTIALS_NOTE = "AWS_SCAN_ENABLED=true but credentials were not detected; ran offline checks instead."
 
-    account_id = None
-    results = None
 
-    aws_note = None
-    if settings.aws_scan_enabled:
-        session = boto_session(settings.aws_region)
-        account_id = get_account_id(session)
-        if not account_id:
-            results = local_checks(st)
-            aws_note = "AWS_SCAN_ENABLED=true but credentials were not detected; ran offline checks instead."
+def _error_result(spec: CheckSpec, evidence: dict) -> CheckResult:
+    return spec.result(
+        "error",
+        evidence=evidence,
+        recommendation="Re-run the scan; if this persists, check AWS API latency and the scanning role.",
+    )
+
+
+def run_checks(
+    session: boto3.session.Session,
+    region: str,
+    specs: list[CheckSpec],
+    *,
+    inventory: ScanInventory | None = None,
+    max_workers: int = 8,
+    timeout_s: float = 60.0,
+) -> list[CheckResult]:
+    """
+    Run checks concurrently on a bounded thread pool.
+
+    Results come back in the order of `specs`. A check that raises or runs longer than `timeout_s`
+    (measured from when it starts, not when it was queued) becomes an `error` result; a hung
+    worker thread is abandoned rather than waited for. All checks share one `inventory`, so
+    list/describe calls are made once per scan.
+    """
+
+    inv = inventory or ScanInventory(session, region)
+    return run_jobs(session, [(s, region, inv) for s in specs], max_workers=max_workers, timeout_s=timeout_s)
+
+
+def run_jobs(
+    session: boto3.session.Session,
+    jobs: list[CheckJob],
+    *,
+    max_workers: int = 8,
+    timeout_s: float = 60.0,
+    wait_s: dict[str, float] | None = None,
+) -> list[CheckResult]:
+    """
+    `run_checks` over explicit (spec, region, inventory) jobs; results follow `jobs` order.
+
+    With `wait_s`, the time each check spends waiting on client-side rate limits is added to it
+    under the check's id.
+    """
+
+    def _call(job: CheckJob) -> CheckResult:
+        spec, region, inv = job
+        with track_wait(wait_s, spec.id):
+            if inspect.iscoroutinefunction(spec.fn):
+                return asyncio.run(spec.fn(session, region, inv))
+            return spec.fn(session, region, inv)
+
+    results: list[CheckResult | None] = [None] * len(jobs)
+    for o in run_with_timeouts(
+        [partial(_call, j) for j in jobs],
+        max_workers=max_workers,
+        timeout_s=timeout_s,
+        thread_name_prefix="scan-check",
+    ):
+        spec = jobs[o.index][0]
+        if o.timed_out:
+            results[o.index] = _error_result(
+                spec, {"error": f"check timed out after {timeout_s:g}s", "timeout_s": timeout_s}
+            )
+        elif o.error is not None:
+            results[o.index] = _error_result(spec, {"error": o.error})
         else:
-            results = [fn(session, settings.aws_region) for fn in all_checks()]
-    else:
-        results = local_checks(st)
+            results[o.index] = o.value
+    return [r for r in results if r is not None]
+
+
+async def iter_checks_async(
+    session: boto3.session.Session,
+    region: str,
+    specs: list[CheckSpec],
+    *,
+    inventory: ScanInventory | None = None,
+    max_concurrency: int = 8,
+    timeout_s: float = 60.0,
+) -> AsyncIterator[tuple[int, CheckResult]]:
+    """
+    Async counterpart of `run_checks` that yields `(index, result)` as each check completes.
+
+    Coroutine checks are awaited on the running loop; sync checks run via `asyncio.to_thread`.
+    At most `max_concurrency` checks are in flight, and the timeout starts once a check holds a
+    slot. Closing the iterator early (e.g. a disconnected client) cancels the remaining checks.
+    """
+
+    inv = inventory or ScanInventory(session, region)
+    async for item in iter_jobs_async(
+        session, [(s, region, inv) for s in specs], max_concurrency=max_concurrency, timeout_s=timeout_s
+    ):
+        yield item
+
+
+async def iter_jobs_async(
+    session: boto3.session.Session,
+    jobs: list[CheckJob],
+    *,
+    max_concurrency: int = 8,
+    timeout_s: float = 60.0,
+    wait_s: dict[str, float] | None = None,
+) -> AsyncIterator[tuple[int, CheckResult]]:
+    """`iter_checks_async` over explicit (spec, region, inventory) jobs, indexed by job."""
+
+    sem = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _call(i: int, job: CheckJob) -> tuple[int, CheckResult]:
+        spec, region, inv = job
+        async with sem:
+            if inspect.iscoroutinefunction(spec.fn):
+                aw = spec.fn(session, region, inv)
+            else:
+                aw = asyncio.to_thread(spec.fn, session, region, inv)
+            try:
+                # The task wait_for creates (and the thread to_thread starts) inherit the wait sink.
+                with track_wait(wait_s, spec.id):
+                    return i, await asyncio.wait_for(aw, timeout=timeout_s)
+            except TimeoutError:
+                return i, _error_result(
+                    spec, {"error": f"check timed out after {timeout_s:g}s", "timeout_s": timeout_s}
+                )
+            except Exception as e:
+                return i, _error_result(spec, {"error": str(e)})
+
+    tasks = [asyncio.create_task(_call(i, j)) for i, j in enumerate(jobs)]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            yield await fut
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+async def run_checks_async(
+    session: boto3.session.Session,
+    region: str,
+    specs: list[CheckSpec],
+    *,
+    inventory: ScanInventory | None = None,
+    max_concurrency: int = 8,
+    timeout_s: float = 60.0,
+) -> list[CheckResult]:
+    """Run `iter_checks_async` to completion; results come back in the order of `specs`."""
+
+    results: list[CheckResult | None] = [None] * len(specs)
+    async for i, r in iter_checks_async(
+        session,
+        region,
+        specs,
+        inventory=inventory,
+        max_concurrency=max_concurrency,
+        timeout_s=timeout_s,
+    ):
+        results[i] = r
+    return [r for r in results if r is not None]
 
+
+def _inventory(session: boto3.session.Session, settings: Settings) -> ScanInventory:
+    return ScanInventory(
+        session,
+        settings.aws_region,
+        s3_full_coverage=settings.s3_full_coverage,
+        max_fanout=settings.s3_max_concurrency,
+        iam_collection=settings.iam_collection,
+        iam_max_fanout=settings.iam_max_concurrency,
+    )
+
+
+class _FanoutRun:
+    """
+    One pass of AWS checks across regions, shared by full, fast, targeted and streamed scans.
+
+    Plans the jobs with `RegionFanout`, runs them on the scan's pool (`run`) or streams each
+    check's final result as it completes (`iter_async`), and collects the per-check rate-limit
+    waits for the snapshot's `throttle` breakdown.
+    """
+
+    def __init__(
+        self,
+        session: boto3.session.Session,
+        settings: Settings,
+        specs: list[CheckSpec],
+        regions: list[str] | None,
+        inventory: ScanInventory,
+    ):
+        self.session = session
+        self.settings = settings
+        self.fanout = RegionFanout(specs, regions, inventory)
+        self.wait_s: dict[str, float] = {}
+
+    def run(self) -> list[CheckResult]:
+        """Run every job; final results in the order of `specs`."""
+
+        job_results = run_jobs(
+            self.session,
+            self.fanout.jobs,
+            max_workers=self.settings.scan_max_workers,
+            timeout_s=self.settings.scan_check_timeout_s,
+            wait_s=self.wait_s,
+        )
+        for i, r in enumerate(job_results):
+            self.fanout.add(i, r)
+        return self.fanout.results()
+
+    async def iter_async(self) -> AsyncIterator[CheckResult]:
+        """Yield each check's final result (merged over its regions) as soon as it is complete."""
+
+        async for i, r in iter_jobs_async(
+            self.session,
+            self.fanout.jobs,
+            max_concurrency=self.settings.scan_max_workers,
+            timeout_s=self.settings.scan_check_timeout_s,
+            wait_s=self.wait_s,
+        ):
+            merged = self.fanout.add(i, r)
+            if merged is not None:
+                yield merged
+
+    def matrix(self) -> dict[str, Any] | None:
+        return self.fanout.matrix()
+
+    def throttle(self) -> dict[str, Any]:
+        # Per-check rate-limit waits for this scan, plus the session's bucket rates and throttle counts.
+        limiter = getattr(self.session, "rate_limiter", None)
+        return {
+            "check_wait_s": {k: round(v, 3) for k, v in self.wait_s.items()},
+            "buckets": limiter.stats() if limiter is not None else {},
+        }
+
+
+def _evidence_policy(settings: Settings) -> EvidencePolicy:
+    return EvidencePolicy(
+        max_items=settings.evidence_max_items, max_str_chars=settings.evidence_max_str_chars
+    )
+
+
+def _snapshot(
+    settings: Settings,
+    *,
+    scan_id: str,
+    created_at: datetime,
+    account_id: str | None,
+    results: list[CheckResult],
+    aws_note: str | None,
+    inventory: ScanInventory | None,
+    region_matrix: dict[str, Any] | None = None,
+    throttle: dict[str, Any] | None = None,
+    cache: dict[str, Any] | None = None,
+    last_event_id: int | None = None,
+) -> ScanSnapshot:
+    policy = _evidence_policy(settings)
+    results = [cap_result(r, policy) for r in results]
     score, breakdown = compute_score(results)
     if aws_note:
         breakdown = {**breakdown, "aws": {"enabled": True, "account_id": account_id, "note": aws_note}}
@@ -40,7 +291,18 @@ def run_scan(st: Storage, settings: Settings) -> ScanSnapshot:
             **breakdown,
             "aws": {"enabled": bool(settings.aws_scan_enabled), "account_id": account_id},
         }
-    snapshot = ScanSnapshot(
+    if inventory is not None:
+        breakdown = {**breakdown, "inventory": inventory.stats()}
+    if region_matrix is not None:
+        breakdown = {**breakdown, "regions": region_matrix}
+    if throttle is not None:
+        breakdown = {**breakdown, "throttle": throttle}
+    if cache is not None:
+        breakdown = {**breakdown, "cache": cache}
+    if last_event_id is not None:
+        # Timeline position this snapshot reflects; targeted rescans pick up events stored after it.
+        breakdown = {**breakdown, "timeline": {"last_event_id": last_event_id}}
+    return ScanSnapshot(
         scan_id=scan_id,
         created_at=created_at,
         account_id=account_id,
@@ -49,5 +311,296 @@ def run_scan(st: Storage, settings: Settings) -> ScanSnapshot:
         score=score,
         breakdown=breakdown,
     )
+
+
+def scan_aws_account(
+    session: boto3.session.Session,
+    settings: Settings,
+    account_id: str,
+    *,
+    reuse: dict[str, tuple[CheckResult, datetime]] | None = None,
+    last_event_id: int | None = None,
+) -> ScanSnapshot:
+    """
+    Run every AWS check for the account behind `session` and build its snapshot (not stored).
+
+    Shared by single-account scans and org scans, where `session` holds assumed-role credentials.
+    Checks in `reuse` (a fast rescan's fresh cached results) are not run; their cached results
+    take their place and are listed under `cache` in the breakdown.
+    """
+
+    scan_id = str(ulid.new())
+    created_at = datetime.now(UTC)
+    specs = all_check_specs()
+    inventory = _inventory(session, settings)
+    run = [s for s in specs if s.id not in (reuse or {})]
+    fanout = _FanoutRun(session, settings, run, resolve_regions(session, settings), inventory)
+    return _snapshot(
+        settings,
+        scan_id=scan_id,
+        created_at=created_at,
+        account_id=account_id,
+        results=_in_registry_order(specs, fanout.run(), reuse),
+        aws_note=None,
+        inventory=inventory,
+        region_matrix=fanout.matrix(),
+        throttle=fanout.throttle(),
+        cache=cache_breakdown(reuse, created_at, len(run)) if reuse is not None else None,
+        last_event_id=last_event_id,
+    )
+
+
+def _in_registry_order(
+    specs: list[CheckSpec], executed: list[CheckResult], reuse: dict[str, tuple[CheckResult, datetime]] | None
+) -> list[CheckResult]:
+    by_id = {r.id: r for r in executed}
+    by_id.update({check_id: r for check_id, (r, _) in (reuse or {}).items()})
+    return [by_id[s.id] for s in specs if s.id in by_id]
+
+
+def run_scan(st: Storage, settings: Settings, *, fast: bool | None = None) -> ScanSnapshot:
+    """
+    Scan and store a snapshot. A fast rescan (`fast`, default `SCAN_FAST_RESCAN`) reuses cached
+    results of checks still within their TTL; every scan refreshes the cache with what it ran.
+    """
+
+    account_id = None
+    aws_note = None
+    last_event_id = st.last_timeline_id()
+    if settings.aws_scan_enabled:
+        session = boto_session(settings.aws_region)
+        account_id = get_account_id(session)
+        if account_id:
+            specs = all_check_specs()
+            fast = settings.scan_fast_rescan if fast is None else fast
+            reuse = reusable_results(st, settings, account_id, specs, datetime.now(UTC)) if fast else None
+            snapshot = scan_aws_account(
+                session, settings, account_id, reuse=reuse, last_event_id=last_event_id
+            )
+            executed = [r for r in snapshot.results if r.id not in (reuse or {})]
+            remember_results(st, settings, account_id, specs, executed, snapshot.created_at)
+            st.put_scan(snapshot)
+            return snapshot
+        aws_note = _NO_CREDENTIALS_NOTE
+
+    snapshot = _snapshot(
+        settings,
+        scan_id=str(ulid.new()),
+        created_at=datetime.now(UTC),
+        account_id=account_id,
+        results=local_checks(st),
+        aws_note=aws_note,
+        inventory=None,
+        last_event_id=last_event_id,
+    )
     st.put_scan(snapshot)
     return snapshot
+
+
+def _latest_snapshot(st: Storage, account_id: str | None, region: str) -> ScanSnapshot | None:
+    meta = st.latest_scan_in(account_id, region)
+    if meta is None:
+        return None
+    _, stored = st.get_scan(meta.scan_id)
+    return ScanSnapshot.model_validate(stored) if stored else None
+
+
+def run_targeted_scan(
+    st: Storage,
+    settings: Settings,
+    *,
+    check_ids: set[str] | None = None,
+    events: set[str] | None = None,
+    since: datetime | None = None,
+) -> TargetedRescanResponse:
+    """
+    Re-run only the affected checks and store the latest snapshot with their fresh results merged in.
+
+    The checks are `check_ids` plus the event-to-check map applied to `events`. With `since`,
+    the timeline events at or after that time are added. With none of the three, the timeline
+    events stored after the base snapshot's `breakdown.timeline.last_event_id` are added, so
+    late-delivered or imported events count by arrival rather than by `event_time`; bases
+    without that id fall back to events since the base was taken. The base snapshot is the
+    latest for this account and region (offline scans included), and every other check keeps
+    its result from it. Ids without a check in the current mode (AWS or offline) are dropped; if
+    none are left nothing is run or stored. Without a base snapshot this falls back to a full
+    scan. `breakdown.rescan` records the base scan, the checks re-run and the events that caused
+    it, including the timeline id range consumed.
+    """
+
+    account_id = None
+    aws_note = None
+    session = None
+    if settings.aws_scan_enabled:
+        session = boto_session(settings.aws_region)
+        account_id = get_account_id(session)
+        if not account_id:
+            aws_note = _NO_CREDENTIALS_NOTE
+            session = None
+
+    base = _latest_snapshot(st, account_id, settings.aws_region)
+    events = set(events or ())
+    trigger: dict[str, Any] = {}
+    # Read before anything runs: events stored while this rescan is in flight are left for the next.
+    last_event_id = st.last_timeline_id()
+    consumed = base.breakdown.get("timeline", {}).get("last_event_id") if base else None
+    if since is not None:
+        events |= st.timeline_event_names(since=since)
+    elif not (check_ids or events) and base is not None:
+        if consumed is not None:
+            events |= st.timeline_event_names(after_id=consumed, through_id=last_event_id)
+            trigger = {"after_event_id": consumed, "last_event_id": last_event_id}
+        else:
+            # Bases stored before snapshots tracked their timeline position.
+            events |= st.timeline_event_names(since=base.created_at)
+        consumed = last_event_id
+    wanted = set(check_ids or ()) | checks_for_events(events)
+
+    specs: list[CheckSpec] = []
+    offline: list[CheckResult] = []
+    if session is not None:
+        specs = [s for s in all_check_specs() if s.id in wanted]
+        known = [s.id for s in specs]
+    else:
+        offline = [r for r in local_checks(st) if r.id in wanted]
+        known = [r.id for r in offline]
+    if not known:
+        return TargetedRescanResponse(events=sorted(events), checks=[])
+    if base is None:
+        return TargetedRescanResponse(
+            events=sorted(events), checks=sorted(known), snapshot=run_scan(st, settings)
+        )
+
+    created_at = datetime.now(UTC)
+    inventory = None
+    region_matrix = base.breakdown.get("regions")
+    throttle = None
+    if session is not None and account_id:
+        inventory = _inventory(session, settings)
+        fanout = _FanoutRun(session, settings, specs, resolve_regions(session, settings), inventory)
+        fresh = fanout.run()
+        region_matrix = merge_matrix(region_matrix, fanout.matrix())
+        throttle = fanout.throttle()
+        remember_results(st, settings, account_id, specs, fresh, created_at)
+    else:
+        fresh = offline
+
+    replaced = {r.id: r for r in fresh}
+    results = [replaced.pop(r.id, r) for r in base.results] + list(replaced.values())
+    snapshot = _snapshot(
+        settings,
+        scan_id=str(ulid.new()),
+        created_at=created_at,
+        account_id=account_id,
+        results=results,
+        aws_note=aws_note,
+        inventory=inventory,
+        region_matrix=region_matrix,
+        throttle=throttle,
+        last_event_id=consumed,
+    )
+    rescan = {
+        "base_scan_id": base.scan_id,
+        "checks": known,
+        "trigger": {"events": sorted(events), **trigger},
+    }
+    snapshot = snapshot.model_copy(update={"breakdown": {**snapshot.breakdown, "rescan": rescan}})
+    st.put_scan(snapshot)
+    return TargetedRescanResponse(events=sorted(events), checks=sorted(known), snapshot=snapshot)
+
+
+async def _on_storage_thread(provider: StorageProvider, fn: Callable[..., T], *args: Any) -> T:
+    # SQLite work (compression, diffs, rollups, waiting out a retention VACUUM) runs on a worker
+    # thread with that thread's own provider connection, never on the event loop.
+    return await asyncio.to_thread(lambda: fn(provider.get(), *args))
+
+
+async def iter_scan_async(
+    provider: StorageProvider, settings: Settings, *, fast: bool | None = None
+) -> AsyncIterator[CheckResult | ScanSnapshot]:
+    """
+    Async scan that yields each `CheckResult` as soon as it completes, then the stored snapshot.
+
+    Neither AWS calls nor storage block the loop: sync checks run on worker threads, and so does
+    every storage call, each on the connection `provider` keeps for its thread. The snapshot lists
+    results in registry order regardless of completion order. On a fast rescan (see `run_scan`)
+    reused cached results are yielded first.
+    """
+
+    scan_id = str(ulid.new())
+    created_at = datetime.now(UTC)
+
+    account_id = None
+    results: list[CheckResult] = []
+    inventory = None
+    region_matrix = None
+    throttle = None
+    reuse = None
+    cache = None
+
+    policy = _evidence_policy(settings)
+    aws_note = None
+    last_event_id = await _on_storage_thread(provider, Storage.last_timeline_id)
+    if settings.aws_scan_enabled:
+        session = boto_session(settings.aws_region)
+        account_id = await asyncio.to_thread(get_account_id, session)
+        if not account_id:
+            aws_note = _NO_CREDENTIALS_NOTE
+        else:
+            inventory = _inventory(session, settings)
+            specs = all_check_specs()
+            if settings.scan_fast_rescan if fast is None else fast:
+                reuse = await _on_storage_thread(
+                    provider, reusable_results, settings, account_id, specs, created_at
+                )
+                for r, _ in reuse.values():
+                    yield cap_result(r, policy)
+            run = [s for s in specs if s.id not in (reuse or {})]
+            regions = await asyncio.to_thread(resolve_regions, session, settings)
+            fanout = _FanoutRun(session, settings, run, regions, inventory)
+            executed: list[CheckResult] = []
+            async for r in fanout.iter_async():
+                executed.append(r)
+                yield cap_result(r, policy)
+            results = _in_registry_order(specs, executed, reuse)
+            region_matrix = fanout.matrix()
+            throttle = fanout.throttle()
+            if reuse is not None:
+                cache = cache_breakdown(reuse, created_at, len(run))
+    if inventory is None:
+        # AWS disabled, or enabled without usable credentials: run the offline checks.
+        results = [cap_result(r, policy) for r in await _on_storage_thread(provider, local_checks)]
+        for r in results:
+            yield r
+
+    snapshot = _snapshot(
+        settings,
+        scan_id=scan_id,
+        created_at=created_at,
+        account_id=account_id,
+        results=results,
+        aws_note=aws_note,
+        inventory=inventory,
+        region_matrix=region_matrix,
+        throttle=throttle,
+        cache=cache,
+        last_event_id=last_event_id,
+    )
+    if inventory is not None and account_id:
+        executed = [r for r in snapshot.results if r.id not in (reuse or {})]
+        await _on_storage_thread(
+            provider, remember_results, settings, account_id, specs, executed, created_at
+        )
+    await _on_storage_thread(provider, Storage.put_scan, snapshot)
+    yield snapshot
+
+
+async def run_scan_async(
+    provider: StorageProvider, settings: Settings, *, fast: bool | None = None
+) -> ScanSnapshot:
+    """Async variant of `run_scan`: drain `iter_scan_async` and return the stored snapshot."""
+
+    async for item in iter_scan_async(provider, settings, fast=fast):
+        if isinstance(item, ScanSnapshot):
+            return item
+    raise RuntimeError("scan finished without a snapshot")
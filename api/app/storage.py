@@ -1,14 +1,45 @@
 from __future__ import annotations
 
-import json
 import sqlite3
-from collections.abc import Iterable
+import threading
+import time
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
+from functools import reduce
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
-from .models import ScanMeta, ScanSnapshot
+from pydantic_core import to_json
+
+from .blobs import (
+    HEADER_SIZE,
+    BlobCodec,
+    codec_available,
+    decode_bytes,
+    decode_json,
+    encode_bytes,
+    header_raw_size,
+    train_dictionary,
+)
+from .json_codec import dumps_text, loads
+from .models import CheckResult, OrgScanSummary, ScanMeta, ScanSnapshot
+from .pagination import decode_cursor, encode_cursor
+from .scan_diff import CheckState, diff_checks
+
+# Called with "scan" after put_scan commits and "prune" after retention deletes scans, so
+# in-process caches of scan-derived responses can drop stale entries.
+_write_listeners: list[Callable[[str], None]] = []
+
+
+def add_write_listener(fn: Callable[[str], None]) -> None:
+    _write_listeners.append(fn)
+
+
+def _notify(event: str) -> None:
+    for fn in list(_write_listeners):
+        fn(event)
 
 
 def _repo_root() -> Path:
@@ -16,28 +47,147 @@ def _repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-@dataclass(frozen=True)
-class StorageConfig:
-    db_path: Path
+ROLLUP_PERIODS = ("hour", "day", "week")
 
 
-class Storage:
-    def __init__(self, cfg: StorageConfig):
-        self._cfg = cfg
-        self._cfg.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(self._cfg.db_path)
-        self._conn.row_factory = sqlite3.Row
-        self._ensure_schema()
+def _bucket_start(created_at: datetime, period: str) -> str:
+    # UTC start of the hour/day/week (weeks start on Monday), formatted like isoformat().
+    t = created_at.astimezone(UTC)
+    if period == "hour":
+        return t.replace(minute=0, second=0, microsecond=0).isoformat()
+    day = datetime(t.year, t.month, t.day, tzinfo=UTC)
+    if period == "week":
+        day -= timedelta(days=day.weekday())
+    return day.isoformat()
 
-    def close(self) -> None:
-        try:
-            self._conn.close()
-        except Exception:
-            pass
 
-    def _ensure_schema(self) -> None:
-        cur = self._conn.cursor()
-        cur.execute(
+def _scan_rollup(
+    created_at: str, score: int, domain_scores: dict[str, Any], statuses: dict[str, str]
+) -> dict[str, Any]:
+    # A rollup of one scan, merged into each of its buckets by put_scan.
+    return {
+        "scans": 1,
+        "first_scan_at": created_at,
+        "last_scan_at": created_at,
+        "score_min": score,
+        "score_max": score,
+        "score_sum": score,
+        "score_last": score,
+        "domain_sums": dict(domain_scores),
+        "domain_counts": dict.fromkeys(domain_scores, 1),
+        "checks": dict(statuses),
+        "changed": {},
+    }
+
+
+def _merge_rollups(a: dict[str, Any], b: dict[str, Any]) -> dict[str, Any]:
+    """
+    Combine two rollups (a bucket and a new scan, or adjacent buckets when downsampling).
+
+    Counts and sums add up and the latest scan's score wins. Check history is read as `a` then
+    `b` (swapped if `b` started first): a check whose status differs across that boundary gains
+    a transition, and `changed` keeps each check's first and last status in the merged span.
+    """
+
+    if b["first_scan_at"] < a["first_scan_at"]:
+        a, b = b, a
+    latest = b if b["last_scan_at"] >= a["last_scan_at"] else a
+    merged = {
+        "scans": a["scans"] + b["scans"],
+        "first_scan_at": a["first_scan_at"],
+        "last_scan_at": latest["last_scan_at"],
+        "score_min": min(a["score_min"], b["score_min"]),
+        "score_max": max(a["score_max"], b["score_max"]),
+        "score_sum": a["score_sum"] + b["score_sum"],
+        "score_last": latest["score_last"],
+        "domain_sums": {
+            d: a["domain_sums"].get(d, 0) + b["domain_sums"].get(d, 0)
+            for d in a["domain_sums"] | b["domain_sums"]
+        },
+        "domain_counts": {
+            d: a["domain_counts"].get(d, 0) + b["domain_counts"].get(d, 0)
+            for d in a["domain_counts"] | b["domain_counts"]
+        },
+        "checks": {**a["checks"], **b["checks"]},
+        "changed": dict(a["changed"]),
+    }
+    for check_id, last in b["checks"].items():
+        later = b["changed"].get(check_id)
+        first = later["from"] if later else last
+        prev = a["checks"].get(check_id)
+        transitions = (later["transitions"] if later else 0) + int(prev is not None and prev != first)
+        if transitions:
+            earlier = a["changed"].get(check_id)
+            merged["changed"][check_id] = {
+                "from": earlier["from"] if earlier else (prev if prev is not None else first),
+                "to": last,
+                "transitions": (earlier["transitions"] if earlier else 0) + transitions,
+            }
+    return merged
+
+
+def _rollup_state(row: sqlite3.Row) -> dict[str, Any]:
+    return {
+        "scans": int(row["scans"]),
+        "first_scan_at": str(row["first_scan_at"]),
+        "last_scan_at": str(row["last_scan_at"]),
+        "score_min": int(row["score_min"]),
+        "score_max": int(row["score_max"]),
+        "score_sum": int(row["score_sum"]),
+        "score_last": int(row["score_last"]),
+        "domain_sums": loads(str(row["domain_sums_json"])),
+        "domain_counts": loads(str(row["domain_counts_json"])),
+        "checks": loads(str(row["checks_json"])),
+        "changed": loads(str(row["changed_json"])),
+    }
+
+
+def _domain_means(state: dict[str, Any]) -> dict[str, float]:
+    return {
+        d: round(v / max(1, state["domain_counts"].get(d, 0)), 2) for d, v in state["domain_sums"].items()
+    }
+
+
+_UPSERT_SCAN_ROLLUP = """
+    INSERT OR REPLACE INTO scan_rollups (
+      period, account_id, region, bucket_start, scans, first_scan_at, last_scan_at, score_min,
+      score_max, score_sum, score_last, domain_sums_json, domain_counts_json, checks_json, changed_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _rollup_row(key: tuple[str, str, str, str], state: dict[str, Any]) -> tuple:
+    return (
+        *key,
+        state["scans"],
+        state["first_scan_at"],
+        state["last_scan_at"],
+        state["score_min"],
+        state["score_max"],
+        state["score_sum"],
+        state["score_last"],
+        _compact_json(state["domain_sums"]),
+        _compact_json(state["domain_counts"]),
+        _compact_json(state["checks"]),
+        _compact_json(state["changed"]),
+    )
+
+
+def _add_column(table: str, column: str, decl: str) -> Callable[[sqlite3.Connection], None]:
+    # ALTER TABLE ADD COLUMN has no IF NOT EXISTS; skip it when the column is already there so
+    # the migration can be re-applied like the CREATE ... IF NOT EXISTS statements around it.
+    def apply(conn: sqlite3.Connection) -> None:
+        columns = {str(r[1]) for r in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+    return apply
+
+
+_MIGRATIONS: list[tuple[int, list[str | Callable[[sqlite3.Connection], None]]]] = [
+    (
+        1,
+        [
             """
             CREATE TABLE IF NOT EXISTS scans (
               scan_id TEXT PRIMARY KEY,
@@ -48,9 +198,7 @@ class Storage:
               domain_scores_json TEXT NOT NULL,
               snapshot_json TEXT NOT NULL
             )
-            """
-        )
-        cur.execute(
+            """,
             """
             CREATE TABLE IF NOT EXISTS timeline (
               id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -62,11 +210,425 @@ class Storage:
               scenario TEXT,
               operation_id TEXT
             )
+            """,
+        ],
+    ),
+    (
+        2,
+        [
+            # list_scans / latest score: ORDER BY created_at DESC LIMIT n without a sort.
+            "CREATE INDEX IF NOT EXISTS idx_scans_created_at ON scans (created_at)",
+            # Per account/region history (previous scan, filtered listings).
+            "CREATE INDEX IF NOT EXISTS idx_scans_account_region_created ON scans (account_id, region, created_at)",
+            # list_timeline range scans (local_checks reads the last 7 days on every scan).
+            "CREATE INDEX IF NOT EXISTS idx_timeline_event_time ON timeline (event_time)",
+            "CREATE INDEX IF NOT EXISTS idx_timeline_event_name_time ON timeline (event_name, event_time)",
+            "CREATE INDEX IF NOT EXISTS idx_timeline_operation_id ON timeline (operation_id)",
+        ],
+    ),
+    (
+        3,
+        [
+            # CloudTrail importer manifest: a file is re-imported only if its size or mtime changes.
+            """
+            CREATE TABLE IF NOT EXISTS imported_files (
+              path TEXT PRIMARY KEY,
+              size INTEGER NOT NULL,
+              mtime REAL NOT NULL,
+              records INTEGER NOT NULL,
+              imported_at TEXT NOT NULL
+            )
+            """,
+        ],
+    ),
+    (
+        4,
+        [
+            # One row per check per scan, evidence kept apart, so single-check and filtered reads
+            # never decode the full snapshot blob.
+            """
+            CREATE TABLE IF NOT EXISTS check_results (
+              scan_id TEXT NOT NULL,
+              check_id TEXT NOT NULL,
+              position INTEGER NOT NULL,
+              domain TEXT NOT NULL,
+              status TEXT NOT NULL,
+              severity TEXT NOT NULL,
+              result_json TEXT NOT NULL,
+              PRIMARY KEY (scan_id, check_id)
+            ) WITHOUT ROWID
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS check_evidence (
+              scan_id TEXT NOT NULL,
+              check_id TEXT NOT NULL,
+              evidence_json TEXT NOT NULL,
+              PRIMARY KEY (scan_id, check_id)
+            ) WITHOUT ROWID
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_check_results_scan_domain ON check_results (scan_id, domain)",
+            "CREATE INDEX IF NOT EXISTS idx_check_results_scan_status ON check_results (scan_id, status)",
+            # Backfill existing scans with SQLite's JSON1 functions.
+            """
+            INSERT OR IGNORE INTO check_results (
+              scan_id, check_id, position, domain, status, severity, result_json
+            )
+            SELECT s.scan_id, json_extract(r.value, '$.id'), CAST(r.key AS INTEGER),
+                   json_extract(r.value, '$.domain'), json_extract(r.value, '$.status'),
+                   json_extract(r.value, '$.severity'), json_remove(r.value, '$.evidence')
+            FROM scans s, json_each(s.snapshot_json, '$.results') r
+            """,
+            """
+            INSERT OR IGNORE INTO check_evidence (scan_id, check_id, evidence_json)
+            SELECT s.scan_id, json_extract(r.value, '$.id'),
+                   COALESCE(json_extract(r.value, '$.evidence'), '{}')
+            FROM scans s, json_each(s.snapshot_json, '$.results') r
+            """,
+        ],
+    ),
+    (
+        5,
+        [
+            # Compression dictionaries for snapshot/evidence blobs. Rows are never deleted: every
+            # blob names the dictionary it was written with.
+            """
+            CREATE TABLE IF NOT EXISTS blob_dicts (
+              dict_id INTEGER PRIMARY KEY AUTOINCREMENT,
+              created_at TEXT NOT NULL,
+              samples INTEGER NOT NULL,
+              data BLOB NOT NULL
+            )
+            """,
+        ],
+    ),
+    (
+        6,
+        [
+            # Hourly/daily/weekly rollups of every scan, updated by put_scan, so score history and
+            # check transitions outlive retention pruning. Domain scores are per-domain sums and
+            # counts so buckets merge without revisiting scans; account_id is '' when unknown so it
+            # can sit in the primary key.
+            """
+            CREATE TABLE IF NOT EXISTS scan_rollups (
+              period TEXT NOT NULL,
+              account_id TEXT NOT NULL,
+              region TEXT NOT NULL,
+              bucket_start TEXT NOT NULL,
+              scans INTEGER NOT NULL,
+              first_scan_at TEXT NOT NULL,
+              last_scan_at TEXT NOT NULL,
+              score_min INTEGER NOT NULL,
+              score_max INTEGER NOT NULL,
+              score_sum INTEGER NOT NULL,
+              score_last INTEGER NOT NULL,
+              domain_sums_json TEXT NOT NULL,
+              domain_counts_json TEXT NOT NULL,
+              checks_json TEXT NOT NULL,
+              changed_json TEXT NOT NULL,
+              PRIMARY KEY (period, account_id, region, bucket_start)
+            ) WITHOUT ROWID
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_scan_rollups_period_bucket ON scan_rollups (period, bucket_start)",
+        ],
+    ),
+    (
+        7,
+        [
+            # Diff against the previous scan of the same account/region, written by put_scan.
+            """
+            CREATE TABLE IF NOT EXISTS scan_diffs (
+              scan_id TEXT PRIMARY KEY,
+              previous_scan_id TEXT,
+              score_delta INTEGER,
+              newly_failing INTEGER NOT NULL,
+              newly_passing INTEGER NOT NULL,
+              evidence_changed INTEGER NOT NULL,
+              diff_json TEXT NOT NULL
+            ) WITHOUT ROWID
+            """,
+        ],
+    ),
+    (
+        8,
+        [
+            # Keyset pagination: scans page on (created_at, scan_id), so the ULID tie-breaker joins
+            # the indexes that serve history listings (replacing their v2 counterparts).
+            "CREATE INDEX IF NOT EXISTS idx_scans_created_id ON scans (created_at, scan_id)",
+            "CREATE INDEX IF NOT EXISTS idx_scans_account_region_created_id"
+            " ON scans (account_id, region, created_at, scan_id)",
+            "CREATE INDEX IF NOT EXISTS idx_scans_region_created_id ON scans (region, created_at, scan_id)",
+            "DROP INDEX IF EXISTS idx_scans_created_at",
+            "DROP INDEX IF EXISTS idx_scans_account_region_created",
+            # Timeline pages on (event_time, id); id is the rowid, so every event_time index already
+            # carries it. Filtered listings get their own (filter, event_time) indexes.
+            "CREATE INDEX IF NOT EXISTS idx_timeline_source_time ON timeline (event_source, event_time)",
+            "CREATE INDEX IF NOT EXISTS idx_timeline_username_time ON timeline (username, event_time)",
+        ],
+    ),
+    (
+        9,
+        [
+            # Org scans: one row per run with the aggregate; account snapshots live in scans.
+            """
+            CREATE TABLE IF NOT EXISTS org_scans (
+              org_scan_id TEXT PRIMARY KEY,
+              created_at TEXT NOT NULL,
+              score INTEGER,
+              accounts_ok INTEGER NOT NULL,
+              accounts_failed INTEGER NOT NULL,
+              summary_json TEXT NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_org_scans_created ON org_scans (created_at, org_scan_id)",
+        ],
+    ),
+    (
+        10,
+        [
+            # Latest executed result per check for fast rescans; `scope` is the region setup the
+            # result was computed under. Reused results are not written back, so checked_at stays
+            # the time the check actually ran.
             """
+            CREATE TABLE IF NOT EXISTS check_cache (
+              account_id TEXT NOT NULL,
+              scope TEXT NOT NULL,
+              check_id TEXT NOT NULL,
+              checked_at TEXT NOT NULL,
+              expires_at TEXT NOT NULL,
+              result_json TEXT NOT NULL,
+              PRIMARY KEY (account_id, scope, check_id)
+            ) WITHOUT ROWID
+            """,
+        ],
+    ),
+    (
+        11,
+        [
+            # Imported events remember their log file, so a changed file replaces its earlier rows
+            # instead of adding to them. Rows imported before this version stay unattributed.
+            _add_column("timeline", "source_file", "TEXT"),
+            "CREATE INDEX IF NOT EXISTS idx_timeline_source_file ON timeline (source_file)",
+        ],
+    ),
+]
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+
+_INSERT_TIMELINE = """
+    INSERT INTO timeline (
+      event_time, event_name, event_source, username, resources_json, scenario, operation_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_IMPORTED_TIMELINE = """
+    INSERT INTO timeline (
+      event_time, event_name, event_source, username, resources_json, scenario, operation_id, source_file
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_compact_json = dumps_text
+
+
+def _timeline_row(e: dict[str, Any], scenario: str | None, operation_id: str | None) -> tuple:
+    resources = e.get("resources")
+    return (
+        str(e.get("eventTime") or e.get("event_time")),
+        str(e.get("eventName") or e.get("event_name")),
+        str(e.get("eventSource") or e.get("event_source")),
+        e.get("username"),
+        _compact_json(resources) if resources else "[]",
+        scenario,
+        operation_id,
+    )
+
+
+@dataclass(frozen=True)
+class IngestStats:
+    rows: int
+    batches: int
+    commits: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class StorageConfig:
+    db_path: Path
+    # WAL lets readers proceed while a scan is being written; NORMAL sync is durable enough in WAL.
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size_kib: int = 16 * 1024
+    mmap_size: int = 128 * 1024 * 1024
+    busy_timeout_ms: int = 5000
+    # Only takes effect on new databases; retention converts existing ones on first use.
+    auto_vacuum: str = "INCREMENTAL"
+    # Snapshot and evidence blobs; a shared dictionary is trained once enough scans exist.
+    compression: BlobCodec = "zlib"
+    compression_level: int = 6
+    dict_min_samples: int = 8
+
+
+def _connect(cfg: StorageConfig, *, check_same_thread: bool = True) -> sqlite3.Connection:
+    cfg.db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        cfg.db_path, timeout=cfg.busy_timeout_ms / 1000, check_same_thread=check_same_thread
+    )
+    conn.row_factory = sqlite3.Row
+    # Must precede journal_mode: it is only honoured before the first table is created.
+    conn.execute(f"PRAGMA auto_vacuum={cfg.auto_vacuum}")
+    conn.execute(f"PRAGMA journal_mode={cfg.journal_mode}")
+    conn.execute(f"PRAGMA synchronous={cfg.synchronous}")
+    # Negative cache_size is in KiB rather than pages.
+    conn.execute(f"PRAGMA cache_size=-{int(cfg.cache_size_kib)}")
+    conn.execute(f"PRAGMA mmap_size={int(cfg.mmap_size)}")
+    conn.execute(f"PRAGMA busy_timeout={int(cfg.busy_timeout_ms)}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+class Storage:
+    def __init__(
+        self, cfg: StorageConfig, *, conn: sqlite3.Connection | None = None, ensure_schema: bool = True
+    ):
+        if not codec_available(cfg.compression):
+            raise RuntimeError(f"{cfg.compression} compression requires the zstandard package")
+        self._cfg = cfg
+        self._conn = conn or _connect(cfg)
+        self._dicts: dict[int, bytes] = {}
+        if ensure_schema:
+            self._ensure_schema()
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+    def _ensure_schema(self) -> None:
+        # Migrations are applied in order and recorded in PRAGMA user_version. BEGIN IMMEDIATE
+        # serializes concurrent migrators; the version is re-read once the write lock is held.
+        if self.schema_version() >= SCHEMA_VERSION:
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = self.schema_version()
+            for version, statements in _MIGRATIONS:
+                if version <= current:
+                    continue
+                for step in statements:
+                    if callable(step):
+                        step(self._conn)
+                    else:
+                        self._conn.execute(step)
+                self._conn.execute(f"PRAGMA user_version = {int(version)}")
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def schema_version(self) -> int:
+        return int(self._conn.execute("PRAGMA user_version").fetchone()[0])
+
+    def _dictionary(self, dict_id: int) -> bytes:
+        data = self._dicts.get(dict_id)
+        if data is None:
+            row = self._conn.execute("SELECT data FROM blob_dicts WHERE dict_id = ?", (dict_id,)).fetchone()
+            if not row:
+                raise KeyError(f"compression dictionary {dict_id} not found")
+            data = self._dicts[dict_id] = bytes(row["data"])
+        return data
+
+    def _write_dict_id(self) -> int:
+        # Newest dictionary, training the first one once enough scans exist to learn from.
+        if self._cfg.compression == "none":
+            return 0
+        dict_id = int(self._conn.execute("SELECT MAX(dict_id) FROM blob_dicts").fetchone()[0] or 0)
+        if not dict_id:
+            scans = int(self._conn.execute("SELECT COUNT(*) FROM scans").fetchone()[0])
+            if scans >= self._cfg.dict_min_samples:
+                dict_id = self.train_compression_dict() or 0
+        return dict_id
+
+    def _encode_raw(self, raw: bytes, dict_id: int) -> str | bytes:
+        return encode_bytes(
+            raw,
+            codec=self._cfg.compression,
+            level=self._cfg.compression_level,
+            dict_id=dict_id,
+            dictionary=self._dictionary(dict_id) if dict_id else None,
+        )
+
+    def _decode(self, value: str | bytes | None) -> Any:
+        return decode_json(value, self._dictionary)
+
+    def _check_row(self, row: sqlite3.Row, include_evidence: bool) -> dict[str, Any]:
+        result = loads(str(row["result_json"]))
+        if include_evidence:
+            result["evidence"] = self._decode(row["evidence_json"]) or {}
+        return result
+
+    def train_compression_dict(self, samples: int = 32) -> int | None:
+        """
+        Train a compression dictionary from the newest `samples` scans and make it the one new
+        blobs are written with. Existing blobs keep their dictionary. Returns its id, or None when
+        there are no scans yet.
+        """
+
+        rows = self._conn.execute(
+            "SELECT snapshot_json FROM scans ORDER BY created_at DESC LIMIT ?", (int(samples),)
+        ).fetchall()
+        if not rows:
+            return None
+        texts = [decode_bytes(r["snapshot_json"], self._dictionary) for r in reversed(rows)]
+        cur = self._conn.execute(
+            "INSERT INTO blob_dicts (created_at, samples, data) VALUES (?, ?, ?)",
+            (datetime.now(UTC).isoformat(), len(texts), train_dictionary(texts)),
         )
         self._conn.commit()
+        return int(cur.lastrowid or 0)
+
+    def compression_report(self) -> dict[str, Any]:
+        """
+        Bytes saved by blob compression. Raw sizes are read from each blob's header, so the report
+        never decompresses anything; dictionary bytes are charged against the total.
+        """
+
+        report: dict[str, Any] = {"codec": self._cfg.compression}
+        saved_total = 0
+        for name, table, col in (
+            ("snapshots", "scans", "snapshot_json"),
+            ("evidence", "check_evidence", "evidence_json"),
+        ):
+            rows = compressed = raw = stored = 0
+            for r in self._conn.execute(
+                f"SELECT typeof({col}) AS kind, substr({col}, 1, {HEADER_SIZE}) AS head,"
+                f" length(CAST({col} AS BLOB)) AS size FROM {table}"
+            ):
+                size = int(r["size"] or 0)
+                orig = header_raw_size(bytes(r["head"])) if r["kind"] == "blob" else None
+                rows += 1
+                stored += size
+                raw += size if orig is None else orig
+                compressed += orig is not None
+            saved_total += raw - stored
+            report[name] = {
+                "rows": rows,
+                "compressed_rows": compressed,
+                "raw_bytes": raw,
+                "stored_bytes": stored,
+                "saved_bytes": raw - stored,
+                "ratio": round(raw / stored, 2) if stored else None,
+            }
+        dicts = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length(data)), 0) FROM blob_dicts"
+        ).fetchone()
+        report["dictionaries"] = {"count": int(dicts[0]), "bytes": int(dicts[1])}
+        report["saved_bytes"] = saved_total - int(dicts[1])
+        return report
 
     def put_scan(self, snapshot: ScanSnapshot) -> None:
+        dict_id = self._write_dict_id()
         meta = ScanMeta(
             scan_id=snapshot.scan_id,
             created_at=snapshot.created_at,
@@ -88,17 +650,260 @@ class Storage:
                 meta.account_id,
                 meta.region,
                 int(meta.score),
-                json.dumps(meta.domain_scores, separators=(",", ":")),
-                json.dumps(snapshot.model_dump(mode="json"), separators=(",", ":")),
+                _compact_json(meta.domain_scores),
+                # Serialized straight from the model by pydantic-core, with no intermediate dict.
+                self._encode_raw(to_json(snapshot), dict_id),
             ),
         )
+        self._conn.executemany(
+            """
+            INSERT INTO check_results (
+              scan_id, check_id, position, domain, status, severity, result_json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    snapshot.scan_id,
+                    r.id,
+                    i,
+                    r.domain,
+                    r.status,
+                    r.severity,
+                    r.model_dump_json(exclude={"evidence"}),
+                )
+                for i, r in enumerate(snapshot.results)
+            ],
+        )
+        self._conn.executemany(
+            "INSERT INTO check_evidence (scan_id, check_id, evidence_json) VALUES (?, ?, ?)",
+            [
+                (
+                    snapshot.scan_id,
+                    r.id,
+                    self._encode_raw(to_json(r.evidence), dict_id),
+                )
+                for r in snapshot.results
+            ],
+        )
+        current = {
+            r.id: CheckState(
+                status=r.status,
+                severity=r.severity,
+                title=r.title,
+                evidence=r.model_dump(mode="json", include={"evidence"})["evidence"],
+            )
+            for r in snapshot.results
+        }
+        self._store_diff(
+            meta.scan_id, meta.account_id, meta.region, meta.created_at.isoformat(), meta.score, current
+        )
+        self._update_rollups(meta, {r.id: r.status for r in snapshot.results})
         self._conn.commit()
+        _notify("scan")
+
+    def _update_rollups(self, meta: ScanMeta, statuses: dict[str, str]) -> None:
+        point = _scan_rollup(meta.created_at.isoformat(), meta.score, meta.domain_scores, statuses)
+        rows = []
+        for period in ROLLUP_PERIODS:
+            key = (period, meta.account_id or "", meta.region, _bucket_start(meta.created_at, period))
+            current = self._load_rollup(key)
+            rows.append(_rollup_row(key, _merge_rollups(current, point) if current else point))
+        self._conn.executemany(_UPSERT_SCAN_ROLLUP, rows)
+
+    def _load_rollup(self, key: tuple[str, str, str, str]) -> dict[str, Any] | None:
+        row = self._conn.execute(
+            "SELECT * FROM scan_rollups WHERE period = ? AND account_id = ? AND region = ? AND bucket_start = ?",
+            key,
+        ).fetchone()
+        return _rollup_state(row) if row else None
 
-    def list_scans(self, limit: int = 25) -> list[ScanMeta]:
+    def score_timeseries(
+        self,
+        period: str,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        account_id: str | None = None,
+        region: str | None = None,
+        max_points: int = 500,
+    ) -> list[dict[str, Any]]:
+        """
+        Score and per-domain scores per `period` bucket, oldest first, read from scan_rollups.
+
+        Buckets from every matching account/region are combined. When the range holds more than
+        `max_points` buckets, consecutive buckets are merged (scan-weighted) so the series stays
+        at or under `max_points`.
+        """
+
+        where = ["period = ?"]
+        params: list[Any] = [period]
+        if since is not None:
+            where.append("bucket_start >= ?")
+            params.append(_bucket_start(since, period))
+        if until is not None:
+            where.append("bucket_start <= ?")
+            params.append(_bucket_start(until, period))
+        if account_id is not None:
+            where.append("account_id = ?")
+            params.append(account_id)
+        if region is not None:
+            where.append("region = ?")
+            params.append(region)
         rows = self._conn.execute(
-            "SELECT scan_id, created_at, account_id, region, score, domain_scores_json FROM scans ORDER BY created_at DESC LIMIT ?",
-            (int(limit),),
+            f"SELECT * FROM scan_rollups WHERE {' AND '.join(where)} ORDER BY bucket_start",
+            params,
+        ).fetchall()
+
+        buckets: dict[str, list[dict[str, Any]]] = {}
+        for r in rows:
+            buckets.setdefault(str(r["bucket_start"]), []).append(_rollup_state(r))
+        points = [(b, reduce(_merge_rollups, ps)) for b, ps in buckets.items()]
+        step = -(-len(points) // max(1, max_points))
+        if step > 1:
+            points = [
+                (points[i][0], reduce(_merge_rollups, (p for _, p in points[i : i + step])))
+                for i in range(0, len(points), step)
+            ]
+
+        return [
+            {
+                "bucket_start": bucket_start,
+                "scans": p["scans"],
+                "score_avg": round(p["score_sum"] / p["scans"], 2),
+                "score_min": p["score_min"],
+                "score_max": p["score_max"],
+                "score_last": p["score_last"],
+                "domain_scores": _domain_means(p),
+            }
+            for bucket_start, p in points
+        ]
+
+    def _check_states(self, scan_id: str) -> dict[str, CheckState]:
+        rows = self._conn.execute(
+            """
+            SELECT c.check_id, c.status, c.severity, c.result_json, e.evidence_json
+            FROM check_results c
+            LEFT JOIN check_evidence e ON e.scan_id = c.scan_id AND e.check_id = c.check_id
+            WHERE c.scan_id = ? ORDER BY c.position
+            """,
+            (scan_id,),
+        ).fetchall()
+        return {
+            str(r["check_id"]): CheckState(
+                status=str(r["status"]),
+                severity=str(r["severity"]),
+                title=str(loads(str(r["result_json"])).get("title", "")),
+                evidence=self._decode(r["evidence_json"]) or {},
+            )
+            for r in rows
+        }
+
+    def _store_diff(
+        self,
+        scan_id: str,
+        account_id: str | None,
+        region: str,
+        created_at: str,
+        score: int,
+        current: dict[str, CheckState],
+    ) -> dict[str, Any]:
+        prev = self._conn.execute(
+            """
+            SELECT scan_id, score FROM scans
+            WHERE account_id IS ? AND region = ? AND created_at < ?
+            ORDER BY created_at DESC LIMIT 1
+            """,
+            (account_id, region, created_at),
+        ).fetchone()
+        if prev is None:
+            diff = diff_checks({}, {})
+            diff.update(previous_scan_id=None, score_delta=None)
+        else:
+            diff = diff_checks(self._check_states(str(prev["scan_id"])), current)
+            diff.update(previous_scan_id=str(prev["scan_id"]), score_delta=int(score) - int(prev["score"]))
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO scan_diffs (
+              scan_id, previous_scan_id, score_delta, newly_failing, newly_passing, evidence_changed, diff_json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                scan_id,
+                diff["previous_scan_id"],
+                diff["score_delta"],
+                len(diff["newly_failing"]),
+                len(diff["newly_passing"]),
+                len(diff["evidence_changed"]),
+                _compact_json(diff),
+            ),
+        )
+        return diff
+
+    def get_scan_diff(self, scan_id: str) -> dict[str, Any]:
+        """
+        The stored diff of `scan_id` against the previous scan for its account and region.
+        Scans written before diffs existed get theirs computed (and stored) on first request.
+        """
+
+        row = self._conn.execute("SELECT diff_json FROM scan_diffs WHERE scan_id = ?", (scan_id,)).fetchone()
+        if row:
+            return {"scan_id": scan_id, **loads(str(row["diff_json"]))}
+        scan = self._conn.execute(
+            "SELECT account_id, region, created_at, score FROM scans WHERE scan_id = ?", (scan_id,)
+        ).fetchone()
+        if not scan:
+            raise KeyError("scan not found")
+        diff = self._store_diff(
+            scan_id,
+            scan["account_id"],
+            str(scan["region"]),
+            str(scan["created_at"]),
+            int(scan["score"]),
+            self._check_states(scan_id),
+        )
+        self._conn.commit()
+        return {"scan_id": scan_id, **diff}
+
+    def list_scans(
+        self, limit: int = 25, *, account_id: str | None = None, region: str | None = None
+    ) -> list[ScanMeta]:
+        return self.page_scans(limit, account_id=account_id, region=region)[0]
+
+    def page_scans(
+        self,
+        limit: int = 25,
+        *,
+        cursor: str | None = None,
+        account_id: str | None = None,
+        region: str | None = None,
+    ) -> tuple[list[ScanMeta], str | None]:
+        """
+        Newest scans first, one page at a time. Pages are keyed on (created_at, scan_id), so any
+        page costs one index range scan however deep it is. Returns the page and the cursor for
+        the next one (None on the last page); a malformed cursor raises ValueError.
+        """
+
+        where: list[str] = []
+        params: list[Any] = []
+        if account_id is not None:
+            where.append("account_id = ?")
+            params.append(account_id)
+        if region is not None:
+            where.append("region = ?")
+            params.append(region)
+        if cursor:
+            where.append("(created_at, scan_id) < (?, ?)")
+            params.extend(decode_cursor(cursor, 2))
+        rows = self._conn.execute(
+            "SELECT scan_id, created_at, account_id, region, score, domain_scores_json FROM scans"
+            f"{' WHERE ' + ' AND '.join(where) if where else ''}"
+            " ORDER BY created_at DESC, scan_id DESC LIMIT ?",
+            (*params, int(limit) + 1),
         ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(str(rows[-1]["created_at"]), str(rows[-1]["scan_id"]))
         metas: list[ScanMeta] = []
         for r in rows:
             metas.append(
@@ -108,13 +913,30 @@ class Storage:
                     account_id=str(r["account_id"]) if r["account_id"] else None,
                     region=str(r["region"]),
                     score=int(r["score"]),
-                    domain_scores=json.loads(str(r["domain_scores_json"]) or "{}"),
+                    domain_scores=loads(str(r["domain_scores_json"]) or "{}"),
                     s3_key=None,
                 )
             )
-        return metas
+        return metas, next_cursor
 
-    def get_scan(self, scan_id: str) -> tuple[ScanMeta, dict[str, Any] | None]:
+    def latest_scan(self) -> ScanMeta | None:
+        page = self.list_scans(limit=1)
+        return page[0] if page else None
+
+    def latest_scan_in(self, account_id: str | None, region: str) -> ScanMeta | None:
+        """Latest scan of one account and region; `account_id=None` means offline scans, not any account."""
+
+        row = self._conn.execute(
+            "SELECT scan_id FROM scans WHERE account_id IS ? AND region = ?"
+            " ORDER BY created_at DESC, scan_id DESC LIMIT 1",
+            (account_id, region),
+        ).fetchone()
+        return self._scan_row(str(row["scan_id"]))[0] if row else None
+
+    def scan_exists(self, scan_id: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM scans WHERE scan_id = ?", (scan_id,)).fetchone() is not None
+
+    def _scan_row(self, scan_id: str) -> tuple[ScanMeta, str | bytes | None]:
         row = self._conn.execute(
             "SELECT scan_id, created_at, account_id, region, score, domain_scores_json, snapshot_json FROM scans WHERE scan_id = ?",
             (scan_id,),
@@ -127,12 +949,152 @@ class Storage:
             account_id=str(row["account_id"]) if row["account_id"] else None,
             region=str(row["region"]),
             score=int(row["score"]),
-            domain_scores=json.loads(str(row["domain_scores_json"]) or "{}"),
+            domain_scores=loads(str(row["domain_scores_json"]) or "{}"),
             s3_key=None,
         )
-        snapshot = json.loads(str(row["snapshot_json"])) if row["snapshot_json"] else None
+        return meta, row["snapshot_json"]
+
+    def get_scan(self, scan_id: str) -> tuple[ScanMeta, dict[str, Any] | None]:
+        meta, stored = self._scan_row(scan_id)
+        snapshot = self._decode(stored) if stored else None
         return meta, snapshot
 
+    def get_scan_json(self, scan_id: str) -> bytes:
+        """
+        `{"meta": ..., "snapshot": ...}` as response-ready JSON bytes. The stored snapshot is only
+        decompressed and spliced in, never parsed and re-serialized.
+        """
+
+        meta, stored = self._scan_row(scan_id)
+        snapshot = decode_bytes(stored, self._dictionary) if stored else b"null"
+        return b'{"meta":' + to_json(meta) + b',"snapshot":' + snapshot + b"}"
+
+    def list_check_results(
+        self,
+        scan_id: str,
+        *,
+        domain: str | None = None,
+        status: str | None = None,
+        include_evidence: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Results of one scan in scan order, optionally filtered, without decoding the snapshot."""
+
+        if not self.scan_exists(scan_id):
+            raise KeyError("scan not found")
+        where = ["c.scan_id = ?"]
+        params: list[Any] = [scan_id]
+        if domain is not None:
+            where.append("c.domain = ?")
+            params.append(domain)
+        if status is not None:
+            where.append("c.status = ?")
+            params.append(status)
+        evidence_col = ", e.evidence_json" if include_evidence else ""
+        evidence_join = (
+            " LEFT JOIN check_evidence e ON e.scan_id = c.scan_id AND e.check_id = c.check_id"
+            if include_evidence
+            else ""
+        )
+        rows = self._conn.execute(
+            f"SELECT c.result_json{evidence_col} FROM check_results c{evidence_join}"
+            f" WHERE {' AND '.join(where)} ORDER BY c.position",
+            params,
+        ).fetchall()
+        return [self._check_row(r, include_evidence) for r in rows]
+
+    def get_check_result(self, scan_id: str, check_id: str) -> dict[str, Any]:
+        row = self._conn.execute(
+            """
+            SELECT c.result_json, e.evidence_json
+            FROM check_results c
+            LEFT JOIN check_evidence e ON e.scan_id = c.scan_id AND e.check_id = c.check_id
+            WHERE c.scan_id = ? AND c.check_id = ?
+            """,
+            (scan_id, check_id),
+        ).fetchone()
+        if not row:
+            raise KeyError("check result not found")
+        return self._check_row(row, True)
+
+    def put_org_scan(self, summary: OrgScanSummary) -> None:
+        ok = sum(1 for a in summary.accounts if a.status == "ok")
+        self._conn.execute(
+            """
+            INSERT INTO org_scans (
+              org_scan_id, created_at, score, accounts_ok, accounts_failed, summary_json
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                summary.org_scan_id,
+                summary.created_at.isoformat(),
+                summary.score,
+                ok,
+                len(summary.accounts) - ok,
+                to_json(summary).decode("utf-8"),
+            ),
+        )
+        self._conn.commit()
+
+    def get_org_scan(self, org_scan_id: str) -> OrgScanSummary:
+        row = self._conn.execute(
+            "SELECT summary_json FROM org_scans WHERE org_scan_id = ?", (org_scan_id,)
+        ).fetchone()
+        if not row:
+            raise KeyError("org scan not found")
+        return OrgScanSummary.model_validate_json(row["summary_json"])
+
+    def list_org_scans(self, limit: int = 25) -> list[dict[str, Any]]:
+        rows = self._conn.execute(
+            """
+            SELECT org_scan_id, created_at, score, accounts_ok, accounts_failed FROM org_scans
+            ORDER BY created_at DESC, org_scan_id DESC LIMIT ?
+            """,
+            (int(limit),),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def cache_check_results(
+        self, account_id: str, scope: str, entries: list[tuple[CheckResult, datetime, datetime]]
+    ) -> None:
+        """Upsert `(result, checked_at, expires_at)` entries and drop this scope's expired rows."""
+
+        self._conn.executemany(
+            """
+            INSERT OR REPLACE INTO check_cache (
+              account_id, scope, check_id, checked_at, expires_at, result_json
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (account_id, scope, r.id, checked_at.isoformat(), expires_at.isoformat(), r.model_dump_json())
+                for r, checked_at, expires_at in entries
+            ],
+        )
+        self._conn.execute(
+            "DELETE FROM check_cache WHERE account_id = ? AND scope = ? AND expires_at <= ?",
+            (account_id, scope, datetime.now(UTC).isoformat()),
+        )
+        self._conn.commit()
+
+    def cached_check_results(
+        self, account_id: str, scope: str, *, now: datetime | None = None
+    ) -> dict[str, tuple[CheckResult, datetime]]:
+        """Unexpired cached results for an account and scope: check id -> (result, checked_at)."""
+
+        rows = self._conn.execute(
+            """
+            SELECT check_id, checked_at, result_json FROM check_cache
+            WHERE account_id = ? AND scope = ? AND expires_at > ?
+            """,
+            (account_id, scope, (now or datetime.now(UTC)).isoformat()),
+        ).fetchall()
+        return {
+            str(r["check_id"]): (
+                CheckResult.model_validate_json(r["result_json"]),
+                datetime.fromisoformat(str(r["checked_at"])),
+            )
+            for r in rows
+        }
+
     def append_timeline_events(
         self,
         *,
@@ -140,48 +1102,92 @@ class Storage:
         scenario: str | None = None,
         operation_id: str | None = None,
     ) -> None:
-        cur = self._conn.cursor()
-        for e in events:
-            cur.execute(
-                """
-                INSERT INTO timeline (
-                  event_time, event_name, event_source, username, resources_json, scenario, operation_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    str(e.get("eventTime") or e.get("event_time")),
-                    str(e.get("eventName") or e.get("event_name")),
-                    str(e.get("eventSource") or e.get("event_source")),
-                    e.get("username"),
-                    json.dumps(e.get("resources") or [], separators=(",", ":")),
-                    scenario,
-                    operation_id,
-                ),
-            )
-        self._conn.commit()
+        self.ingest_timeline_events(events, scenario=scenario, operation_id=operation_id)
+
+    def ingest_timeline_events(
+        self,
+        events: Iterable[dict[str, Any]],
+        *,
+        scenario: str | None = None,
+        operation_id: str | None = None,
+        batch_size: int = 5000,
+        commit_every: int = 20,
+    ) -> IngestStats:
+        """
+        Bulk-insert timeline events from any iterable (it is consumed lazily, `batch_size` rows at
+        a time, via executemany). A commit is issued every `commit_every` batches and at the end,
+        so a failure part-way keeps the rows from earlier commits and rolls back the rest.
+        """
+
+        t0 = time.perf_counter()
+        rows = batches = commits = 0
+        it = iter(events)
+        try:
+            while True:
+                chunk = [_timeline_row(e, scenario, operation_id) for e in islice(it, max(1, batch_size))]
+                if not chunk:
+                    break
+                self._conn.executemany(_INSERT_TIMELINE, chunk)
+                rows += len(chunk)
+                batches += 1
+                if batches % max(1, commit_every) == 0:
+                    self._conn.commit()
+                    commits += 1
+            self._conn.commit()
+            commits += 1
+        except Exception:
+            self._conn.rollback()
+            raise
+        return IngestStats(rows=rows, batches=batches, commits=commits, seconds=time.perf_counter() - t0)
 
     def list_timeline(self, since: datetime | None = None, limit: int = 200) -> list[dict[str, Any]]:
-        if since:
-            rows = self._conn.execute(
-                """
-                SELECT event_time, event_name, event_source, username, resources_json
-                FROM timeline
-                WHERE event_time >= ?
-                ORDER BY event_time ASC
-                LIMIT ?
-                """,
-                (since.isoformat(), int(limit)),
-            ).fetchall()
-        else:
-            rows = self._conn.execute(
-                """
-                SELECT event_time, event_name, event_source, username, resources_json
-                FROM timeline
-                ORDER BY event_time ASC
-                LIMIT ?
-                """,
-                (int(limit),),
-            ).fetchall()
+        return self.page_timeline(limit, since=since)[0]
+
+    def page_timeline(
+        self,
+        limit: int = 200,
+        *,
+        cursor: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        event_name: str | None = None,
+        event_source: str | None = None,
+        username: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Timeline events oldest first, keyset-paginated on (event_time, id), with optional range
+        and equality filters. Returns the page and the next cursor (None on the last page).
+        """
+
+        where: list[str] = []
+        params: list[Any] = []
+        if since is not None:
+            where.append("event_time >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            where.append("event_time < ?")
+            params.append(until.isoformat())
+        for column, value in (
+            ("event_name", event_name),
+            ("event_source", event_source),
+            ("username", username),
+        ):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if cursor:
+            where.append("(event_time, id) > (?, ?)")
+            params.extend(decode_cursor(cursor, 2))
+        rows = self._conn.execute(
+            "SELECT id, event_time, event_name, event_source, username, resources_json FROM timeline"
+            f"{' WHERE ' + ' AND '.join(where) if where else ''}"
+            " ORDER BY event_time ASC, id ASC LIMIT ?",
+            (*params, int(limit) + 1),
+        ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(str(rows[-1]["event_time"]), int(rows[-1]["id"]))
 
         items: list[dict[str, Any]] = []
         for r in rows:
@@ -191,17 +1197,270 @@ class Storage:
                     "eventName": str(r["event_name"]),
                     "eventSource": str(r["event_source"]),
                     "username": r["username"],
-                    "resources": json.loads(str(r["resources_json"]) or "[]"),
+                    "resources": loads(str(r["resources_json"]) or "[]"),
                 }
             )
-        return items
+        return items, next_cursor
+
+    def timeline_event_names(
+        self,
+        *,
+        since: datetime | None = None,
+        after_id: int | None = None,
+        through_id: int | None = None,
+    ) -> set[str]:
+        """
+        Distinct event names in the timeline: by `event_time` (`since`), or by arrival (ids in
+        (`after_id`, `through_id`]). Ids grow with every insert, including late-delivered and
+        re-imported events whose `event_time` is in the past.
+        """
+
+        where: list[str] = []
+        params: list[Any] = []
+        if since is not None:
+            where.append("event_time >= ?")
+            params.append(since.isoformat())
+        if after_id is not None:
+            where.append("id > ?")
+            params.append(int(after_id))
+        if through_id is not None:
+            where.append("id <= ?")
+            params.append(int(through_id))
+        rows = self._conn.execute(
+            f"SELECT DISTINCT event_name FROM timeline{' WHERE ' + ' AND '.join(where) if where else ''}",
+            params,
+        ).fetchall()
+        return {str(r[0]) for r in rows}
+
+    def last_timeline_id(self) -> int:
+        return int(self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM timeline").fetchone()[0])
+
+    def prune_scans(self, before: datetime) -> int:
+        """
+        Delete scans created before `before` with their check results, evidence and diffs, in one
+        transaction. Their history lives on in scan_rollups, which put_scan already keeps.
+
+        The latest scan of every account/region is always kept, however old, so the latest
+        score, diffs and targeted rescans still have a base for scopes that stopped scanning.
+        """
+
+        prunable = """
+            SELECT s.scan_id FROM scans s
+            WHERE s.created_at < ? AND EXISTS (
+              SELECT 1 FROM scans n
+              WHERE n.account_id IS s.account_id AND n.region = s.region
+                AND (n.created_at, n.scan_id) > (s.created_at, s.scan_id)
+            )
+        """
+        cutoff = before.isoformat()
+        try:
+            for table in ("check_evidence", "check_results", "scan_diffs", "scans"):
+                cur = self._conn.execute(f"DELETE FROM {table} WHERE scan_id IN ({prunable})", (cutoff,))
+            pruned = cur.rowcount
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        if pruned:
+            _notify("prune")
+        return int(pruned)
+
+    def expire_rollups(self, period: str, before: datetime) -> int:
+        cur = self._conn.execute(
+            "DELETE FROM scan_rollups WHERE period = ? AND bucket_start < ?",
+            (period, _bucket_start(before, period)),
+        )
+        self._conn.commit()
+        return int(cur.rowcount)
+
+    def list_rollups(
+        self,
+        period: str,
+        *,
+        account_id: str | None = None,
+        region: str | None = None,
+        limit: int = 90,
+    ) -> list[dict[str, Any]]:
+        """
+        Newest rollups first: scan count, score range, mean domain scores, and the checks whose
+        status changed within the bucket (first and last status plus the number of transitions).
+        """
+
+        where = ["period = ?"]
+        params: list[Any] = [period]
+        if account_id is not None:
+            where.append("account_id = ?")
+            params.append(account_id)
+        if region is not None:
+            where.append("region = ?")
+            params.append(region)
+        rows = self._conn.execute(
+            f"SELECT * FROM scan_rollups WHERE {' AND '.join(where)} ORDER BY bucket_start DESC LIMIT ?",
+            (*params, int(limit)),
+        ).fetchall()
+        return [
+            {
+                "period": str(r["period"]),
+                "bucket_start": str(r["bucket_start"]),
+                "account_id": str(r["account_id"]) or None,
+                "region": str(r["region"]),
+                "scans": int(r["scans"]),
+                "first_scan_at": str(r["first_scan_at"]),
+                "last_scan_at": str(r["last_scan_at"]),
+                "score_min": int(r["score_min"]),
+                "score_max": int(r["score_max"]),
+                "score_avg": round(int(r["score_sum"]) / max(1, int(r["scans"])), 2),
+                "score_last": int(r["score_last"]),
+                "domain_scores": _domain_means(_rollup_state(r)),
+                "changed_checks": loads(str(r["changed_json"])),
+            }
+            for r in rows
+        ]
+
+    def db_size(self) -> dict[str, int]:
+        page_size = int(self._conn.execute("PRAGMA page_size").fetchone()[0])
+        pages = int(self._conn.execute("PRAGMA page_count").fetchone()[0])
+        free = int(self._conn.execute("PRAGMA freelist_count").fetchone()[0])
+        return {"page_size": page_size, "bytes": pages * page_size, "free_bytes": free * page_size}
+
+    def reclaim_space(self, max_pages: int = 0) -> dict[str, int]:
+        """
+        Return free pages to the filesystem with an incremental vacuum (`max_pages=0` frees them
+        all). A database created before auto_vacuum was enabled is converted by one full VACUUM.
+        """
+
+        before = self.db_size()
+        if int(self._conn.execute("PRAGMA auto_vacuum").fetchone()[0]) != 2:
+            self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self._conn.execute("VACUUM")
+        else:
+            self._conn.execute(f"PRAGMA incremental_vacuum({int(max_pages)})").fetchall()
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        after = self.db_size()
+        return {
+            "bytes_before": before["bytes"],
+            "bytes_after": after["bytes"],
+            "bytes_reclaimed": before["bytes"] - after["bytes"],
+        }
 
     def reset_timeline(self) -> None:
         self._conn.execute("DELETE FROM timeline")
         self._conn.commit()
 
+    def imported_files(self) -> dict[str, tuple[int, float]]:
+        rows = self._conn.execute("SELECT path, size, mtime FROM imported_files").fetchall()
+        return {str(r["path"]): (int(r["size"]), float(r["mtime"])) for r in rows}
+
+    def ingest_imported_file(
+        self,
+        *,
+        path: str,
+        size: int,
+        mtime: float,
+        events: Iterable[dict[str, Any]],
+        scenario: str | None = None,
+        operation_id: str | None = None,
+        batch_size: int = 5000,
+    ) -> int:
+        """
+        Replace one file's events and upsert its manifest row in a single transaction.
+
+        `events` is consumed lazily, `batch_size` rows per executemany, so a large log file is
+        never held in memory as a whole. Rows from an earlier import of the same path are deleted
+        first, so a file rewritten since its last import is not counted twice.
+        """
+
+        rows = 0
+        it = iter(events)
+        try:
+            self._conn.execute("DELETE FROM timeline WHERE source_file = ?", (path,))
+            while True:
+                chunk = [
+                    (*_timeline_row(e, scenario, operation_id), path) for e in islice(it, max(1, batch_size))
+                ]
+                if not chunk:
+                    break
+                self._conn.executemany(_INSERT_IMPORTED_TIMELINE, chunk)
+                rows += len(chunk)
+            self._conn.execute(
+                """
+                INSERT INTO imported_files (path, size, mtime, records, imported_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                  size = excluded.size, mtime = excluded.mtime,
+                  records = excluded.records, imported_at = excluded.imported_at
+                """,
+                (path, int(size), float(mtime), rows, datetime.now(UTC).isoformat()),
+            )
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        return rows
+
+
+class StorageProvider:
+    """
+    Process-wide access to one database: the schema is ensured once, then each thread gets its
+    own long-lived connection (sqlite3 connections are bound to the thread that opened them).
+    Every connection handed out is tracked so `close()` can release them all on shutdown.
+    """
+
+    def __init__(self, cfg: StorageConfig):
+        self.cfg = cfg
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open: list[Storage] = []
+        self._generation = 0
+        Storage(cfg).close()
+
+    def get(self) -> Storage:
+        st = getattr(self._local, "storage", None)
+        if st is not None and self._local.generation == self._generation:
+            return st
+        # Each connection is still used by one thread only; the check is relaxed so that close()
+        # can run from whichever thread handles shutdown.
+        st = Storage(self.cfg, conn=_connect(self.cfg, check_same_thread=False), ensure_schema=False)
+        with self._lock:
+            self._open.append(st)
+            self._local.generation = self._generation
+        self._local.storage = st
+        return st
+
+    def close(self) -> None:
+        with self._lock:
+            stores, self._open = self._open, []
+            self._generation += 1
+        for st in stores:
+            st.close()
+
+
+def _default_db_path(data_dir: str) -> Path:
+    return _repo_root() / data_dir / "cloudsentinel.db"
+
+
+def default_storage(data_dir: str = "data", compression: BlobCodec = "zlib") -> Storage:
+    return Storage(StorageConfig(db_path=_default_db_path(data_dir), compression=compression))
+
+
+_providers: dict[Path, StorageProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def storage_provider(data_dir: str = "data", compression: BlobCodec = "zlib") -> StorageProvider:
+    # One provider per database file; the first caller's `compression` applies to it.
+    db_path = _default_db_path(data_dir).resolve()
+    with _providers_lock:
+        provider = _providers.get(db_path)
+        if provider is None:
+            provider = StorageProvider(StorageConfig(db_path=db_path, compression=compression))
+            _providers[db_path] = provider
+        return provider
+
 
-def default_storage(data_dir: str = "data") -> Storage:
-    root = _repo_root()
-    db_path = root / data_dir / "cloudsentinel.db"
-    return Storage(StorageConfig(db_path=db_path))
+def close_storage_providers() -> None:
+    with _providers_lock:
+        providers = list(_providers.values())
+        _providers.clear()
+    for p in providers:
+        p.close()
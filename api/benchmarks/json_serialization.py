@@ -0,0 +1,125 @@
+"""
+Snapshot serialization throughput, before and after the fast JSON path.
+
+Usage (from api/):
+    python -m benchmarks.json_serialization --results 13 --evidence-items 50 200 1000
+
+Each size builds a synthetic snapshot (13 checks by default, each with a list of evidence
+records) and reports MB/s of snapshot JSON for:
+- write: model_dump(mode="json") + stdlib json.dumps (before) vs pydantic-core to_json (after)
+- read:  json.loads + re-serialization of the response (before) vs stored bytes passed through
+- the json_codec backend (orjson when installed) against the stdlib for plain dumps/loads
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from fastapi.encoders import jsonable_encoder
+from pydantic_core import to_json
+
+from app import json_codec
+from app.models import CheckResult, ScanMeta, ScanSnapshot
+
+
+def _snapshot(results: int, items: int) -> ScanSnapshot:
+    evidence = {
+        "noncompliant_samples": [
+            {
+                "bucket": f"bucket-{i:05d}",
+                "region": "eu-west-1",
+                "error": "ServerSideEncryptionConfigurationNotFoundError",
+            }
+            for i in range(items)
+        ],
+        "count": items,
+        "coverage": "full",
+    }
+    return ScanSnapshot(
+        scan_id="01J00000000000000000000000",
+        created_at=datetime.now(UTC),
+        account_id="123456789012",
+        region="us-east-1",
+        results=[
+            CheckResult(
+                id=f"check.{n}",
+                title=f"Check {n}",
+                severity="high",
+                status="fail",
+                domain="Data Protection",
+                evidence=evidence,
+                recommendation="Enable default encryption on every bucket.",
+            )
+            for n in range(results)
+        ],
+        score=42,
+        breakdown={"domain_scores": {"Data Protection": 42}},
+    )
+
+
+def _rate(fn: Callable[[], object], size: int, reps: int) -> float:
+    samples = []
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return size / statistics.median(samples) / 1e6
+
+
+def _cases(snap: ScanSnapshot) -> tuple[bytes, dict[str, Callable[[], object]]]:
+    stored = to_json(snap)
+    meta = ScanMeta(
+        scan_id=snap.scan_id,
+        created_at=snap.created_at,
+        account_id=snap.account_id,
+        region=snap.region,
+        score=snap.score,
+        domain_scores={"Data Protection": 42},
+    )
+    as_dict = json.loads(stored)
+
+    def read_before() -> bytes:
+        body = {"meta": meta.model_dump(mode="json"), "snapshot": json.loads(stored)}
+        return json.dumps(jsonable_encoder(body), ensure_ascii=False, separators=(",", ":")).encode()
+
+    def read_after() -> bytes:
+        return b'{"meta":' + to_json(meta) + b',"snapshot":' + stored + b"}"
+
+    return stored, {
+        "write  before (model_dump + json.dumps)": lambda: json.dumps(
+            snap.model_dump(mode="json"), separators=(",", ":")
+        ),
+        "write  after  (to_json)": lambda: to_json(snap),
+        "read   before (loads + re-serialize)": read_before,
+        "read   after  (bytes passthrough)": read_after,
+        "dumps  stdlib": lambda: json.dumps(as_dict, separators=(",", ":")),
+        f"dumps  {json_codec.BACKEND}": lambda: json_codec.dumps(as_dict),
+        "loads  stdlib": lambda: json.loads(stored),
+        f"loads  {json_codec.BACKEND}": lambda: json_codec.loads(stored),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--results", type=int, default=13)
+    parser.add_argument("--evidence-items", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--reps", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"json_codec backend: {json_codec.BACKEND}")
+    for items in args.evidence_items:
+        stored, cases = _cases(_snapshot(args.results, items))
+        print(f"\n== {args.results} checks x {items} evidence items ({len(stored) / 1e6:.2f} MB snapshot)")
+        for name, fn in cases.items():
+            print(f"  {name:<42}{_rate(fn, len(stored), args.reps):>10.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
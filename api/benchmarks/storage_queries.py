@@ -0,0 +1,188 @@
+"""
+Storage query latency at increasing history sizes, with and without the v2 indexes.
+
+Usage (from api/):
+    python -m benchmarks.storage_queries --rows 10000 100000 1000000
+
+Each size gets a fresh database with N scans and N timeline events. Every Storage read method is
+timed with the scans/timeline indexes dropped and again after recreating them, and the
+query plan for each underlying SELECT is printed so a regression to a full scan is easy to spot.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from app.pagination import encode_cursor
+from app.storage import _MIGRATIONS, Storage, StorageConfig
+
+
+def _index_ddl() -> list[str]:
+    # Indexes on scans/timeline as they stand after every migration (later ones replace some).
+    ddl: dict[str, str] = {}
+    for _version, statements in _MIGRATIONS:
+        for sql in statements:
+            if not isinstance(sql, str):
+                # Callable steps (e.g. _add_column) never touch indexes.
+                continue
+            m = re.search(
+                r"(CREATE|DROP) INDEX IF EXISTS (\w+)|CREATE INDEX IF NOT EXISTS (\w+) ON (\w+)", sql
+            )
+            if not m:
+                continue
+            if m.group(1) == "DROP":
+                ddl.pop(m.group(2), None)
+            elif m.group(4) in {"scans", "timeline"}:
+                ddl[m.group(3)] = sql
+    return list(ddl.values())
+
+
+_INDEX_DDL = _index_ddl()
+_EVENT_NAMES = ["CreateUser", "PutBucketAcl", "AttachUserPolicy", "CreateAccessKey", "ConsoleLogin"]
+
+_PLANS = {
+    "list_scans": "SELECT scan_id FROM scans ORDER BY created_at DESC, scan_id DESC LIMIT 25",
+    "page_scans(deep)": "SELECT scan_id FROM scans WHERE (created_at, scan_id) < (?, ?)"
+    " ORDER BY created_at DESC, scan_id DESC LIMIT 25",
+    "list_timeline(since)": "SELECT id FROM timeline WHERE event_time >= ? ORDER BY event_time ASC LIMIT 1000",
+    "timeline by event_name": "SELECT id FROM timeline WHERE event_name = ? AND event_time >= ?",
+    "timeline by operation_id": "SELECT id FROM timeline WHERE operation_id = ?",
+}
+
+
+def _populate(st: Storage, rows: int) -> None:
+    now = datetime.now(UTC)
+    conn = st._conn
+    snapshot = json.dumps({"results": [], "score": 80, "breakdown": {}}, separators=(",", ":"))
+    batch = 50_000
+    for start in range(0, rows, batch):
+        n = min(batch, rows - start)
+        conn.executemany(
+            "INSERT INTO scans (scan_id, created_at, account_id, region, score, domain_scores_json, snapshot_json)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    f"scan-{i:09d}",
+                    (now - timedelta(minutes=5 * i)).isoformat(),
+                    "123456789012",
+                    "us-east-1",
+                    80,
+                    "{}",
+                    snapshot,
+                )
+                for i in range(start, start + n)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO timeline (event_time, event_name, event_source, username, resources_json, scenario,"
+            " operation_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    (now - timedelta(seconds=30 * i)).isoformat(),
+                    _EVENT_NAMES[i % len(_EVENT_NAMES)],
+                    "iam.amazonaws.com",
+                    "bench",
+                    "[]",
+                    "bench",
+                    f"op-{i // 4}",
+                )
+                for i in range(start, start + n)
+            ),
+        )
+        conn.commit()
+    conn.execute("ANALYZE")
+
+
+def _time(fn: Callable[[], object], reps: int) -> float:
+    samples = []
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def _run(st: Storage, reps: int) -> dict[str, float]:
+    since = datetime.now(UTC) - timedelta(days=7)
+    # A cursor near the oldest end of history: keyset pages cost the same there as on page 1.
+    oldest = st._conn.execute(
+        "SELECT created_at, scan_id FROM scans ORDER BY created_at LIMIT 1 OFFSET 25"
+    ).fetchone()
+    deep = encode_cursor(str(oldest[0]), str(oldest[1])) if oldest else None
+    return {
+        "list_scans(25)": _time(lambda: st.list_scans(limit=25), reps),
+        "get_scan": _time(lambda: st.get_scan("scan-000000042"), reps),
+        "list_timeline(since=7d, 1000)": _time(lambda: st.list_timeline(since=since, limit=1000), reps),
+        "list_timeline(200)": _time(lambda: st.list_timeline(limit=200), reps),
+        "page_scans(deep cursor)": _time(lambda: st.page_scans(25, cursor=deep), reps),
+    }
+
+
+def _plans(st: Storage) -> dict[str, str]:
+    since = (datetime.now(UTC) - timedelta(days=7)).isoformat()
+    params = {
+        "list_timeline(since)": (since,),
+        "timeline by event_name": ("PutBucketAcl", since),
+        "timeline by operation_id": ("op-42",),
+        "page_scans(deep)": ("2000-01-01", "scan-0"),
+    }
+    out = {}
+    for name, sql in _PLANS.items():
+        rows = st._conn.execute(f"EXPLAIN QUERY PLAN {sql}", params.get(name, ())).fetchall()
+        out[name] = "; ".join(str(r[-1]) for r in rows)
+    return out
+
+
+def _drop_indexes(st: Storage) -> None:
+    for sql in _INDEX_DDL:
+        name = re.search(r"INDEX IF NOT EXISTS (\w+)", sql)
+        if name:
+            st._conn.execute(f"DROP INDEX IF EXISTS {name.group(1)}")
+    st._conn.commit()
+
+
+def _create_indexes(st: Storage) -> None:
+    for sql in _INDEX_DDL:
+        st._conn.execute(sql)
+    st._conn.execute("ANALYZE")
+    st._conn.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--reps", type=int, default=20)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            st = Storage(StorageConfig(db_path=Path(tmp) / "bench.db"))
+            _populate(st, rows)
+
+            _drop_indexes(st)
+            before, before_plans = _run(st, args.reps), _plans(st)
+            _create_indexes(st)
+            after, after_plans = _run(st, args.reps), _plans(st)
+            st.close()
+
+        print(f"\n== {rows:,} scans + {rows:,} timeline events (median of {args.reps}, ms)")
+        print(f"{'method':<34}{'no index':>12}{'indexed':>12}")
+        for name in before:
+            print(f"{name:<34}{before[name]:>12.3f}{after[name]:>12.3f}")
+        print("query plans (no index -> indexed):")
+        for name in _PLANS:
+            print(f"  {name}:\n    {before_plans[name]}\n    {after_plans[name]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,56 @@
 import sys
+from collections.abc import Callable
+from datetime import UTC, datetime
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from app.models import CheckResult, CheckStatus, ScanSnapshot  # noqa: E402
+
+
+def _build_snapshot(
+    scan_id: str = "s1",
+    created_at: datetime | str | None = None,
+    *,
+    account_id: str | None = None,
+    region: str = "us-east-1",
+    score: int = 75,
+    status: CheckStatus = "pass",
+    evidence: dict | None = None,
+    results: list[CheckResult] | None = None,
+) -> ScanSnapshot:
+    # One root-MFA result by default; every domain present scores `score`.
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    if results is None:
+        results = [
+            CheckResult(
+                id="iam.root_mfa",
+                title="Root MFA",
+                severity="high",
+                status=status,
+                domain="Identity",
+                evidence=evidence or {},
+                recommendation="Enable MFA.",
+            )
+        ]
+    return ScanSnapshot(
+        scan_id=scan_id,
+        created_at=created_at or datetime.now(UTC),
+        account_id=account_id,
+        region=region,
+        results=results,
+        score=score,
+        breakdown={"domain_scores": {r.domain: score for r in results}},
+    )
+
+
+@pytest.fixture
+def make_snapshot() -> Callable[..., ScanSnapshot]:
+    """Build a `ScanSnapshot`: scan id, timestamp, account, region, score and check status."""
+
+    return _build_snapshot
@@ -31,3 +31,162 @@ def test_scan_timeline_roundtrip(tmp_path, monkeypatch) -> None:
     detail = c.get(f"/api/scans/{snap['scan_id']}").json()
     assert detail["meta"]["scan_id"] == snap["scan_id"]
     assert detail["snapshot"]["scan_id"] == snap["scan_id"]
+
+
+def test_scan_stream_emits_results_then_summary(tmp_path, monkeypatch) -> None:
+    import json
+
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("AWS_SCAN_ENABLED", "0")
+    from app.main import app
+
+    c = TestClient(app)
+    resp = c.post("/api/scan/stream")
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in resp.text.splitlines() if line]
+
+    assert events[0]["type"] == "start"
+    assert events[-1]["type"] == "summary"
+    results = [e["result"] for e in events if e["type"] == "result"]
+    assert results and all(isinstance(r["id"], str) for r in results)
+
+    detail = c.get(f"/api/scans/{events[-1]['scan_id']}").json()
+    assert [r["id"] for r in detail["snapshot"]["results"]] == [r["id"] for r in results]
+
+    sse = c.post("/api/scan/stream", headers={"Accept": "text/event-stream"})
+    assert sse.text.startswith("event: start\n")
+
+
+def test_scan_job_submit_and_poll(tmp_path, monkeypatch) -> None:
+    import time
+
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("AWS_SCAN_ENABLED", "0")
+    from app.main import app
+
+    c = TestClient(app)
+    resp = c.post("/api/scan/jobs")
+    assert resp.status_code == 202
+    job_id = resp.json()["job"]["job_id"]
+
+    job = {}
+    for _ in range(200):
+        job = c.get(f"/api/scan/jobs/{job_id}").json()
+        if job["status"] in {"succeeded", "failed"}:
+            break
+        time.sleep(0.02)
+    assert job["status"] == "succeeded"
+    assert c.get(f"/api/scans/{job['scan_id']}").status_code == 200
+    assert c.get("/api/scan/jobs/missing").status_code == 404
+
+
+def test_scan_check_endpoints(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("AWS_SCAN_ENABLED", "0")
+    from app.main import app
+
+    c = TestClient(app)
+    snap = c.post("/api/scan").json()
+    first = snap["results"][0]
+
+    checks = c.get(f"/api/scans/{snap['scan_id']}/checks").json()
+    assert [r["id"] for r in checks] == [r["id"] for r in snap["results"]]
+
+    domain = c.get(f"/api/scans/{snap['scan_id']}/checks", params={"domain": first["domain"]}).json()
+    assert domain and all(r["domain"] == first["domain"] for r in domain)
+
+    one = c.get(f"/api/scans/{snap['scan_id']}/checks/{first['id']}").json()
+    assert one == first
+    assert c.get("/api/scans/missing/checks").status_code == 404
+
+
+def test_scan_history_cursor_header(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("AWS_SCAN_ENABLED", "0")
+    from app.main import app
+
+    c = TestClient(app)
+    ids = [c.post("/api/scan").json()["scan_id"] for _ in range(3)]
+
+    first = c.get("/api/scans", params={"limit": 2})
+    rest = c.get("/api/scans", params={"limit": 2, "cursor": first.headers["x-next-cursor"]})
+    assert [s["scan_id"] for s in first.json() + rest.json()] == ids[::-1]
+    assert "x-next-cursor" not in rest.headers
+    assert c.get("/api/scans", params={"cursor": "%%%"}).status_code == 400
+    assert c.get("/api/timeline", params={"limit": 1}).json()["next_cursor"] is None
+
+
+def test_scan_and_latest_score_support_conditional_get(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("AWS_SCAN_ENABLED", "0")
+    from app.main import app
+
+    c = TestClient(app)
+    scan_id = c.post("/api/scan").json()["scan_id"]
+
+    first = c.get(f"/api/scans/{scan_id}")
+    etag = first.headers["etag"]
+    assert etag == f'"scan-{scan_id}"'
+    assert c.get(f"/api/scans/{scan_id}", headers={"If-None-Match": etag}).status_code == 304
+    assert c.get(f"/api/scans/{scan_id}").json() == first.json()
+    assert c.get("/api/scans/missing", headers={"If-None-Match": '"scan-missing"'}).status_code == 404
+
+    latest = c.get("/api/score/latest")
+    assert latest.json()["scan_id"] == scan_id
+    assert c.get("/api/score/latest", headers={"If-None-Match": latest.headers["etag"]}).status_code == 304
+    newer = c.post("/api/scan").json()["scan_id"]
+    changed = c.get("/api/score/latest", headers={"If-None-Match": latest.headers["etag"]})
+    assert changed.status_code == 200 and changed.json()["scan_id"] == newer
+
+
+def test_targeted_rescan_reruns_only_affected_checks(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("AWS_SCAN_ENABLED", "0")
+    from app.main import app
+
+    c = TestClient(app)
+    base = c.post("/api/scan").json()
+
+    resp = c.post("/api/scan/targeted", json={"event_names": ["PutBucketAcl"]}).json()
+    assert resp["events"] == ["PutBucketAcl"]
+    assert "data.s3_public_access_block" in resp["checks"]
+    snap = resp["snapshot"]
+    assert snap["breakdown"]["rescan"]["base_scan_id"] == base["scan_id"]
+    assert set(snap["breakdown"]["rescan"]["checks"]) == {
+        "data.s3_public_access_block",
+        "log.alerting_baseline",
+    }
+    assert [r["id"] for r in snap["results"]] == [r["id"] for r in base["results"]]
+    assert c.get(f"/api/scans/{snap['scan_id']}/diff").json()["previous_scan_id"] == base["scan_id"]
+
+    # Unmapped events re-run only the activity baseline; no events since the snapshot is a no-op.
+    assert c.post("/api/scan/targeted", json={"event_names": ["GetObject"]}).json()["checks"] == [
+        "log.alerting_baseline"
+    ]
+    c.post("/api/simulate/cleanup")
+    assert c.post("/api/scan/targeted", json={"since": "2999-01-01T00:00:00Z"}).json()["snapshot"] is None
+
+    # Ids with no check in this mode are dropped rather than storing a copy of the base.
+    scans = len(c.get("/api/scans").json())
+    resp = c.post("/api/scan/targeted", json={"check_ids": ["s3.access_logging"]}).json()
+    assert resp["checks"] == [] and resp["snapshot"] is None
+    assert len(c.get("/api/scans").json()) == scans
+
+
+def test_storage_compression_setting_selects_blob_codec(tmp_path, monkeypatch) -> None:
+    import sqlite3
+
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("AWS_SCAN_ENABLED", "0")
+    monkeypatch.setenv("STORAGE_COMPRESSION", "none")
+    from app.main import app
+
+    c = TestClient(app)
+    snap = c.post("/api/scan").json()
+
+    conn = sqlite3.connect(tmp_path / "data" / "cloudsentinel.db")
+    (blob,) = conn.execute("SELECT snapshot_json FROM scans WHERE scan_id = ?", (snap["scan_id"],)).fetchone()
+    conn.close()
+    # "none" stores plain JSON text rather than a compressed blob.
+    assert isinstance(blob, str)
+    assert c.get(f"/api/scans/{snap['scan_id']}").json()["meta"]["scan_id"] == snap["scan_id"]
@@ -0,0 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.aws_client import ClientPool, client_config
+
+
+def test_client_pool_reuses_sessions_and_clients() -> None:
+    pool = ClientPool(client_config())
+
+    s1 = pool.session("us-east-1")
+    assert pool.session("us-east-1") is s1
+    assert pool.session("eu-west-1") is not s1
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        clients = list(ex.map(lambda _: s1.client("sts"), range(16)))
+    assert all(c is clients[0] for c in clients)
+    assert s1.client("sts", region_name="eu-west-1") is not clients[0]
+    assert pool.client("sts", "us-east-1") is clients[0]
+    assert clients[0].meta.config.max_pool_connections == pool.config.max_pool_connections
@@ -0,0 +1,12 @@
+import sys
+
+
+def test_storage_queries_benchmark_runs_on_a_small_history(monkeypatch, capsys) -> None:
+    from benchmarks import storage_queries
+
+    monkeypatch.setattr(sys, "argv", ["storage_queries", "--rows", "300", "--reps", "1"])
+    storage_queries.main()
+
+    out = capsys.readouterr().out
+    assert "== 300 scans + 300 timeline events" in out
+    assert "page_scans(deep cursor)" in out
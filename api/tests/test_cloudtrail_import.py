@@ -0,0 +1,70 @@
+import gzip
+import io
+import json
+
+from app.cloudtrail_import import import_directory, iter_records
+from app.storage import Storage, StorageConfig
+
+
+def _record(i: int) -> dict:
+    return {
+        "eventTime": f"2026-01-01T00:00:{i % 60:02d}Z",
+        "eventName": "PutBucketAcl" if i % 2 else "CreateAccessKey",
+        "eventSource": "s3.amazonaws.com",
+        "userIdentity": {"type": "IAMUser", "userName": f"user-{i}", "arn": "arn:aws:iam::1:user/x"},
+        "resources": [{"ARN": f"arn:aws:s3:::bucket-{i}", "type": "AWS::S3::Bucket"}],
+        "requestParameters": {"padding": "x" * (i * 7 % 300)},
+    }
+
+
+def test_iter_records_handles_records_split_across_chunks() -> None:
+    records = [_record(i) for i in range(50)]
+    text = json.dumps({"Records": records}, indent=1)
+
+    parsed = list(iter_records(io.StringIO(text), chunk_size=17))
+
+    assert parsed == records
+    assert list(iter_records(io.StringIO('{"Records": []}'))) == []
+
+
+def _write_log(path, records) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        json.dump({"Records": records}, fh)
+
+
+def test_import_directory_is_incremental(tmp_path) -> None:
+    root = tmp_path / "logs"
+    prefix = root / "AWSLogs" / "111111111111" / "CloudTrail" / "us-east-1" / "2026" / "01" / "01"
+    _write_log(prefix / "a.json.gz", [_record(i) for i in range(3)])
+    _write_log(prefix / "b.json.gz", [_record(i) for i in range(3, 5)])
+    _write_log(root / "AWSLogs" / "111111111111" / "CloudTrail-Digest" / "d.json.gz", [_record(99)])
+
+    st = Storage(StorageConfig(db_path=tmp_path / "cs.db"))
+    first = import_directory(st, root, workers=2)
+    assert (first.files_seen, first.files_imported, first.records) == (2, 2, 5)
+
+    items = st.list_timeline(limit=100)
+    assert len(items) == 5
+    assert items[0]["username"] == "user-0"
+    assert items[0]["eventTime"] == "2026-01-01T00:00:00+00:00"
+    assert items[0]["resources"] == [
+        {"ResourceName": "arn:aws:s3:::bucket-0", "ResourceType": "AWS::S3::Bucket"}
+    ]
+
+    again = import_directory(st, root, workers=1)
+    assert (again.files_skipped, again.files_imported, again.records) == (2, 0, 0)
+
+    _write_log(prefix / "c.json.gz", [_record(7)])
+    third = import_directory(st, root, workers=1)
+    assert (third.files_imported, third.records) == (1, 1)
+    assert len(st.list_timeline(limit=100)) == 6
+
+    # A rewritten file replaces the events of its earlier import rather than adding to them.
+    _write_log(prefix / "a.json.gz", [_record(i) for i in range(10, 14)])
+    fourth = import_directory(st, root, workers=2)
+    assert (fourth.files_imported, fourth.records) == (1, 4)
+    users = [i["username"] for i in st.list_timeline(limit=100)]
+    assert len(users) == 7
+    assert "user-0" not in users and "user-13" in users
+    st.close()
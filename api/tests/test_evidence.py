@@ -0,0 +1,21 @@
+from app.evidence import EvidencePolicy, cap_evidence
+
+
+def test_cap_evidence_keeps_a_sample_and_records_totals() -> None:
+    policy = EvidencePolicy(max_items=3, max_str_chars=5)
+    evidence = {
+        "stale_keys": list(range(10)),
+        "count": 10,
+        "nested": {"findings": [{"rule": "x" * 8}] * 4},
+        "short": [1, 2],
+    }
+
+    capped = cap_evidence(evidence, policy)
+    assert capped["stale_keys"] == [0, 1, 2]
+    assert capped["count"] == 10
+    assert capped["short"] == [1, 2]
+    assert capped["nested"]["findings"] == [{"rule": "xxxxx"}] * 3
+    assert capped["truncated"] == {"stale_keys": 10, "nested.findings": 4, "nested.findings[].rule": 8}
+    # Capping again is a no-op, and untouched evidence gets no "truncated" key.
+    assert cap_evidence(capped, policy) == capped
+    assert "truncated" not in cap_evidence({"short": [1]}, policy)
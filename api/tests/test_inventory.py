@@ -0,0 +1,262 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.inventory import ScanInventory
+
+
+class FakeS3:
+    def __init__(self) -> None:
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def list_buckets(self) -> dict:
+        with self._lock:
+            self.calls += 1
+        return {"Buckets": [{"Name": "a"}, {"Name": "b"}]}
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.s3 = FakeS3()
+
+    def client(self, service: str, region_name: str | None = None):
+        assert service == "s3"
+        return self.s3
+
+
+def test_inventory_loads_each_key_once_under_concurrency() -> None:
+    session = FakeSession()
+    inv = ScanInventory(session, "us-east-1")  # type: ignore[arg-type]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: inv.list_buckets(), range(16)))
+
+    assert session.s3.calls == 1
+    assert all(r == results[0] for r in results)
+    assert inv.stats() == {"hits": 15, "misses": 1, "keys": 1}
+
+
+def test_inventory_does_not_cache_failures() -> None:
+    inv = ScanInventory(FakeSession(), "us-east-1")  # type: ignore[arg-type]
+    attempts = []
+
+    def flaky() -> int:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("throttled")
+        return 42
+
+    try:
+        inv.get("k", flaky)
+    except RuntimeError:
+        pass
+    assert inv.get("k", flaky) == 42
+    assert inv.stats()["misses"] == 2
+
+
+class FakeBucketS3:
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _hit(self, op: str) -> None:
+        with self._lock:
+            self.calls[op] = self.calls.get(op, 0) + 1
+
+    def list_buckets(self) -> dict:
+        self._hit("list_buckets")
+        regions = ["us-east-1", "eu-west-1"]
+        return {"Buckets": [{"Name": f"b{i}", "BucketRegion": regions[i % 2]} for i in range(self.n)]}
+
+    def get_public_access_block(self, Bucket: str) -> dict:
+        self._hit("pab")
+        flag = Bucket != "b3"
+        keys = ["BlockPublicAcls", "IgnorePublicAcls", "BlockPublicPolicy", "RestrictPublicBuckets"]
+        return {"PublicAccessBlockConfiguration": dict.fromkeys(keys, flag)}
+
+    def get_bucket_encryption(self, Bucket: str) -> dict:
+        self._hit("encryption")
+        if Bucket == "b5":
+            raise RuntimeError("ServerSideEncryptionConfigurationNotFoundError")
+        return {"ServerSideEncryptionConfiguration": {"Rules": [{}]}}
+
+    def get_bucket_logging(self, Bucket: str) -> dict:
+        self._hit("logging")
+        return {}
+
+
+class FakeBucketSession:
+    def __init__(self, n: int) -> None:
+        self.s3 = FakeBucketS3(n)
+
+    def client(self, service: str, region_name: str | None = None):
+        return self.s3
+
+
+def test_s3_checks_share_one_full_coverage_pass() -> None:
+    from app.checks.protection import (
+        check_s3_access_logging_sampled,
+        check_s3_default_encryption_sampled,
+        check_s3_public_access_block,
+    )
+
+    session = FakeBucketSession(25)
+    inv = ScanInventory(session, "us-east-1", s3_full_coverage=True, max_fanout=4)  # type: ignore[arg-type]
+    checks = [
+        check_s3_public_access_block,
+        check_s3_default_encryption_sampled,
+        check_s3_access_logging_sampled,
+    ]
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        pab, enc, logging = pool.map(lambda fn: fn(session, "us-east-1", inv), checks)
+
+    assert session.s3.calls == {"list_buckets": 1, "pab": 25, "encryption": 25, "logging": 25}
+    assert pab.evidence["coverage"] == "full" and pab.evidence["sampled"] == 25
+    assert [b["bucket"] for b in pab.evidence["noncompliant_samples"]] == ["b3"]
+    assert enc.evidence["noncompliant_samples"][0]["bucket"] == "b5"
+    assert logging.evidence["count"] == 25
+
+
+def test_s3_bucket_fetches_stay_within_each_regions_share() -> None:
+    import time
+
+    session = FakeBucketSession(24)
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+    lock = threading.Lock()
+    get_logging = session.s3.get_bucket_logging
+
+    def slow_logging(Bucket: str) -> dict:
+        region = ["us-east-1", "eu-west-1"][int(Bucket[1:]) % 2]
+        with lock:
+            in_flight[region] = in_flight.get(region, 0) + 1
+            peak[region] = max(peak.get(region, 0), in_flight[region])
+        time.sleep(0.01)
+        with lock:
+            in_flight[region] -= 1
+        return get_logging(Bucket=Bucket)
+
+    session.s3.get_bucket_logging = slow_logging  # type: ignore[method-assign]
+    inv = ScanInventory(session, "us-east-1", s3_full_coverage=True, max_fanout=4)  # type: ignore[arg-type]
+    scan = inv.s3_bucket_configs()
+
+    assert len(scan.buckets) == 24 and all("logging" in b.values for b in scan.buckets)
+    # Four workers over two regions: at most two requests per region at a time.
+    assert peak == {"us-east-1": 2, "eu-west-1": 2}
+
+
+class FakePaginator:
+    def __init__(self, pages: list[dict]) -> None:
+        self.pages = pages
+
+    def paginate(self, **_kwargs):
+        return iter(self.pages)
+
+
+class FakeIam:
+    def __init__(self, *, bulk_denied: bool = False) -> None:
+        self.bulk_denied = bulk_denied
+        self.per_principal_calls = 0
+        self._lock = threading.Lock()
+
+    def get_paginator(self, operation: str) -> FakePaginator:
+        if operation == "get_account_authorization_details":
+            if self.bulk_denied:
+                raise RuntimeError("AccessDenied")
+            return FakePaginator(
+                [
+                    {
+                        "UserDetailList": [
+                            {
+                                "UserName": "alice",
+                                "AttachedManagedPolicies": [
+                                    {"PolicyArn": "arn:aws:iam::aws:policy/AdministratorAccess"}
+                                ],
+                            },
+                            {"UserName": "bob", "AttachedManagedPolicies": []},
+                        ],
+                        "RoleDetailList": [{"RoleName": "ci", "AttachedManagedPolicies": []}],
+                    }
+                ]
+            )
+        if operation == "list_users":
+            return FakePaginator([{"Users": [{"UserName": "alice"}, {"UserName": "bob"}]}])
+        return FakePaginator([{"Roles": [{"RoleName": "ci"}]}])
+
+    def generate_credential_report(self) -> dict:
+        return {"State": "COMPLETE"}
+
+    def get_credential_report(self) -> dict:
+        rows = [
+            "user,access_key_1_active,access_key_1_last_rotated,access_key_2_active,access_key_2_last_rotated",
+            "<root_account>,false,N/A,false,N/A",
+            "alice,true,2020-01-01T00:00:00+00:00,false,N/A",
+            "bob,false,N/A,false,N/A",
+        ]
+        return {"Content": "\n".join(rows).encode()}
+
+    def _count(self) -> None:
+        with self._lock:
+            self.per_principal_calls += 1
+
+    def list_attached_user_policies(self, UserName: str) -> dict:
+        self._count()
+        arns = ["arn:aws:iam::aws:policy/AdministratorAccess"] if UserName == "alice" else []
+        return {"AttachedPolicies": [{"PolicyArn": a} for a in arns]}
+
+    def list_attached_role_policies(self, RoleName: str) -> dict:
+        self._count()
+        return {"AttachedPolicies": []}
+
+    def list_access_keys(self, UserName: str) -> dict:
+        from datetime import UTC, datetime
+
+        self._count()
+        if UserName != "alice":
+            return {"AccessKeyMetadata": []}
+        created = datetime(2020, 1, 1, tzinfo=UTC)
+        return {"AccessKeyMetadata": [{"AccessKeyId": "AKIA1", "CreateDate": created, "Status": "Active"}]}
+
+
+class FakeIamSession:
+    def __init__(self, iam: FakeIam) -> None:
+        self.iam = iam
+
+    def client(self, service: str, region_name: str | None = None):
+        return self.iam
+
+
+def _run_iam_checks(iam: FakeIam, collection: str):
+    from app.checks.identity import check_iam_admin_attachments, check_iam_old_access_keys
+
+    session = FakeIamSession(iam)
+    inv = ScanInventory(session, "us-east-1", iam_collection=collection)  # type: ignore[arg-type]
+    keys = check_iam_old_access_keys(session, "us-east-1", inv)  # type: ignore[arg-type]
+    admin = check_iam_admin_attachments(session, "us-east-1", inv)  # type: ignore[arg-type]
+    return inv, keys, admin
+
+
+def test_iam_checks_share_bulk_dataset() -> None:
+    iam = FakeIam()
+    inv, keys, admin = _run_iam_checks(iam, "bulk")
+
+    assert iam.per_principal_calls == 0
+    assert inv.stats()["misses"] == 1
+    assert keys.evidence["source"] == "bulk"
+    assert keys.evidence["stale_keys"][0]["user"] == "alice"
+    assert keys.evidence["stale_keys"][0]["key_slot"] == 1
+    assert admin.evidence["attachments"] == [
+        {"type": "user", "name": "alice", "policy_arn": "arn:aws:iam::aws:policy/AdministratorAccess"}
+    ]
+
+
+def test_iam_bulk_falls_back_to_fanout() -> None:
+    iam = FakeIam(bulk_denied=True)
+    _inv, keys, admin = _run_iam_checks(iam, "bulk")
+
+    # One attached-policies + one access-keys call per user, one attached-policies call per role.
+    assert iam.per_principal_calls == 5
+    assert keys.evidence["source"] == "fanout"
+    assert keys.evidence["stale_keys"][0]["access_key_id"] == "AKIA1"
+    assert admin.evidence["count"] == 1
@@ -0,0 +1,82 @@
+import threading
+import time
+from datetime import UTC, datetime
+
+from app.config import Settings
+from app.jobs import ScanJobQueue, org_scan_scope
+from app.models import OrgScanSummary, ScanSnapshot
+
+
+def _wait_for(queue: ScanJobQueue, job_id: str, status: str):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job and job.status == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}")
+
+
+def test_job_queue_coalesces_same_scope(make_snapshot) -> None:
+    queue = ScanJobQueue(max_workers=2)
+    release = threading.Event()
+    runs = []
+
+    def run() -> ScanSnapshot:
+        runs.append(1)
+        release.wait(5)
+        return make_snapshot("s1", score=80)
+
+    settings = Settings(aws_scan_enabled=False, data_dir="data")
+    first, dedup1 = queue.submit(settings, run)
+    second, dedup2 = queue.submit(settings, run)
+    other, dedup3 = queue.submit(Settings(aws_scan_enabled=False, data_dir="other"), run)
+
+    assert (dedup1, dedup2, dedup3) == (False, True, False)
+    assert second.job_id == first.job_id and other.job_id != first.job_id
+
+    release.set()
+    done = _wait_for(queue, first.job_id, "succeeded")
+    assert done.scan_id == "s1" and done.score == 80
+    assert len(runs) == 2
+
+    # Once finished, the scope is free again.
+    third, dedup4 = queue.submit(settings, run)
+    assert not dedup4 and third.job_id != first.job_id
+    queue.shutdown()
+
+
+def test_job_queue_records_failures() -> None:
+    queue = ScanJobQueue(max_workers=1)
+
+    def run() -> ScanSnapshot:
+        raise RuntimeError("boom")
+
+    job, _ = queue.submit(Settings(aws_scan_enabled=False), run)
+    failed = _wait_for(queue, job.job_id, "failed")
+    assert failed.error == "boom"
+    queue.shutdown()
+
+
+def test_org_scan_jobs_record_the_org_scan_id() -> None:
+    queue = ScanJobQueue(max_workers=1)
+    release = threading.Event()
+
+    def run() -> OrgScanSummary:
+        release.wait(5)
+        return OrgScanSummary(org_scan_id="o1", created_at=datetime.now(UTC), score=70, accounts=[])
+
+    settings = Settings(aws_scan_enabled=True, data_dir="data")
+    scope = org_scan_scope(settings, ["222222222222", "111111111111"])
+    job, _ = queue.submit(settings, run, scope=scope)
+    same, dedup = queue.submit(
+        settings, run, scope=org_scan_scope(settings, ["111111111111", "222222222222"])
+    )
+    assert dedup and same.job_id == job.job_id
+    # An org scan never coalesces with a plain scan of the same scope.
+    assert not queue.submit(settings, run)[1]
+
+    release.set()
+    done = _wait_for(queue, job.job_id, "succeeded")
+    assert done.org_scan_id == "o1" and done.scan_id is None and done.score == 70
+    queue.shutdown()
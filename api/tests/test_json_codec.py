@@ -0,0 +1,11 @@
+from app import json_codec
+
+
+def test_json_codec_matches_the_stdlib_fallback(monkeypatch) -> None:
+    data = {"title": "é", "items": [1, 2.5, None, True], "nested": {"k": "v"}}
+    fast = json_codec.dumps(data)
+
+    monkeypatch.setattr(json_codec, "orjson", None)
+    assert json_codec.dumps(data) == fast
+    assert json_codec.loads(fast) == data
+    assert json_codec.dumps_text(data) == fast.decode("utf-8")
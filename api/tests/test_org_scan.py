@@ -0,0 +1,94 @@
+import threading
+from datetime import UTC, datetime, timedelta
+
+from app.aws_client import AssumedRoleSessions, client_config
+from app.config import Settings
+from app.models import ScanSnapshot
+from app.org_scan import run_org_scan
+from app.storage import Storage, StorageConfig
+
+
+def test_org_scan_isolates_broken_and_slow_accounts(tmp_path, make_snapshot) -> None:
+    st = Storage(StorageConfig(db_path=tmp_path / "cs.db"))
+    release = threading.Event()
+
+    def scan_account(account_id: str) -> ScanSnapshot:
+        if account_id == "333333333333":
+            raise RuntimeError("AccessDenied: sts:AssumeRole")
+        if account_id == "444444444444":
+            release.wait(5)
+        score = 40 if account_id == "111111111111" else 80
+        return make_snapshot(f"01J{account_id}", account_id=account_id, score=score, status="fail")
+
+    settings = Settings(org_max_workers=4, org_account_timeout_s=0.3)
+    try:
+        summary = run_org_scan(
+            st,
+            settings,
+            accounts=["111111111111", "222222222222", "333333333333", "444444444444"],
+            scan_account=scan_account,
+        )
+    finally:
+        release.set()
+
+    assert [a.status for a in summary.accounts] == ["ok", "ok", "error", "timeout"]
+    assert "AccessDenied" in (summary.accounts[2].error or "")
+    assert summary.score == 60
+    assert summary.aggregate["failing_checks"] == {"iam.root_mfa": 2}
+    assert summary.aggregate["worst_accounts"][0]["account_id"] == "111111111111"
+
+    stored = {m.account_id for m in st.list_scans(limit=10)}
+    assert stored == {"111111111111", "222222222222"}
+    _, snap = st.get_scan("01J111111111111")
+    assert snap is not None and snap["breakdown"]["org"] == {"org_scan_id": summary.org_scan_id}
+    assert st.get_org_scan(summary.org_scan_id) == summary
+    assert st.list_org_scans()[0]["accounts_failed"] == 2
+    st.close()
+
+
+class _FakeSts:
+    def __init__(self, expires_in: timedelta) -> None:
+        self.calls: list[dict] = []
+        self.expires_in = expires_in
+
+    def assume_role(self, **kwargs) -> dict:
+        self.calls.append(kwargs)
+        return {
+            "Credentials": {
+                "AccessKeyId": "AKIA",
+                "SecretAccessKey": "secret",
+                "SessionToken": "token",
+                "Expiration": datetime.now(UTC) + self.expires_in,
+            }
+        }
+
+
+class _FakeBase:
+    region_name = "us-east-1"
+
+    def __init__(self, sts: _FakeSts) -> None:
+        self.sts = sts
+
+    def client(self, service: str):
+        assert service == "sts"
+        return self.sts
+
+
+def test_assumed_role_sessions_reuse_credentials_until_near_expiry() -> None:
+    sts = _FakeSts(timedelta(hours=1))
+    cache = AssumedRoleSessions(_FakeBase(sts), client_config(), role_name="Audit", external_id="ext")  # type: ignore[arg-type]
+
+    s1 = cache.session("111111111111")
+    assert cache.session("111111111111") is s1
+    assert cache.session("222222222222") is not s1
+    assert len(sts.calls) == 2
+    assert sts.calls[0]["RoleArn"] == "arn:aws:iam::111111111111:role/Audit"
+    assert sts.calls[0]["ExternalId"] == "ext"
+    assert s1.get_credentials().token == "token"
+
+    # Credentials inside the refresh margin are replaced on the next request.
+    sts.expires_in = timedelta(minutes=1)
+    cache._sessions.clear()
+    short = cache.session("111111111111")
+    assert cache.session("111111111111") is not short
+    assert len(sts.calls) == 4
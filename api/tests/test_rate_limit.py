@@ -0,0 +1,112 @@
+from botocore.awsrequest import AWSResponse
+from botocore.config import Config
+
+from app.aws_client import PooledSession
+from app.checks.registry import CheckSpec
+from app.models import CheckResult
+from app.rate_limit import RateLimiter, RateLimits, TokenBucket, track_wait
+from app.scan_engine import run_jobs
+
+_OK = (
+    b'<GetCallerIdentityResponse xmlns="https://sts.amazonaws.com/doc/2011-06-15/"><GetCallerIdentityResult>'
+    b"<Arn>arn:aws:iam::123456789012:user/scanner</Arn><UserId>AID</UserId><Account>123456789012</Account>"
+    b"</GetCallerIdentityResult><ResponseMetadata><RequestId>1</RequestId></ResponseMetadata>"
+    b"</GetCallerIdentityResponse>"
+)
+_THROTTLED = (
+    b"<ErrorResponse><Error><Type>Sender</Type><Code>Throttling</Code><Message>Rate exceeded</Message>"
+    b"</Error><RequestId>1</RequestId></ErrorResponse>"
+)
+
+
+class _Raw:
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    def stream(self, **_kwargs):
+        yield self.body
+
+
+def _sts(limiter: RateLimiter, responses: list[tuple[int, bytes]]):
+    session = PooledSession(
+        region_name="us-east-1",
+        profile_name=None,
+        config=Config(retries={"mode": "standard", "max_attempts": 3}),
+        credentials={"AccessKeyId": "AKIA", "SecretAccessKey": "secret", "SessionToken": "token"},
+        rate_limiter=limiter,
+    )
+    sts = session.client("sts")
+    sent = []
+
+    def transport(request, **_kwargs):
+        status, body = responses[min(len(sent), len(responses) - 1)]
+        sent.append(request)
+        return AWSResponse(request.url, status, {}, _Raw(body))
+
+    # Registered after the limiter's hook, so every attempt is paced before it is answered.
+    sts.meta.events.register("before-send", transport)
+    return sts, sent
+
+
+def test_token_bucket_halves_on_throttle_and_recovers_on_success() -> None:
+    bucket = TokenBucket(rate=10.0, burst=5, min_rate=1.0)
+    bucket.on_throttle()
+    assert bucket.rate == 5.0
+    for _ in range(3):
+        bucket.on_throttle()
+    assert bucket.rate == 1.0
+    for _ in range(100):
+        bucket.on_success()
+    assert bucket.rate == 10.0
+    assert bucket.stats()["throttles"] == 4
+
+
+def test_throttled_call_is_retried_and_slows_the_shared_bucket() -> None:
+    limiter = RateLimiter(RateLimits(default_rate=50.0, burst=5))
+    sts, sent = _sts(limiter, [(400, _THROTTLED), (200, _OK)])
+
+    assert sts.get_caller_identity()["Account"] == "123456789012"
+
+    assert len(sent) == 2
+    stats = limiter.stats()["sts/us-east-1"]
+    assert stats["throttles"] == 1
+    # Halved by the throttle, then one additive step back up from the successful retry.
+    assert stats["rate"] == 26.0
+
+
+def test_rate_limit_waits_are_charged_to_the_running_check() -> None:
+    limiter = RateLimiter(RateLimits(default_rate=20.0, burst=1))
+    sts, _ = _sts(limiter, [(200, _OK)])
+    waits: dict[str, float] = {}
+
+    with track_wait(waits, "iam.root_mfa"):
+        for _ in range(3):
+            sts.get_caller_identity()
+
+    # Burst of one at 20/s: the second and third calls each wait about 50ms.
+    assert 0.08 <= waits["iam.root_mfa"] < 0.5
+    assert RateLimits.parse(20.0, "iam=10, s3=50", 10).per_service == {"iam": 10.0, "s3": 50.0}
+
+
+def test_run_jobs_charges_waits_to_queued_checks() -> None:
+    limiter = RateLimiter(RateLimits(default_rate=20.0, burst=1))
+    sts, _ = _sts(limiter, [(200, _OK)])
+
+    def call_twice(check_id: str):
+        def fn(_session, _region, _inventory=None) -> CheckResult:
+            for _ in range(2):
+                sts.get_caller_identity()
+            return CheckResult(
+                id=check_id, title=check_id, severity="low", status="pass", domain="D1", recommendation="x"
+            )
+
+        return fn
+
+    # One worker: the second check only starts after the executor has polled at least once.
+    jobs = [(CheckSpec(c, c, "low", "D1", 10, call_twice(c)), "us-east-1", None) for c in ("first", "second")]
+    waits: dict[str, float] = {}
+    results = run_jobs(None, jobs, max_workers=1, wait_s=waits)  # type: ignore[arg-type]
+
+    assert [r.status for r in results] == ["pass", "pass"]
+    assert waits["first"] > 0
+    assert waits["second"] > 0
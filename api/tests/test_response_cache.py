@@ -0,0 +1,17 @@
+from app.response_cache import ResponseCache
+
+
+def test_response_cache_evicts_lru_and_invalidates_on_writes() -> None:
+    cache = ResponseCache(max_entries=2)
+    cache.put(("scan", "a"), b"a")
+    cache.put(("latest", "a"), b"l")
+    assert cache.get(("scan", "a")) == b"a"
+    cache.put(("scan", "b"), b"b")
+    # ("latest", "a") was least recently used.
+    assert ("latest", "a") not in cache
+
+    cache.put(("latest", "b"), b"l")
+    cache.on_write("scan")
+    assert ("latest", "b") not in cache and ("scan", "b") in cache
+    cache.on_write("prune")
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,45 @@
+from datetime import UTC, datetime, timedelta
+from functools import partial
+
+from app.retention import RetentionPolicy, apply_retention
+from app.storage import Storage, StorageConfig
+
+
+def test_retention_rolls_up_prunes_and_reclaims_space(tmp_path, make_snapshot) -> None:
+    # Large evidence so pruning has space to reclaim.
+    scan = partial(make_snapshot, account_id="123456789012", evidence={"blob": "x" * 20_000})
+
+    st = Storage(StorageConfig(db_path=tmp_path / "cs.db", compression="none"))
+    now = datetime(2026, 3, 31, 12, tzinfo=UTC)
+    old_day = datetime(2026, 1, 7, tzinfo=UTC)  # a Wednesday
+    for i, (score, status) in enumerate([(60, "fail"), (90, "pass"), (80, "pass")]):
+        st.put_scan(scan(f"old{i}", old_day + timedelta(hours=i), score=score, status=status))
+    st.put_scan(scan("recent", now - timedelta(days=1), score=95))
+
+    stats = apply_retention(st, RetentionPolicy(keep_full_days=30), now=now)
+
+    assert stats.scans_pruned == 3
+    assert stats.bytes_reclaimed > 0
+    assert [m.scan_id for m in st.list_scans()] == ["recent"]
+    assert st._conn.execute("SELECT COUNT(*) FROM check_results").fetchone()[0] == 1
+
+    # Rollups were kept up to date as the scans were stored, so pruning loses none of their history.
+    day = st.list_rollups("day")[-1]
+    assert day["bucket_start"] == "2026-01-07T00:00:00+00:00"
+    assert (day["scans"], day["score_min"], day["score_max"], day["score_last"]) == (3, 60, 90, 80)
+    assert day["changed_checks"] == {"iam.root_mfa": {"from": "fail", "to": "pass", "transitions": 1}}
+    assert day["domain_scores"] == {"Identity": 76.67}
+    assert st.list_rollups("week")[-1]["bucket_start"] == "2026-01-05T00:00:00+00:00"
+
+    # A later scan extends the same weekly bucket and leaves the rest alone.
+    st.put_scan(scan("old3", old_day + timedelta(days=1), score=70, status="fail"))
+    apply_retention(st, RetentionPolicy(keep_full_days=30), now=now)
+    week = st.list_rollups("week")[-1]
+    assert week["scans"] == 4 and week["changed_checks"]["iam.root_mfa"]["transitions"] == 2
+    assert len(st.list_rollups("day")) == 3
+
+    # The latest scan of a region that stopped scanning is kept however old it is.
+    st.put_scan(scan("stale", old_day, region="eu-west-1", score=50, status="fail"))
+    assert apply_retention(st, RetentionPolicy(keep_full_days=30), now=now).scans_pruned == 0
+    assert st.page_scans(1, region="eu-west-1")[0][0].scan_id == "stale"
+    st.close()
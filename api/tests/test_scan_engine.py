@@ -0,0 +1,250 @@
+import asyncio
+import threading
+import time
+
+from app.checks.registry import CheckSpec
+from app.inventory import ScanInventory
+from app.models import CheckResult
+from app.regions import RegionFanout
+from app.scan_engine import run_checks, run_checks_async, run_jobs
+
+
+def _spec(check_id: str, fn) -> CheckSpec:
+    return CheckSpec(check_id, check_id, "low", "D1", 10, fn)
+
+
+def _ok(check_id: str, delay: float = 0.0):
+    def fn(_session, _region, _inventory=None) -> CheckResult:
+        time.sleep(delay)
+        return CheckResult(
+            id=check_id,
+            title=check_id,
+            severity="low",
+            status="pass",
+            domain="D1",
+            recommendation="x",
+        )
+
+    return fn
+
+
+def test_run_checks_keeps_registry_order_and_isolates_failures() -> None:
+    def boom(_session, _region, _inventory=None) -> CheckResult:
+        raise RuntimeError("boom")
+
+    specs = [_spec("slow", _ok("slow", 0.2)), _spec("boom", boom), _spec("fast", _ok("fast"))]
+    results = run_checks(None, "us-east-1", specs, max_workers=3)  # type: ignore[arg-type]
+
+    assert [r.id for r in results] == ["slow", "boom", "fast"]
+    assert results[1].status == "error"
+    assert results[1].evidence["error"] == "boom"
+
+
+def test_run_checks_times_out_hung_check() -> None:
+    release = threading.Event()
+
+    def hang(_session, _region, _inventory=None) -> CheckResult:
+        release.wait(5)
+        raise AssertionError("should have been abandoned")
+
+    specs = [_spec("hang", hang), _spec("fast", _ok("fast"))]
+    t0 = time.monotonic()
+    try:
+        results = run_checks(None, "us-east-1", specs, max_workers=2, timeout_s=0.2)  # type: ignore[arg-type]
+    finally:
+        release.set()
+
+    assert time.monotonic() - t0 < 2
+    assert results[0].status == "error"
+    assert results[0].evidence["timeout_s"] == 0.2
+    assert results[1].status == "pass"
+
+
+def test_run_checks_async_mixes_sync_and_async_checks() -> None:
+    async def async_ok(_session, _region, _inventory=None) -> CheckResult:
+        await asyncio.sleep(0.05)
+        return _ok("async")(None, None)
+
+    async def async_hang(_session, _region, _inventory=None) -> CheckResult:
+        await asyncio.sleep(5)
+        raise AssertionError("should have been cancelled")
+
+    specs = [_spec("async", async_ok), _spec("hang", async_hang), _spec("sync", _ok("sync", 0.05))]
+    results = asyncio.run(
+        run_checks_async(None, "us-east-1", specs, max_concurrency=3, timeout_s=0.3)  # type: ignore[arg-type]
+    )
+
+    assert [r.id for r in results] == ["async", "hang", "sync"]
+    assert [r.status for r in results] == ["pass", "error", "pass"]
+
+
+def test_region_fanout_runs_regional_checks_per_region_and_global_once() -> None:
+    calls: list[tuple[str, str]] = []
+    lock = threading.Lock()
+
+    def check(check_id: str, failing_region: str | None = None):
+        def fn(_session, region, inventory=None) -> CheckResult:
+            assert inventory is not None and inventory.region == region
+            with lock:
+                calls.append((check_id, region))
+            return CheckResult(
+                id=check_id,
+                title=check_id,
+                severity="low",
+                status="fail" if region == failing_region else "pass",
+                domain="D1",
+                evidence={"seen": region},
+                recommendation="x",
+            )
+
+        return fn
+
+    specs = [
+        _spec("global", check("global")),
+        CheckSpec("regional", "regional", "low", "D1", 10, check("regional", "eu-west-1"), "regional"),
+    ]
+    inv = ScanInventory(None, "us-east-1")  # type: ignore[arg-type]
+    fanout = RegionFanout(specs, ["us-east-1", "eu-west-1"], inv)
+    for i, r in enumerate(run_jobs(None, fanout.jobs, max_workers=4)):  # type: ignore[arg-type]
+        fanout.add(i, r)
+
+    assert sorted(calls) == [("global", "us-east-1"), ("regional", "eu-west-1"), ("regional", "us-east-1")]
+    glob, regional = fanout.results()
+    assert glob.evidence == {"seen": "us-east-1"}
+    assert regional.status == "fail"
+    assert regional.evidence["failing_regions"] == ["eu-west-1"]
+    assert regional.evidence["regions"]["us-east-1"] == {"status": "pass", "seen": "us-east-1"}
+    assert fanout.matrix() == {
+        "scanned": ["us-east-1", "eu-west-1"],
+        "checks": {"regional": {"us-east-1": "pass", "eu-west-1": "fail"}},
+        "summary": {"us-east-1": {"pass": 1}, "eu-west-1": {"fail": 1}},
+    }
+
+
+def test_fast_rescan_reuses_fresh_cached_results(tmp_path, monkeypatch) -> None:
+    from app import scan_engine
+    from app.config import Settings
+    from app.storage import Storage, StorageConfig
+
+    calls: list[str] = []
+
+    def counted(check_id: str):
+        def fn(_session, _region, _inventory=None) -> CheckResult:
+            calls.append(check_id)
+            return _ok(check_id)(None, None)
+
+        return fn
+
+    specs = [
+        CheckSpec("slow_changing", "slow_changing", "low", "D1", 10, counted("slow_changing"), ttl_s=3600),
+        _spec("volatile", counted("volatile")),
+    ]
+    monkeypatch.setattr(scan_engine, "all_check_specs", lambda: specs)
+    monkeypatch.setattr(scan_engine, "boto_session", lambda _region: object())
+    monkeypatch.setattr(scan_engine, "get_account_id", lambda _session: "123456789012")
+    st = Storage(StorageConfig(db_path=tmp_path / "cs.db"))
+    settings = Settings(aws_scan_enabled=True)
+
+    first = scan_engine.run_scan(st, settings, fast=True)
+    assert sorted(calls) == ["slow_changing", "volatile"]
+    assert first.breakdown["cache"]["reused"] == {}
+
+    calls.clear()
+    second = scan_engine.run_scan(st, settings, fast=True)
+    assert calls == ["volatile"]
+    assert [r.id for r in second.results] == ["slow_changing", "volatile"]
+    reused = second.breakdown["cache"]["reused"]
+    assert list(reused) == ["slow_changing"]
+    assert reused["slow_changing"]["checked_at"] == first.created_at.isoformat()
+    assert second.breakdown["cache"]["executed"] == 1
+
+    calls.clear()
+    full = scan_engine.run_scan(st, settings, fast=False)
+    assert sorted(calls) == ["slow_changing", "volatile"]
+    assert "cache" not in full.breakdown
+    st.close()
+
+
+def test_async_scan_keeps_storage_off_the_event_loop(tmp_path, monkeypatch) -> None:
+    from app.config import Settings
+    from app.scan_engine import run_scan_async
+    from app.storage import Storage, StorageConfig, StorageProvider
+
+    threads: list[int] = []
+    put_scan = Storage.put_scan
+
+    def recording_put_scan(self, snapshot) -> None:
+        threads.append(threading.get_ident())
+        put_scan(self, snapshot)
+
+    monkeypatch.setattr(Storage, "put_scan", recording_put_scan)
+    provider = StorageProvider(StorageConfig(db_path=tmp_path / "cs.db"))
+
+    async def scan():
+        return threading.get_ident(), await run_scan_async(provider, Settings(aws_scan_enabled=False))
+
+    loop_thread, snapshot = asyncio.run(scan())
+
+    assert threads and loop_thread not in threads
+    assert provider.get().latest_scan().scan_id == snapshot.scan_id
+    provider.close()
+
+
+def test_targeted_rescan_picks_up_events_by_arrival_against_the_offline_base(tmp_path) -> None:
+    from app.config import Settings
+    from app.scan_engine import run_scan, run_targeted_scan
+    from app.storage import Storage, StorageConfig
+
+    st = Storage(StorageConfig(db_path=tmp_path / "cs.db"))
+    settings = Settings(aws_scan_enabled=False)
+    base = run_scan(st, settings)
+    # A newer AWS scan of the same region must not hide the offline base.
+    st.put_scan(base.model_copy(update={"scan_id": "aws-scan", "account_id": "123456789012"}))
+
+    # Delivered late: its event_time predates the base snapshot.
+    st.ingest_timeline_events(
+        [{"eventTime": "2020-01-01T00:00:00+00:00", "eventName": "PutBucketAcl", "eventSource": "s3"}]
+    )
+    resp = run_targeted_scan(st, settings)
+    assert resp.events == ["PutBucketAcl"]
+    rescan = resp.snapshot.breakdown["rescan"]
+    assert rescan["base_scan_id"] == base.scan_id
+    last = st.last_timeline_id()
+    assert rescan["trigger"]["last_event_id"] == last
+    assert resp.snapshot.breakdown["timeline"] == {"last_event_id": last}
+
+    # The next rescan continues after the events already consumed.
+    assert run_targeted_scan(st, settings).snapshot is None
+    st.close()
+
+
+def test_check_results_take_their_metadata_from_the_registry() -> None:
+    from app.checks.registry import all_check_specs
+
+    class _Denied(Exception):
+        pass
+
+    class _DeniedClient:
+        class exceptions:  # mirrors botocore client.exceptions
+            NoSuchEntityException = _Denied
+
+        def __getattr__(self, _name: str):
+            def call(*_args, **_kwargs):
+                raise _Denied("AccessDenied")
+
+            return call
+
+    class _Session:
+        def client(self, _service: str, region_name: str | None = None) -> _DeniedClient:
+            return _DeniedClient()
+
+    inv = ScanInventory(_Session(), "us-east-1")  # type: ignore[arg-type]
+    for spec in all_check_specs():
+        result = spec.fn(inv.session, "us-east-1", inv)
+        assert (result.id, result.title, result.severity, result.domain, result.weight) == (
+            spec.id,
+            spec.title,
+            spec.severity,
+            spec.domain,
+            spec.weight,
+        )
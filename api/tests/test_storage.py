@@ -0,0 +1,270 @@
+import sqlite3
+import threading
+
+import pytest
+
+from app.models import CheckResult
+from app.pagination import encode_cursor
+from app.storage import StorageConfig, StorageProvider
+
+
+def test_storage_provider_hands_out_one_wal_connection_per_thread(tmp_path) -> None:
+    provider = StorageProvider(StorageConfig(db_path=tmp_path / "cs.db"))
+
+    main = provider.get()
+    assert provider.get() is main
+    assert main._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(provider.get()))
+    t.start()
+    t.join()
+    assert other[0] is not main
+
+    provider.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        other[0]._conn.execute("SELECT 1")
+    # A fresh connection is opened for the next caller after close().
+    assert provider.get() is not main
+    provider.close()
+
+
+def test_schema_migrates_legacy_database_and_uses_indexes(tmp_path) -> None:
+    from app.storage import SCHEMA_VERSION, Storage
+
+    db = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE scans (scan_id TEXT PRIMARY KEY, created_at TEXT NOT NULL, account_id TEXT,"
+        " region TEXT NOT NULL, score INTEGER NOT NULL, domain_scores_json TEXT NOT NULL,"
+        " snapshot_json TEXT NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO scans VALUES ('s1', '2026-01-01T00:00:00+00:00', NULL, 'us-east-1', 90, '{}', '{}')"
+    )
+    conn.commit()
+    conn.close()
+
+    st = Storage(StorageConfig(db_path=db))
+    assert st.schema_version() == SCHEMA_VERSION
+    assert [m.scan_id for m in st.list_scans()] == ["s1"]
+
+    plan = " ".join(
+        str(r[-1])
+        for r in st._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT scan_id FROM scans ORDER BY created_at DESC, scan_id DESC LIMIT 10"
+        ).fetchall()
+    )
+    assert "idx_scans_created_id" in plan
+    st.close()
+
+
+def test_ingest_timeline_events_batches_a_lazy_iterator(tmp_path) -> None:
+    from app.storage import Storage
+
+    st = Storage(StorageConfig(db_path=tmp_path / "cs.db"))
+    consumed = []
+
+    def events():
+        for i in range(2500):
+            consumed.append(i)
+            yield {
+                "eventTime": f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+                "eventName": "CreateUser",
+                "eventSource": "iam.amazonaws.com",
+                "resources": [{"ResourceName": f"u{i}"}] if i % 2 else [],
+            }
+
+    stats = st.ingest_timeline_events(events(), scenario="bulk", batch_size=1000, commit_every=2)
+
+    assert (stats.rows, stats.batches, stats.commits) == (2500, 3, 2)
+    assert stats.rows_per_sec > 0
+    assert len(consumed) == 2500
+    items = st.list_timeline(limit=5000)
+    assert len(items) == 2500
+    assert items[1]["resources"] == [{"ResourceName": "u1"}]
+    st.close()
+
+
+_JAN1 = "2026-01-01T00:00:00+00:00"
+
+
+def _results() -> list[CheckResult]:
+    return [
+        CheckResult(
+            id="a",
+            title="A",
+            severity="high",
+            status="pass",
+            domain="D1",
+            evidence={"k": 1},
+            recommendation="x",
+        ),
+        CheckResult(
+            id="b",
+            title="B",
+            severity="low",
+            status="warn",
+            domain="D2",
+            evidence={"items": [1, 2, 3]},
+            recommendation="y",
+        ),
+    ]
+
+
+def test_check_results_are_queryable_without_the_snapshot(tmp_path, make_snapshot) -> None:
+    from app.storage import Storage
+
+    st = Storage(StorageConfig(db_path=tmp_path / "cs.db"))
+    st.put_scan(make_snapshot("s1", _JAN1, results=_results()))
+
+    all_results = st.list_check_results("s1")
+    assert [r["id"] for r in all_results] == ["a", "b"]
+    assert "evidence" not in all_results[0]
+    assert [r["id"] for r in st.list_check_results("s1", status="warn", include_evidence=True)] == ["b"]
+    assert st.list_check_results("s1", domain="D1", include_evidence=True)[0]["evidence"] == {"k": 1}
+    assert st.get_check_result("s1", "b")["evidence"] == {"items": [1, 2, 3]}
+    with pytest.raises(KeyError):
+        st.list_check_results("missing")
+    with pytest.raises(KeyError):
+        st.get_check_result("s1", "zzz")
+    st.close()
+
+
+def test_check_results_migration_backfills_existing_scans(tmp_path, make_snapshot) -> None:
+    import json
+
+    from app.storage import Storage
+
+    db = tmp_path / "old.db"
+    st = Storage(StorageConfig(db_path=db))
+    snap = make_snapshot("old", _JAN1, results=_results())
+    st._conn.execute(
+        "INSERT INTO scans VALUES (?, ?, NULL, 'us-east-1', 75, '{}', ?)",
+        ("old", snap.created_at.isoformat(), json.dumps(snap.model_dump(mode="json"))),
+    )
+    st._conn.execute("DELETE FROM check_results")
+    st._conn.execute("PRAGMA user_version = 3")
+    st._conn.commit()
+    st.close()
+
+    st = Storage(StorageConfig(db_path=db))
+    assert [r["id"] for r in st.list_check_results("old")] == ["a", "b"]
+    assert st.get_check_result("old", "a") == snap.results[0].model_dump(mode="json")
+    st.close()
+
+
+def test_snapshot_blobs_are_compressed_with_a_trained_dictionary(tmp_path, make_snapshot) -> None:
+    from app.storage import Storage
+
+    st = Storage(StorageConfig(db_path=tmp_path / "cs.db", dict_min_samples=2))
+    for i in range(4):
+        st.put_scan(make_snapshot(f"s{i}", f"2026-01-0{i + 1}T00:00:00+00:00", results=_results()))
+
+    assert st._conn.execute("SELECT COUNT(*) FROM blob_dicts").fetchone()[0] == 1
+    assert (
+        st._conn.execute("SELECT typeof(snapshot_json) FROM scans WHERE scan_id = 's3'").fetchone()[0]
+        == "blob"
+    )
+    _meta, snap = st.get_scan("s3")
+    assert snap == make_snapshot("s3", "2026-01-04T00:00:00+00:00", results=_results()).model_dump(
+        mode="json"
+    )
+    assert st.get_check_result("s3", "b")["evidence"] == {"items": [1, 2, 3]}
+
+    report = st.compression_report()
+    assert report["snapshots"]["rows"] == 4
+    assert report["snapshots"]["compressed_rows"] >= 2
+    assert report["snapshots"]["saved_bytes"] > 0
+    st.close()
+
+
+def test_put_scan_stores_a_diff_against_the_previous_scan(tmp_path, make_snapshot) -> None:
+    from app.storage import Storage
+
+    st = Storage(StorageConfig(db_path=tmp_path / "cs.db"))
+    st.put_scan(make_snapshot("s1", _JAN1, results=_results()))
+    second = make_snapshot("s2", "2026-01-02T00:00:00+00:00", score=90, results=_results())
+    second.results[0].evidence = {"k": 2}
+    second.results[1].status = "pass"
+    st.put_scan(second)
+
+    first = st.get_scan_diff("s1")
+    assert first["previous_scan_id"] is None and first["newly_failing"] == []
+    diff = st.get_scan_diff("s2")
+    assert diff["previous_scan_id"] == "s1"
+    assert diff["score_delta"] == 15
+    assert diff["newly_failing"] == []
+    assert [(c["id"], c["from"], c["to"]) for c in diff["newly_passing"]] == [("b", "warn", "pass")]
+    assert diff["evidence_changed"] == [{"id": "a", "status": "pass", "keys": ["k"]}]
+
+    # Diffs for scans written before the table existed are computed on first request.
+    st._conn.execute("DELETE FROM scan_diffs")
+    assert st.get_scan_diff("s2") == diff
+    with pytest.raises(KeyError):
+        st.get_scan_diff("missing")
+    st.close()
+
+
+def test_score_timeseries_is_kept_up_to_date_and_downsampled(tmp_path, make_snapshot) -> None:
+    from datetime import UTC, datetime
+
+    from app.storage import Storage
+
+    st = Storage(StorageConfig(db_path=tmp_path / "cs.db"))
+    days = ["2026-01-05T01:00:00+00:00", "2026-01-05T01:30:00+00:00", "2026-01-06T09:00:00+00:00"]
+    for i, (created_at, score) in enumerate(zip(days, [60, 80, 90], strict=True)):
+        st.put_scan(make_snapshot(f"s{i}", created_at, score=score))
+
+    daily = st.score_timeseries("day")
+    assert [(p["bucket_start"], p["scans"], p["score_avg"], p["score_last"]) for p in daily] == [
+        ("2026-01-05T00:00:00+00:00", 2, 70.0, 80),
+        ("2026-01-06T00:00:00+00:00", 1, 90.0, 90),
+    ]
+    assert daily[0]["domain_scores"] == {"Identity": 70.0}
+    assert len(st.score_timeseries("hour", since=datetime(2026, 1, 6, tzinfo=UTC))) == 1
+    (merged,) = st.score_timeseries("hour", max_points=1)
+    assert (merged["scans"], merged["score_min"], merged["score_max"], merged["score_last"]) == (
+        3,
+        60,
+        90,
+        90,
+    )
+
+    st.close()
+
+
+def test_keyset_pages_cover_history_once_and_honour_filters(tmp_path, make_snapshot) -> None:
+    from app.storage import Storage
+
+    st = Storage(StorageConfig(db_path=tmp_path / "cs.db"))
+    for i in range(7):
+        created_at = _JAN1 if i < 4 else f"2026-01-0{i}T00:00:00+00:00"
+        st.put_scan(make_snapshot(f"s{i}", created_at, region="eu-west-1" if i % 2 else "us-east-1"))
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = st.page_scans(3, cursor=cursor)
+        seen += [m.scan_id for m in page]
+        if cursor is None:
+            break
+    # Ties on created_at are broken by scan_id, so no scan is skipped or repeated.
+    assert seen == ["s6", "s5", "s4", "s3", "s2", "s1", "s0"]
+    assert [m.scan_id for m in st.page_scans(10, region="eu-west-1")[0]] == ["s5", "s3", "s1"]
+    with pytest.raises(ValueError):
+        st.page_scans(3, cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        st.page_timeline(3, cursor=encode_cursor({"a": 1}, [1]))
+
+    st.ingest_timeline_events(
+        {"eventTime": "2026-01-01T00:00:00+00:00", "eventName": f"E{i}", "eventSource": src, "username": "u"}
+        for i, src in enumerate(["iam", "s3", "iam", "iam", "s3"])
+    )
+    names, cursor = [], None
+    while True:
+        items, cursor = st.page_timeline(2, cursor=cursor, event_source="iam")
+        names += [e["eventName"] for e in items]
+        if cursor is None:
+            break
+    assert names == ["E0", "E2", "E3"]
+    st.close()